@@ -0,0 +1,31 @@
+"""Draws geometric boxes with the Fusion 360 API.
+
+Submodules are imported on first use, so the Fusion 360 API (adsk) is only
+needed once a plotter is used.  The main classes are also available from
+the package itself, e.g. ``from fusion360_util import BoxPlotter``.
+
+"""
+
+import importlib
+
+SUBMODULES = ("assembly", "handle_index", "history", "tabbed_box")
+
+# Names exported by the package, and the submodules defining them
+EXPORTS = {
+    "AssemblyPlotter": "assembly",
+    "BoxPlotter": "tabbed_box",
+    "GenerationHistory": "history",
+    "HandleIndex": "handle_index",
+}
+
+__all__ = sorted(EXPORTS)
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    if name in EXPORTS:
+        return getattr(
+            importlib.import_module("." + EXPORTS[name], __name__), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(
+        __name__, name))
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""Draws several boxes into one Fusion 360 design in a single run.
+
+Each box gets its own BoxPlotter, with its own namespace (keeping sketch
+names and handles apart) and offset (keeping the boxes apart on the XY
+plane).  The work is done in phases across all boxes: check every box,
+sketch every side, sketch every cutout, then extrude and cut.  Sketches are
+created with computation deferred and are all recomputed together before
+the first extrusion, so Fusion 360 recomputes each sketch once instead of
+after every entity.  The whole run can be recorded as a single timeline
+group, or without history (see history.py).
+
+"""
+
+from geometry_util.geometry import Point
+from fusion360_util.handle_index import HandleIndex
+from fusion360_util.history import GenerationHistory
+from fusion360_util.tabbed_box import BoxPlotter
+
+
+class AssemblyPlotter(object):
+    """Draws many geometric boxes into the active Fusion 360 design.
+
+    Args:
+        app: Fusion 360 application
+        conv_factor (float, optional): factor to multiply units by before
+            creating objects.  Defaults to 0.1 (mm) since 360 default is cm.
+        options: other BoxPlotter arguments (such as instance_sides,
+            entity_budget or dxf_import) used for every box
+
+    Attributes:
+        plotters: dict from namespaces to BoxPlotters, in the order added
+        handles: HandleIndex shared (through HandleIndex.scoped) by all
+            plotters
+
+    """
+
+    def __init__(self, app, conv_factor=0.1, **options):
+        self.app = app
+        self.conv_factor = conv_factor
+        self.options = options
+        self.plotters = {}
+        self.handles = HandleIndex(app.activeProduct)
+
+    def add(self, box, namespace, offset=None):
+        """Adds a box to the assembly.
+
+        Args:
+            box (Box): geometric box to draw
+            namespace (str): name unique to this box, used to prefix its
+                sketch names and handles
+            offset (Point, optional): added to all of the box's geometry
+
+        Returns:
+            the box's BoxPlotter
+
+        Raises:
+            ValueError: if the namespace is already used.
+
+        """
+        if not namespace or namespace in self.plotters:
+            raise ValueError(
+                "Namespace must be unique and non-empty: {!r}".format(
+                    namespace))
+        plotter = BoxPlotter(
+            self.app,
+            box,
+            conv_factor=self.conv_factor,
+            namespace=namespace,
+            offset=offset or Point(0, 0),
+            defer_compute=True,
+            handles=self.handles.scoped(namespace),
+            **self.options)
+        self.plotters[namespace] = plotter
+        return plotter
+
+    def check(self):
+        """Checks every box's sides before anything is drawn.
+
+        Raises:
+            ValueError: listing the problems of every box that has any.
+
+        """
+        problems = []
+        for (namespace, plotter) in self.plotters.items():
+            try:
+                plotter.check_sides()
+            except ValueError as error:
+                problems.append("{}: {}".format(namespace, error))
+        if problems:
+            raise ValueError("\n".join(problems))
+
+    def sketch(self, draw_construction=False, overwrite=True):
+        """Sketches the sides of every box, then the cutouts of every box."""
+        for plotter in self.plotters.values():
+            plotter.sketch_sides(
+                draw_construction=draw_construction,
+                overwrite=overwrite,
+                check=False)
+        for plotter in self.plotters.values():
+            plotter.sketch_cutouts(
+                draw_construction=draw_construction, overwrite=overwrite)
+
+    def compute(self):
+        """Recomputes every deferred sketch of every box."""
+        for plotter in self.plotters.values():
+            plotter.compute_sketches()
+
+    def extrude(self):
+        for plotter in self.plotters.values():
+            plotter.extrude_sides()
+
+    def cut(self):
+        for plotter in self.plotters.values():
+            plotter.cut_sides()
+
+    def plot(self,
+             draw_construction=False,
+             overwrite=True,
+             check=True,
+             history="parametric",
+             group_name="assembly",
+             restore=False):
+        """Runs all phases for all boxes.
+
+        Args:
+            draw_construction (bool, optional): whether to draw
+                construction lines
+            overwrite (bool, optional): whether to replace existing sketches
+            check (bool, optional): whether to check all sides first
+            history (str, optional): 'parametric', 'grouped' or 'direct'
+                (see GenerationHistory)
+            group_name (str, optional): timeline group name when grouped
+            restore (bool, optional): whether to switch back to parametric
+                modeling after a 'direct' run
+
+        Returns:
+            the GenerationHistory used for the run
+
+        """
+        if check:
+            self.check()
+        with GenerationHistory(self.app.activeProduct, history, group_name,
+                               restore) as recorded:
+            self.sketch(draw_construction, overwrite)
+            self.compute()
+            self.extrude()
+            self.cut()
+        return recorded
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""Tests AssemblyPlotter against the fake Fusion 360 API.
+"""
+import pytest
+from adsk.fusion import DesignTypes
+
+from fusion360_util.assembly import AssemblyPlotter
+from fusion360_util.fake_api import Sketch, make_app
+from fusion360_util.handle_index import HandleIndex
+from geometry_util.box import Box
+from geometry_util.geometry import Point
+
+
+def make_assembly(app, **options):
+    assembly = AssemblyPlotter(app, **options)
+    for (index, namespace) in enumerate(("a", "b")):
+        box = Box(100, 50, 65, 3, 2)
+        box.bottom_side.add_cutout('rect', Point(10, 10), Point(20, 15),
+                                   name="plug")
+        assembly.add(box, namespace, Point(400 * index, 0))
+    return assembly
+
+
+def phase(entity):
+    if isinstance(entity, Sketch):
+        return "cutout" if "plug" in entity.name else "side"
+    return entity.operation
+
+
+def test_phases_run_in_order_across_boxes():
+    app = make_app()
+    make_assembly(app).plot()
+    entities = app.activeProduct.timeline_entities()
+    phases = [phase(entity) for entity in entities]
+    assert phases == (["side"] * 12 + ["cutout"] * 2 +
+                      ["new_component"] * 12 + ["cut"] * 2)
+    assert [entity.name for entity in entities[:7]] == [
+        "a_bottom", "a_right", "a_upper", "a_left", "a_top", "a_lower",
+        "b_bottom"
+    ]
+    # Every sketch was recomputed before it was extruded
+    assert not any(entity.deferred_sketch for entity in entities[14:])
+
+
+def test_handles_are_namespaced():
+    app = make_app()
+    make_assembly(app).plot()
+    design = app.activeProduct
+    keys = {
+        attribute.name for attribute in design.attributes.itemsByGroup(
+            HandleIndex.ATTRIBUTE_GROUP)
+    }
+    assert "a/side/bottom" in keys and "b/side/bottom" in keys
+    assert "a/cutout/plug" in keys and "b/cutout/plug" in keys
+    assert len(keys) == 14
+    sketch = HandleIndex(design, "b").find("cutout/plug")
+    assert sketch.name == "b_plug"
+
+
+def test_grouped_rerun_covers_new_entries():
+    app = make_app()
+    make_assembly(app).plot()
+    timeline = app.activeProduct.timeline
+    assert timeline.count == 28
+
+    # The rerun replaces all 14 sketches; the 14 features of the first run
+    # stay in front of the new entries
+    history = make_assembly(app).plot(history="grouped")
+    assert timeline.count == 42
+    assert (history.group.start, history.group.end) == (14, 41)
+    assert history.group.name == "assembly"
+
+
+def test_direct_run_can_restore_parametric_design():
+    app = make_app()
+    make_assembly(app).plot(history="direct")
+    assert app.activeProduct.designType == DesignTypes.DirectDesignType
+    assert app.activeProduct.timeline.count == 0
+
+    app = make_app()
+    make_assembly(app).plot(history="direct", restore=True)
+    assert app.activeProduct.designType == DesignTypes.ParametricDesignType
+    assert app.activeProduct.timeline.count == 0
+    assert len(app.activeProduct.rootComponent.sketches) == 14
+
+
+def test_namespaces_must_be_unique():
+    assembly = make_assembly(make_app())
+    for namespace in ("a", ""):
+        with pytest.raises(ValueError):
+            assembly.add(Box(100, 50, 65, 3, 2), namespace)
@@ -0,0 +1,4 @@
+"""Lets fusion360_util tests import the Fusion 360 API outside Fusion 360."""
+from fusion360_util.fake_api import install
+
+install()
@@ -0,0 +1,524 @@
+#!/usr/bin/python3
+"""A small in-memory stand-in for the parts of the Fusion 360 API used here.
+
+Tests of fusion360_util run outside Fusion 360, where the adsk modules do
+not exist.  install() registers fake adsk, adsk.core and adsk.fusion modules
+(unless the real ones can be imported), and make_app() returns an
+application whose design records what is done to it:
+
+- sketches, features and occurrences get entity tokens that
+  findEntityByToken resolves, and deleteMe removes them again
+- in parametric designs each of them is added to the timeline at the
+  marker, and deleting one shifts the entries (and the marker) after it
+- switching a design to direct modeling discards its timeline
+- DXF imports make a sketch with one curve per LINE or CIRCLE entity
+
+Only what the tests need is modelled; sketch profiles are one per drawn
+circle or rectangle plus one for any other lines (imported sketches get one
+per circle plus one for all lines).
+
+"""
+
+import itertools
+import sys
+import types
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0902,R0913
+
+_tokens = itertools.count(1)
+
+
+class Collection(list):
+    """A Fusion 360 style collection (count and item)."""
+
+    @property
+    def count(self):
+        return len(self)
+
+    def item(self, index):
+        return self[index]
+
+    def add(self, value):
+        self.append(value)
+        return value
+
+
+class ObjectCollection(Collection):
+
+    @staticmethod
+    def create():
+        return ObjectCollection()
+
+
+class ValueInput(object):
+
+    @staticmethod
+    def createByReal(value):
+        return value
+
+    @staticmethod
+    def createByString(value):
+        return value
+
+
+class Point3D(object):
+
+    def __init__(self, x, y, z):
+        (self.x, self.y, self.z) = (x, y, z)
+
+    @staticmethod
+    def create(x, y, z):
+        return Point3D(x, y, z)
+
+
+class Vector3D(Point3D):
+
+    @staticmethod
+    def create(x, y, z):
+        return Vector3D(x, y, z)
+
+
+class Matrix3D(object):
+
+    def __init__(self):
+        self.translation = Vector3D(0, 0, 0)
+
+    @staticmethod
+    def create():
+        return Matrix3D()
+
+
+class SketchPoint(object):
+    pass
+
+
+class FeatureOperations(object):
+    NewComponentFeatureOperation = "new_component"
+    CutFeatureOperation = "cut"
+
+
+class PatternDistanceType(object):
+    SpacingPatternDistanceType = "spacing"
+
+
+class DesignTypes(object):
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+
+def install():
+    """Registers the fake adsk modules, unless the real API is present."""
+    try:
+        import adsk.core  # pylint: disable=unused-import
+        import adsk.fusion  # pylint: disable=unused-import
+        return
+    except ImportError:
+        pass
+    adsk = types.ModuleType("adsk")
+    core = types.ModuleType("adsk.core")
+    fusion = types.ModuleType("adsk.fusion")
+    for cls in (ObjectCollection, ValueInput, Point3D, Vector3D, Matrix3D):
+        setattr(core, cls.__name__, cls)
+    for cls in (SketchPoint, FeatureOperations, PatternDistanceType,
+                DesignTypes):
+        setattr(fusion, cls.__name__, cls)
+    (adsk.core, adsk.fusion) = (core, fusion)
+    sys.modules.update({"adsk": adsk, "adsk.core": core,
+                        "adsk.fusion": fusion})
+
+
+class Entity(object):
+    """Something with a token and (in parametric designs) a timeline entry.
+
+    Args:
+        design (Design): design the entity belongs to
+        collection (list, optional): collection holding the entity
+    """
+
+    def __init__(self, design, collection=None):
+        self.design = design
+        self.collection = collection
+        self.entityToken = "token{}".format(next(_tokens))
+        self.name = None
+        design.entities[self.entityToken] = self
+        self.timelineObject = design.timeline.record(self)
+        if collection is not None:
+            collection.append(self)
+
+    def deleteMe(self):
+        self.design.entities.pop(self.entityToken, None)
+        self.design.timeline.remove(self)
+        if self.collection is not None and self in self.collection:
+            self.collection.remove(self)
+
+
+class TimelineObject(object):
+
+    def __init__(self, timeline, entity):
+        self.timeline = timeline
+        self.entity = entity
+
+    @property
+    def index(self):
+        return self.timeline.objects.index(self)
+
+
+class TimelineGroup(object):
+
+    def __init__(self, start, end):
+        (self.start, self.end) = (start, end)
+        self.name = None
+
+
+class Timeline(object):
+    """Timeline entries, with new ones inserted at the marker."""
+
+    def __init__(self, design):
+        self.design = design
+        self.objects = []
+        self.markerPosition = 0
+        self.timelineGroups = TimelineGroups()
+
+    @property
+    def count(self):
+        return len(self.objects)
+
+    def item(self, index):
+        return self.objects[index]
+
+    def record(self, entity):
+        if not self.design.is_parametric():
+            return None
+        timeline_object = TimelineObject(self, entity)
+        self.objects.insert(self.markerPosition, timeline_object)
+        self.markerPosition += 1
+        return timeline_object
+
+    def remove(self, entity):
+        for (index, timeline_object) in enumerate(self.objects):
+            if timeline_object.entity is entity:
+                del self.objects[index]
+                if index < self.markerPosition:
+                    self.markerPosition -= 1
+                return
+
+    def clear(self):
+        self.objects = []
+        self.markerPosition = 0
+
+
+class TimelineGroups(Collection):
+
+    def add(self, start, end):
+        if not 0 <= start <= end:
+            raise ValueError("Bad timeline group range")
+        return super().add(TimelineGroup(start, end))
+
+
+class Attribute(object):
+
+    def __init__(self, attributes, key, value):
+        (self.attributes, self.key) = (attributes, key)
+        (self.groupName, self.name) = key
+        self.value = value
+
+    def deleteMe(self):
+        self.attributes.values.pop(self.key, None)
+
+
+class Attributes(object):
+
+    def __init__(self):
+        self.values = {}
+
+    def add(self, group, name, value):
+        attribute = Attribute(self, (group, name), value)
+        self.values[(group, name)] = attribute
+        return attribute
+
+    def itemByName(self, group, name):
+        return self.values.get((group, name))
+
+    def itemsByGroup(self, group):
+        return [attribute for (key, attribute) in self.values.items()
+                if key[0] == group]
+
+
+class BoundingBox(object):
+
+    def __init__(self, points):
+        xs = [point.x for point in points]
+        ys = [point.y for point in points]
+        self.minPoint = Point3D(min(xs), min(ys), 0)
+        self.maxPoint = Point3D(max(xs), max(ys), 0)
+
+
+class Profile(object):
+
+    def __init__(self, sketch, points):
+        self.parentSketch = sketch
+        self.boundingBox = BoundingBox(points)
+
+
+class SketchCurves(object):
+
+    def __init__(self, sketch):
+        self.sketchLines = SketchLines(sketch)
+        self.sketchCircles = SketchCircles(sketch)
+
+
+class SketchLines(Collection):
+
+    def __init__(self, sketch):
+        super().__init__()
+        self.sketch = sketch
+
+    def addByTwoPoints(self, point_1, point_2):
+        self.sketch.loose_lines.append((point_1, point_2))
+        return self.add((point_1, point_2))
+
+    def addTwoPointRectangle(self, point_1, point_2):
+        corners = [point_1, Point3D(point_2.x, point_1.y, 0), point_2,
+                   Point3D(point_1.x, point_2.y, 0)]
+        for index in range(4):
+            self.add((corners[index], corners[(index + 1) % 4]))
+        self.sketch.closed_shapes.append(corners)
+
+
+class SketchCircles(Collection):
+
+    def __init__(self, sketch):
+        super().__init__()
+        self.sketch = sketch
+
+    def addByTwoPoints(self, point_1, point_2):
+        self.sketch.closed_shapes.append([point_1, point_2])
+        return self.add((point_1, point_2))
+
+
+class Sketch(Entity):
+
+    def __init__(self, design, collection):
+        super().__init__(design, collection)
+        self.isComputeDeferred = False
+        self.sketchPoints = Collection()
+        self.sketchCurves = SketchCurves(self)
+        self.closed_shapes = []
+        self.loose_lines = []
+
+    @property
+    def profiles(self):
+        profiles = Collection(
+            Profile(self, shape) for shape in self.closed_shapes)
+        if self.loose_lines:
+            profiles.insert(0, Profile(self, [
+                point for line in self.loose_lines for point in line
+            ]))
+        return profiles
+
+
+class Sketches(Collection):
+
+    def __init__(self, design):
+        super().__init__()
+        self.design = design
+
+    def add(self, _plane):
+        return Sketch(self.design, self)
+
+    def itemByName(self, name):
+        for sketch in self:
+            if sketch.name == name:
+                return sketch
+        return None
+
+
+class Body(object):
+
+    def __init__(self, component):
+        self.parentComponent = component
+        self.name = None
+
+
+class ExtrudeFeature(Entity):
+    """Records what was extruded and whether its sketch was computed."""
+
+    def __init__(self, design, collection, profile, distance, operation):
+        super().__init__(design, collection)
+        profiles = profile if isinstance(profile, Collection) else [profile]
+        self.sketch = profiles[0].parentSketch
+        self.profile_count = len(profiles)
+        self.deferred_sketch = self.sketch.isComputeDeferred
+        self.distance = distance
+        self.operation = operation
+        component = design.rootComponent
+        if operation == FeatureOperations.NewComponentFeatureOperation:
+            component = Component(design, "component")
+        self.bodies = Collection([Body(component)])
+
+
+class ExtrudeFeatures(Collection):
+
+    def __init__(self, design):
+        super().__init__()
+        self.design = design
+
+    def addSimple(self, profile, distance, operation):
+        return ExtrudeFeature(self.design, self, profile, distance,
+                              operation)
+
+
+class PatternInput(object):
+
+    def __init__(self, entities, direction_one):
+        self.entities = entities
+        self.directions = [direction_one]
+
+    def setDirectionTwo(self, *direction):
+        self.directions.append(direction)
+
+
+class PatternFeature(Entity):
+
+    def __init__(self, design, collection, pattern_input):
+        super().__init__(design, collection)
+        self.input = pattern_input
+
+
+class RectangularPatternFeatures(Collection):
+
+    def __init__(self, design):
+        super().__init__()
+        self.design = design
+
+    def createInput(self, entities, *direction):
+        return PatternInput(entities, direction)
+
+    def add(self, pattern_input):
+        return PatternFeature(self.design, self, pattern_input)
+
+
+class Features(object):
+
+    def __init__(self, design):
+        self.extrudeFeatures = ExtrudeFeatures(design)
+        self.rectangularPatternFeatures = RectangularPatternFeatures(design)
+
+
+class Occurrence(Entity):
+
+    def __init__(self, design, collection, component, transform, copied):
+        super().__init__(design, collection)
+        self.component = component
+        self.transform = transform
+        self.copied = copied
+
+
+class Occurrences(Collection):
+
+    def __init__(self, design):
+        super().__init__()
+        self.design = design
+
+    def addExistingComponent(self, component, transform):
+        return Occurrence(self.design, self, component, transform, False)
+
+    def addNewComponentCopy(self, component, transform):
+        copy = Component(self.design, component.name)
+        copy.copy_of = component
+        return Occurrence(self.design, self, copy, transform, True)
+
+
+class Component(object):
+
+    def __init__(self, design, name):
+        self.name = name
+        self.copy_of = None
+        self.sketches = Sketches(design)
+        self.features = Features(design)
+        self.occurrences = Occurrences(design)
+        self.xYConstructionPlane = object()
+        self.xConstructionAxis = object()
+        self.yConstructionAxis = object()
+
+
+class Design(object):
+    """A design recording its entities, timeline and attributes."""
+
+    def __init__(self, design_type=DesignTypes.ParametricDesignType):
+        self._design_type = design_type
+        self.entities = {}
+        self.timeline = Timeline(self)
+        self.attributes = Attributes()
+        self.userParameters = Collection()
+        self.rootComponent = Component(self, "root")
+
+    def is_parametric(self):
+        return self._design_type == DesignTypes.ParametricDesignType
+
+    @property
+    def designType(self):
+        return self._design_type
+
+    @designType.setter
+    def designType(self, design_type):
+        if design_type == DesignTypes.DirectDesignType:
+            # Fusion 360 discards the history when switching
+            self.timeline.clear()
+        self._design_type = design_type
+
+    def findEntityByToken(self, token):
+        entity = self.entities.get(token)
+        return [entity] if entity is not None else []
+
+    def timeline_entities(self):
+        """Returns the entities of the timeline entries, in order."""
+        return [timeline_object.entity
+                for timeline_object in self.timeline.objects]
+
+
+class ImportOptions(object):
+
+    def __init__(self, path):
+        self.path = path
+        self.isSingleSketchResult = False
+        self.results = Collection()
+
+
+class ImportManager(object):
+
+    def __init__(self, design):
+        self.design = design
+
+    def createDXF2DImportOptions(self, path, _plane):
+        return ImportOptions(path)
+
+    def importToTarget(self, options, target):
+        with open(options.path) as dxf_file:
+            text = dxf_file.read().split("\n")
+        kinds = [text[index + 1] for index in range(0, len(text) - 1, 2)
+                 if text[index].strip() == "0"]
+        sketch = target.sketches.add(None)
+        (origin, far) = (Point3D(0, 0, 0), Point3D(1e3, 1e3, 0))
+        sketch.sketchCurves.sketchLines.extend(
+            [(origin, far)] * kinds.count("LINE"))
+        if kinds.count("LINE"):
+            sketch.closed_shapes.append([origin, far])
+        sketch.sketchCurves.sketchCircles.extend(
+            [(origin, origin)] * kinds.count("CIRCLE"))
+        sketch.closed_shapes.extend(
+            [[origin, Point3D(1, 1, 0)]] * kinds.count("CIRCLE"))
+        options.results.append(sketch)
+        return True
+
+
+class Application(object):
+
+    def __init__(self, design):
+        self.activeProduct = design
+        self.importManager = ImportManager(design)
+
+
+def make_app(design_type=DesignTypes.ParametricDesignType):
+    """Returns a fake application with a new, empty design."""
+    return Application(Design(design_type))
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""Persistent index from logical geometry IDs to Fusion 360 entities.
+
+Sketches are normally found by name, which costs a search per lookup and
+silently reuses the wrong sketch once two boxes in a document share names
+such as "bottom".  This index instead records each entity's token in the
+design's attributes, under a namespace, so entities can be found again in
+later script runs.
+
+"""
+
+# pylint: disable=too-few-public-methods,C0111,C0103
+
+
+class HandleIndex(object):
+    """Maps logical IDs (such as "side/bottom") to Fusion 360 entities.
+
+    All tokens for the design are read from its attributes once, on
+    creation.  Lookups are then a dictionary access plus a single
+    findEntityByToken call.  Stale tokens (for entities deleted by hand) are
+    dropped when found.
+
+    Args:
+        design: Fusion 360 design holding the attributes
+        namespace (str, optional): prefix keeping IDs of different boxes
+            apart
+        tokens (dict, optional): tokens already read from the design, to
+            share between indexes (see scoped)
+
+    Attributes:
+        tokens: dict from namespaced IDs to entity tokens
+
+    """
+
+    ATTRIBUTE_GROUP = "cad_modeling_handles"
+
+    def __init__(self, design, namespace="", tokens=None):
+        self.design = design
+        self.namespace = namespace
+        if tokens is None:
+            tokens = {}
+            for attribute in design.attributes.itemsByGroup(
+                    self.ATTRIBUTE_GROUP):
+                tokens[attribute.name] = attribute.value
+        self.tokens = tokens
+
+    def scoped(self, namespace):
+        """Returns an index for another namespace, without rereading the
+        design's attributes."""
+        return HandleIndex(self.design, namespace, self.tokens)
+
+    def key(self, logical_id):
+        if self.namespace:
+            return "{}/{}".format(self.namespace, logical_id)
+        return logical_id
+
+    def find(self, logical_id):
+        """Returns the entity stored under logical_id, or None."""
+        key = self.key(logical_id)
+        token = self.tokens.get(key)
+        if not token:
+            return None
+        entities = self.design.findEntityByToken(token)
+        if not entities:
+            self.forget(logical_id)
+            return None
+        return entities[0]
+
+    def store(self, logical_id, entity):
+        """Records entity under logical_id, replacing any earlier entity."""
+        key = self.key(logical_id)
+        token = entity.entityToken
+        self.design.attributes.add(self.ATTRIBUTE_GROUP, key, token)
+        self.tokens[key] = token
+
+    def forget(self, logical_id):
+        key = self.key(logical_id)
+        attribute = self.design.attributes.itemByName(self.ATTRIBUTE_GROUP,
+                                                      key)
+        if attribute:
+            attribute.deleteMe()
+        self.tokens.pop(key, None)
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""Controls how generated features are recorded in a design's history.
+
+Each sketch, extrude, cut and pattern made by BoxPlotter is normally a
+separate timeline entry, and Fusion 360 replays the timeline on later
+edits, so designs with hundreds of generated features become sluggish.
+
+GenerationHistory wraps a run in one of three modes:
+
+- 'parametric': entries are recorded as usual
+- 'grouped': the entries a run creates are collapsed into a single named
+  timeline group, so the timeline stays short and readable.  The group
+  spans the first to the last new entry, found by comparing entity tokens
+  with those present before the run (overwriting sketches deletes earlier
+  entries, so the marker position alone does not give the range).
+- 'direct': the design is switched to direct modeling, so nothing is
+  recorded and later edits do not replay anything.  Switching a design with
+  history to direct modeling discards that history, so this is meant for
+  one-shot designs (such as laser cutting jobs).  With restore, the design
+  is switched back to parametric afterwards, keeping the generated bodies
+  as base geometry.
+
+"""
+
+from adsk.fusion import DesignTypes
+
+HISTORY_MODES = ("parametric", "grouped", "direct")
+
+
+class GenerationHistory(object):
+    """Context manager recording a run's features in the chosen mode.
+
+    Args:
+        design: Fusion 360 design (app.activeProduct)
+        mode (str, optional): one of HISTORY_MODES
+        name (str, optional): name of the timeline group ('grouped' mode)
+        restore (bool, optional): whether to switch back to parametric
+            modeling after a 'direct' run
+
+    Attributes:
+        group: the timeline group made by a 'grouped' run, or None
+
+    """
+
+    def __init__(self, design, mode="parametric", name=None, restore=False):
+        if mode not in HISTORY_MODES:
+            raise ValueError("Unknown history mode: {}".format(mode))
+        self.design = design
+        self.mode = mode
+        self.name = name
+        self.restore = restore
+        self.group = None
+        self.existing = None
+        self.previous_type = None
+
+    def is_parametric(self):
+        return self.design.designType == DesignTypes.ParametricDesignType
+
+    def __enter__(self):
+        if self.mode == "direct":
+            self.previous_type = self.design.designType
+            if self.is_parametric():
+                self.design.designType = DesignTypes.DirectDesignType
+        elif self.mode == "grouped" and self.is_parametric():
+            self.existing = set(self.timeline_tokens().values())
+        return self
+
+    def timeline_tokens(self):
+        """Returns a dict from timeline indexes to entity tokens."""
+        timeline = self.design.timeline
+        tokens = {}
+        for index in range(timeline.count):
+            entity = timeline.item(index).entity
+            if entity is not None:
+                tokens[index] = entity.entityToken
+        return tokens
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self.mode == "direct":
+            if (self.restore and self.previous_type ==
+                    DesignTypes.ParametricDesignType):
+                self.design.designType = DesignTypes.ParametricDesignType
+        elif self.existing is not None:
+            created = [
+                index for (index, token) in self.timeline_tokens().items()
+                if token not in self.existing
+            ]
+            if created:
+                self.group = self.design.timeline.timelineGroups.add(
+                    min(created), max(created))
+                if self.name:
+                    self.group.name = self.name
+        return False
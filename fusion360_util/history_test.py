@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Tests GenerationHistory against the fake Fusion 360 API.
+"""
+from adsk.fusion import DesignTypes
+
+from fusion360_util.fake_api import make_app
+from fusion360_util.history import GenerationHistory
+from fusion360_util.tabbed_box import BoxPlotter
+from geometry_util.box import Box
+
+
+def run(app, box, mode, **options):
+    with GenerationHistory(app.activeProduct, mode, "box",
+                           **options) as history:
+        plotter = BoxPlotter(app, box)
+        plotter.sketch_sides()
+        plotter.extrude_sides()
+    return history
+
+
+def test_group_covers_rerun_after_deletions():
+    app = make_app()
+    design = app.activeProduct
+    box = Box(100, 50, 65, 3, 2)
+    run(app, box, "parametric")
+    assert design.timeline.count == 12
+
+    # Overwriting deletes the six old sketches, so the new entries start
+    # six places before the marker position at the start of the run
+    history = run(app, box, "grouped")
+    assert design.timeline.count == 18
+    assert (history.group.start, history.group.end) == (6, 17)
+    assert history.group.name == "box"
+    grouped = design.timeline_entities()[6:]
+    assert [entity.name for entity in grouped[:6]] == list(box.sides())
+
+
+def test_group_of_one_entry():
+    app = make_app()
+    design = app.activeProduct
+    with GenerationHistory(design, "grouped") as history:
+        design.rootComponent.sketches.add(None)
+    assert (history.group.start, history.group.end) == (0, 0)
+
+    with GenerationHistory(design, "grouped") as history:
+        pass
+    assert history.group is None
+
+
+def test_direct_run_restores_parametric_design():
+    app = make_app()
+    design = app.activeProduct
+    run(app, Box(100, 50, 65, 3, 2), "direct", restore=True)
+    assert design.designType == DesignTypes.ParametricDesignType
+    assert design.timeline.count == 0
+    assert len(design.rootComponent.sketches) == 6
+
+    run(app, Box(100, 50, 65, 3, 2), "direct")
+    assert design.designType == DesignTypes.DirectDesignType
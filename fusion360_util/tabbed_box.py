@@ -1,21 +1,28 @@
 #!/usr/bin/python3
 """Interacts with Fusion 360 API to create a tabbed box.
 
-Contains a class to create or retrieve sketches.  Contains another to make
-Fusion 360 elements from a (geometric) box.
+Contains a class to create or retrieve sketches, and a variant that draws
+them by importing generated DXF files.  Contains another to make Fusion 360
+elements from a (geometric) box.
 
 See projects/psu_4mm_acrylic for an example of a Fusion 360
 script that uses these classes.
 
 """
 
+import os
 from typing import List
 
-from adsk.core import ValueInput, Point3D
-from adsk.fusion import SketchPoint, FeatureOperations
+from adsk.core import (Matrix3D, ObjectCollection, ValueInput, Point3D,
+                       Vector3D)
+from adsk.fusion import (SketchPoint, FeatureOperations,
+                         PatternDistanceType)
 
 from geometry_util.geometry import Point, Line, Dim
 from geometry_util.box import Side
+from geometry_util.cutout_table import cutout_coords
+from geometry_util.intersect import check_side
+from fusion360_util.handle_index import HandleIndex
 
 
 class SketchContainer(object):
@@ -37,6 +44,13 @@ class SketchContainer(object):
         z_coord (float, optional): z component of sketch objects in cm.
         conv_factor (float, optional): factor to multiply units by before
             creating objects.  Defaults to 0.1 (mm) since 360 default is cm.
+        handles (HandleIndex, optional): index used to find the sketch
+            instead of searching by name
+        logical_id (str, optional): ID of the sketch in handles.  Defaults
+            to name.
+        offset (Point, optional): added to all geometry before drawing
+        defer_compute (bool, optional): if true, created sketches are not
+            recomputed until compute() is called
 
     Attributes:
         points: dict from geometric points (used when constructing) to
@@ -45,23 +59,56 @@ class SketchContainer(object):
         sketch_points: Fusion 360 object for managing sketch points
         sketch_lines: Fusion 360 object for managing sketch lines
         sketch_circles: Fusion 360 object for managing sketch circles
+        holds_cutouts: whether the sketch holds cutouts inside its outline,
+            so that the outer profile is the one to extrude
 
     """
 
-    def __init__(self, name, root_comp, z_coord=0, conv_factor=0.1):
+    def __init__(self,
+                 name,
+                 root_comp,
+                 z_coord=0,
+                 conv_factor=0.1,
+                 handles=None,
+                 logical_id=None,
+                 offset=None,
+                 defer_compute=False):
         self.name = name
         self.root_comp = root_comp
+        self.handles = handles
+        self.logical_id = logical_id or name
         self.z_coord = z_coord
         self.conv_factor = conv_factor
+        self.offset = offset or Point(0, 0)
+        self.defer_compute = defer_compute
         self.points = {}
         self.sketch = None
         self.sketch_points = None
         self.sketch_lines = None
         self.sketch_circles = None
+        self.holds_cutouts = False
+
+    def find_existing(self):
+        """Returns the existing sketch, or None.
+
+        The handle index is used if there is one, so sketches of other boxes
+        with the same name are never picked up.  In the index's unnamed
+        namespace, a sketch not in the index yet (drawn before sketches were
+        tracked) is found by name and added to it.
+        """
+        if self.handles is not None:
+            sketch = self.handles.find(self.logical_id)
+            if sketch is not None or self.handles.namespace:
+                return sketch
+        if not self.name:
+            return None
+        sketch = self.root_comp.sketches.itemByName(self.name)
+        if sketch and self.handles is not None:
+            self.handles.store(self.logical_id, sketch)
+        return sketch
 
     def retrieve(self):
-        sketches = self.root_comp.sketches
-        existing_sketch = sketches.itemByName(self.name)
+        existing_sketch = self.find_existing()
         if not existing_sketch:
             raise
         self.sketch = existing_sketch
@@ -71,25 +118,35 @@ class SketchContainer(object):
 
     def create(self, overwrite=True):
         sketches = self.root_comp.sketches
-        if self.name:
-            existing_sketch = sketches.itemByName(self.name)
-        else:
-            existing_sketch = None
+        existing_sketch = self.find_existing()
         if existing_sketch and not overwrite:
             self.sketch = existing_sketch
         else:
             if existing_sketch:
                 existing_sketch.deleteMe()
             xyPlane = self.root_comp.xYConstructionPlane
-            self.sketch = sketches.add(xyPlane)
-            if self.name:
-                self.sketch.name = self.name
-            else:
-                self.name = self.sketch.name
+            self.adopt(sketches.add(xyPlane))
+        if self.defer_compute:
+            self.sketch.isComputeDeferred = True
         self.sketch_points = self.sketch.sketchPoints
         self.sketch_lines = self.sketch.sketchCurves.sketchLines
         self.sketch_circles = self.sketch.sketchCurves.sketchCircles
 
+    def adopt(self, sketch):
+        """Names and records a newly made sketch as this container's."""
+        self.sketch = sketch
+        if self.name:
+            self.sketch.name = self.name
+        else:
+            self.name = self.sketch.name
+        if self.handles is not None:
+            self.handles.store(self.logical_id, self.sketch)
+
+    def compute(self):
+        """Recomputes the sketch if its computation was deferred."""
+        if self.sketch is not None and self.sketch.isComputeDeferred:
+            self.sketch.isComputeDeferred = False
+
     def plot_points(self, points: List[Point]) -> List[SketchPoint]:
         """Takes a list of geometric points and returns sketch points, creating
          them if they aren't already present (in this class).
@@ -117,8 +174,9 @@ class SketchContainer(object):
         return sketch_point
 
     def point3d_from_point(self, point: Point):
-        return Point3D.create(point.x * self.conv_factor,
-                              point.y * self.conv_factor, self.z_coord)
+        return Point3D.create((point.x + self.offset.x) * self.conv_factor,
+                              (point.y + self.offset.y) * self.conv_factor,
+                              self.z_coord)
 
     def plot_line(self, line: Line):
         source, dest = self.plot_points(line.points())
@@ -151,7 +209,7 @@ class SketchContainer(object):
         point_2 = self.point3d_from_point(corner_2)
         self.sketch_lines.addTwoPointRectangle(point_1, point_2)
 
-    def draw_side(self, side: Side, draw_construction):
+    def draw_side(self, side: Side, draw_construction, include_cutouts=False):
         """Takes a geometric Side and creates corresponding sketch components
 
         Note that construction lines on the 360 side are not yet implemented.
@@ -161,19 +219,42 @@ class SketchContainer(object):
         Args:
             side: geometric side to be drawn/created
             draw_construction: if false, we ignore construction lines.
+            include_cutouts: if true, the side's cutouts (with patterns
+                expanded) are drawn in the same sketch.
 
         """
-        for line in side.all_lines():
-            if draw_construction or not line.is_construction:
-                self.plot_line(line)
-
-    def extrude(self, thickness: Dim, operation, name_body=False):
+        self.draw_geometry(
+            side.iter_lines(include_construction=draw_construction),
+            side.iter_cutout_coords() if include_cutouts else ())
+
+    def draw_geometry(self, lines, cutouts=()):
+        """Draws lines and cutouts (see cutout_table.cutout_coords)."""
+        drawn_lines = False
+        for line in lines:
+            self.plot_line(line)
+            drawn_lines = True
+        for (kind, _name, x0, y0, x1, y1) in cutout_coords(cutouts):
+            self.draw_cutout(kind, Point(x0, y0), Point(x1, y1))
+            self.holds_cutouts = drawn_lines
+
+    def draw_cutout(self, kind, corner_1, corner_2):
+        if kind == 'circle':
+            self.draw_circle_from_2_points(corner_1, corner_2)
+        elif kind == 'rect':
+            self.draw_rect_from_2_points(corner_1, corner_2)
+
+    def extrude(self,
+                thickness: Dim,
+                operation,
+                name_body=False,
+                all_profiles=False):
         """Extrudes the sketch a specified distance in a specified way.
 
         This should not be used on sketches with multiple profiles unless care
         is taken to ensure the last profile is the desired one.  Profiles are
         not well-labeled and so inferring the correct profile is application
-        dependent.
+        dependent.  Sketches holding several cutouts can instead be extruded
+        with all_profiles.
 
         Args:
             thickness (Dim): distance to extrude
@@ -181,16 +262,124 @@ class SketchContainer(object):
                 component)
             name_body (bool): if true, assign current sketch name to the new
                 body.
+            all_profiles (bool): if true, extrude every profile of the sketch
+                in a single feature.
+
+        Returns:
+            the Fusion 360 extrude feature
         """
-        profiles = self.sketch.profiles
-        # Take the last profile (arbitrary)
-        profile = profiles.item(profiles.count - 1)
+        profile = self.select_profiles(all_profiles)
         extrudes = self.root_comp.features.extrudeFeatures
         extrude_distance = ValueInput.createByReal(
             thickness.dist * self.conv_factor)
         ext = extrudes.addSimple(profile, extrude_distance, operation)
         if name_body:
             ext.bodies.item(0).name = self.name
+        return ext
+
+    def select_profiles(self, all_profiles=False):
+        """Returns the profile (or collection of profiles) to extrude.
+
+        A sketch holding cutouts inside its outline has a profile per
+        cutout, all inside the outer one, so the profile with the largest
+        bounding box is taken.  Otherwise the last profile is taken.
+        """
+        profiles = self.sketch.profiles
+        if all_profiles:
+            collection = ObjectCollection.create()
+            for index in range(profiles.count):
+                collection.add(profiles.item(index))
+            return collection
+        if self.holds_cutouts:
+            return max((profiles.item(index)
+                        for index in range(profiles.count)),
+                       key=_bounding_area)
+        # Take the last profile (arbitrary)
+        return profiles.item(profiles.count - 1)
+
+
+def _bounding_area(profile):
+    box = profile.boundingBox
+    return ((box.maxPoint.x - box.minPoint.x) *
+            (box.maxPoint.y - box.minPoint.y))
+
+
+class DxfSketchContainer(SketchContainer):
+    """Creates sketches by importing a generated DXF file.
+
+    Drawing with SketchContainer takes an API call or two per line, which
+    adds up to hundreds of calls for a tab-heavy side.  This container
+    writes the geometry to a temporary DXF file (see geometry_util.dxf) and
+    brings it in with a single import call.  The imported sketch is then
+    checked to have as many curves as entities were written.
+
+    Imports always make a new sketch, so create() only removes an existing
+    sketch, and the sketch is made when geometry is drawn.  An existing
+    sketch kept by create(overwrite=False) is drawn on one entity at a time.
+    With defer_compute, the imported sketch is left deferred until compute()
+    like any other.
+
+    Coordinates are written in millimetres (conv_factor converts to cm).
+
+    Args:
+        name (string): Name of the sketch to be drawn or retrieved
+        root_comp: Root component of the design
+        import_manager: Fusion 360 import manager (app.importManager)
+        kwargs: other SketchContainer arguments
+
+    """
+
+    def __init__(self, name, root_comp, import_manager, **kwargs):
+        super().__init__(name, root_comp, **kwargs)
+        self.import_manager = import_manager
+
+    def create(self, overwrite=True):
+        existing_sketch = self.find_existing()
+        if existing_sketch and not overwrite:
+            super().create(overwrite=False)
+            return
+        if existing_sketch:
+            existing_sketch.deleteMe()
+        self.sketch = None
+
+    def draw_geometry(self, lines, cutouts=()):
+        if self.sketch is not None:
+            super().draw_geometry(lines, cutouts)
+            return
+        # Imported here, so scripts not importing DXF files skip them
+        import tempfile
+        from geometry_util.dxf import write_dxf
+
+        lines = list(lines)
+        cutouts = list(cutouts)
+        (handle, path) = tempfile.mkstemp(suffix=".dxf")
+        try:
+            with os.fdopen(handle, "w") as dxf_file:
+                expected = write_dxf(
+                    dxf_file,
+                    lines,
+                    cutouts,
+                    scale=self.conv_factor * 10,
+                    offset=self.offset.coords())
+            options = self.import_manager.createDXF2DImportOptions(
+                path, self.root_comp.xYConstructionPlane)
+            options.isSingleSketchResult = True
+            self.import_manager.importToTarget(options, self.root_comp)
+        finally:
+            os.remove(path)
+        self.adopt(options.results.item(0))
+        if self.defer_compute:
+            self.sketch.isComputeDeferred = True
+        self.sketch_points = self.sketch.sketchPoints
+        self.sketch_lines = self.sketch.sketchCurves.sketchLines
+        self.sketch_circles = self.sketch.sketchCurves.sketchCircles
+        self.holds_cutouts = bool(lines and cutouts)
+
+        imported = self.sketch_lines.count + self.sketch_circles.count
+        if imported != expected:
+            raise ValueError(
+                "DXF import of sketch {} made {} curves, expected {}".format(
+                    self.name, imported, expected))
 
 
 class BoxPlotter(object):
@@ -208,23 +397,85 @@ class BoxPlotter(object):
     that retrieved sketches don't retrieve the original conversion factor,
     z coordinate, or list of (geometric, non-360-sketchpoint) points.
 
+    With instance_sides, each side shape (see Side.shape_key) is sketched
+    and extruded once, and the other sides of that shape are placed from
+    the first one's component, moved into place.  Cuts on a component apply
+    to all of its occurrences, so sides whose cutouts match too (see
+    Side.instance_key) become occurrences of the first one's component.
+    Sides with other cutouts get a copy of the component instead, made
+    before anything is cut, and their cutouts are cut in that copy only.
+
+    With an entity_budget, a side whose geometry would make a sketch of more
+    entities than the budget is split across several sketches (see
+    geometry_util.sharding).  The first sketch of a side holds its outline
+    and is extruded as before; any further outline loops get sketches named
+    "<side>_<n>".  Individual cutouts are grouped by area into sketches
+    named "<side>_cutouts_<n>", each cut with all its profiles at once,
+    instead of one sketch per cutout.  Cutouts added in bulk (Side.add_cutouts)
+    are always drawn together, in a sketch named "<side>_cutout_table" when
+    there is no budget.
+
+    With dxf_import, sketches are drawn with DxfSketchContainer, one import
+    call per sketch.  Unless sides are sharded or construction lines are
+    drawn, a side's cutouts are then imported with its outline, its outer
+    profile is extruded with the holes already in it, and sketch_cutouts
+    leaves the side alone.
+
     Args:
-        name (string): Name of the sketch to be drawn or retrieved
-        root_comp: Root component of the design
-        z_coord (float, optional): z component of sketch objects in cm.
+        app: Fusion 360 application
+        box (Box): geometric box to draw
         conv_factor (float, optional): factor to multiply units by before
             creating objects.  Defaults to 0.1 (mm) since 360 default is cm.
+        instance_sides (bool, optional): whether to reuse the components of
+            sides of the same shape
+        namespace (str, optional): sketches are always tracked in a
+            persistent HandleIndex instead of being found by name.  If a
+            namespace is given, they are tracked under it and sketch names
+            are prefixed with it.  Use a different namespace for each box in
+            a document.  Without one, the index's unnamed namespace is used,
+            and sketches from runs before they were tracked are found by
+            name once.
+        entity_budget (int, optional): largest number of sketch entities to
+            put in one sketch, or None to keep the one sketch per side and
+            per cutout layout
+        dxf_import (bool, optional): whether to draw sketches by importing
+            generated DXF files
+        offset (Point, optional): added to all of the box's geometry when
+            drawing, to place several boxes in one design
+        defer_compute (bool, optional): if true, sketches are not recomputed
+            while they are drawn, only when compute_sketches is called (which
+            extrude_sides and cut_sides do first)
+        handles (HandleIndex, optional): index to use for the namespace
+            instead of reading a new one from the design
 
     Attributes:
-        points: dict from geometric points (used when constructing) to
-            Fusion 360 sketchpoints
-        sketch: Fusion 360 sketch object
-        sketch_points: Fusion 360 object for managing sketch points
-        sketch_lines: Fusion 360 object for managing sketch lines
-        sketch_circles: Fusion 360 object for managing sketch circles
+        sketches: dict from side (and outline shard) names to
+            SketchContainers
+        cutout_sketches: dict from cutout (and cutout shard) names to
+            SketchContainers
+        cutout_shards: set of cutout_sketches names holding several cutouts
+        included_cutouts: set of names of sides whose cutouts were drawn in
+            their side sketch
+        cutout_patterns: dict from cutout names to CutoutPatterns
+        instances: dict from names of instanced sides to the side whose
+            component they reuse
+        copies: dict from names of copied sides to the side whose (uncut)
+            component they copy
+        components: dict from side names to Fusion 360 components
+        handles: HandleIndex for the namespace (or the unnamed namespace)
 
     """
-    def __init__(self, app, box, conv_factor=0.1):
+    def __init__(self,
+                 app,
+                 box,
+                 conv_factor=0.1,
+                 instance_sides=False,
+                 namespace=None,
+                 entity_budget=None,
+                 dxf_import=False,
+                 offset=None,
+                 defer_compute=False,
+                 handles=None):
         self.app = app
         self.box = box
         self.user_params = app.activeProduct.userParameters
@@ -232,6 +483,54 @@ class BoxPlotter(object):
         self.conv_factor = conv_factor
         self.sketches = {}
         self.cutout_sketches = {}
+        self.cutout_patterns = {}
+        self.cutout_shards = set()
+        self.entity_budget = entity_budget
+        self.dxf_import = dxf_import
+        self.included_cutouts = set()
+        self.offset = offset
+        self.defer_compute = defer_compute
+        self.components = {}
+        self.instances = {}
+        self.copies = {}
+        if instance_sides:
+            (self.instances, self.copies) = self.find_instances()
+        self.namespace = namespace
+        if handles is not None:
+            self.handles = handles
+        else:
+            self.handles = HandleIndex(app.activeProduct, namespace or "")
+
+    def sketch_container(self, name, kind, draw=True):
+        """Returns a SketchContainer for a side or cutout of this box.
+
+        Args:
+            name (str): side or cutout name, unique among those of its kind
+            kind (str): 'side' or 'cutout'
+            draw (bool, optional): whether geometry will be drawn.  A
+                DxfSketchContainer is returned for drawing with dxf_import.
+
+        Raises:
+            ValueError: if name is empty, since the sketch could not be told
+                apart from others of its kind in the handle index.
+
+        """
+        if not name:
+            raise ValueError("Cannot track an unnamed {} sketch".format(kind))
+        sketch_name = name
+        if self.namespace:
+            sketch_name = "{}_{}".format(self.namespace, name)
+        kwargs = {
+            "conv_factor": self.conv_factor,
+            "handles": self.handles,
+            "logical_id": "{}/{}".format(kind, name),
+            "offset": self.offset,
+            "defer_compute": self.defer_compute,
+        }
+        if self.dxf_import and draw:
+            return DxfSketchContainer(sketch_name, self.root_comp,
+                                      self.app.importManager, **kwargs)
+        return SketchContainer(sketch_name, self.root_comp, **kwargs)
 
     # Set a user parameter to a simple Dim name/value
     # Currently unused
@@ -244,41 +543,230 @@ class BoxPlotter(object):
             val = ValueInput.createByString("{} mm".format(dim.dist))
             return self.user_params.add(dim.dist_label, val, "mm", "")
 
-    def sketch_sides(self, draw=True, draw_construction=False, overwrite=True):
+    def find_instances(self):
+        """Maps each side of the same shape as an earlier side onto the first
+        side of that shape.
+
+        Returns:
+            (instances, copies): dicts from side names to the names of the
+            sides they repeat.  Instances have the same cutouts as their
+            original, copies have others.
+
+        """
+        first_by_shape = {}
+        first_by_key = {}
+        instances = {}
+        copies = {}
         for (side_name, side) in self.box.sides().items():
-            sketch = SketchContainer(side_name, self.root_comp)
-            sketch.create(overwrite=overwrite)
-            if draw:
-                sketch.draw_side(side, draw_construction)
-            self.sketches[side_name] = sketch
+            shape = side.shape_key()
+            key = side.instance_key()
+            if key in first_by_key:
+                instances[side_name] = first_by_key[key]
+            elif shape in first_by_shape:
+                copies[side_name] = first_by_shape[shape]
+                first_by_key[key] = side_name
+            else:
+                first_by_shape[shape] = side_name
+                first_by_key[key] = side_name
+        return (instances, copies)
+
+    def drawn_sides(self):
+        """Returns (name, side) pairs for sides that get their own outline
+        sketches."""
+        return [(side_name, side)
+                for (side_name, side) in self.box.sides().items()
+                if side_name not in self.instances and
+                side_name not in self.copies]
+
+    def cutout_sides(self):
+        """Returns (name, side) pairs for sides that get their own cutout
+        sketches (drawn sides and copies)."""
+        return [(side_name, side)
+                for (side_name, side) in self.box.sides().items()
+                if side_name not in self.instances]
+
+    def check_sides(self):
+        """Checks all sides for crossing or overlapping geometry.
+
+        Fusion 360 can hang or fail silently on such sketches, so this is run
+        before sketching.
+
+        Raises:
+            ValueError: if any side has crossings, T-junctions or overlaps.
 
-    def sketch_cutouts(self, draw_construction=False, overwrite=True):
+        """
+        problems = []
         for (side_name, side) in self.box.sides().items():
-            for cutout in side.cutouts:
-                (kind, name, corner_1, corner_2) = cutout
-                # TODO: validate cutout type before creating sketch
-                sketch = SketchContainer(name, self.root_comp)
+            for found in check_side(side):
+                problems.append("{}: {} at {} ({})".format(
+                    side_name, found.kind, found.point,
+                    ", ".join(str(ref) for ref in found.refs)))
+        if problems:
+            raise ValueError("Invalid sketch geometry:\n{}".format(
+                "\n".join(problems)))
+
+    def shard_side(self, side, draw_construction=False):
+        """Plans a side's sketches under the entity budget (see
+        geometry_util.sharding.shard_side)."""
+        # Imported here, since only needed with an entity budget
+        from geometry_util.sharding import shard_side
+        return shard_side(side, self.entity_budget, draw_construction)
+
+    def sketch_sides(self,
+                     draw=True,
+                     draw_construction=False,
+                     overwrite=True,
+                     check=True):
+        if draw and check:
+            self.check_sides()
+        # Copies are made from the uncut outline
+        copied = set(self.copies.values())
+        for (side_name, side) in self.drawn_sides():
+            if self.entity_budget is None:
+                include_cutouts = (draw and self.dxf_import and
+                                   not draw_construction and
+                                   side_name not in copied)
+                sketch = self.sketch_container(side_name, 'side', draw)
+                sketch.create(overwrite=overwrite)
+                if draw:
+                    sketch.draw_side(side, draw_construction, include_cutouts)
+                if include_cutouts:
+                    self.included_cutouts.add(side_name)
+                self.sketches[side_name] = sketch
+                continue
+            (line_shards, _cutout_shards) = self.shard_side(
+                side, draw_construction)
+            for shard in line_shards:
+                shard_name = side_name
+                if shard.index:
+                    shard_name = "{}_{}".format(side_name, shard.index + 1)
+                sketch = self.sketch_container(shard_name, 'side', draw)
                 sketch.create(overwrite=overwrite)
-                if kind == 'circle':
-                    sketch.draw_circle_from_2_points(corner_1, corner_2)
-                elif kind == 'rect':
-                    sketch.draw_rect_from_2_points(corner_1, corner_2)
-                self.cutout_sketches[name] = sketch
+                if draw:
+                    sketch.draw_geometry(shard.lines)
+                self.sketches[shard_name] = sketch
+
+    def sketch_cutouts(self, draw_construction=False, overwrite=True):
+        """Creates a sketch per cutout, or per cutout shard.
+
+        Cutout patterns get a single sketch containing only their seed
+        cutout; cut_sides repeats the seed's cut with a pattern feature.
+        Sides whose cutouts were imported with their outline are skipped,
+        and copied sides get their own cutout sketches.  Unnamed cutouts and patterns are named after their side and position,
+        as "<side>_cutout_<n>" and "<side>_pattern_<n>".
+
+        """
+        for (side_name, side) in self.cutout_sides():
+            if side_name in self.included_cutouts:
+                continue
+            if self.entity_budget is None:
+                for (index, (kind, name, corner_1,
+                             corner_2)) in enumerate(side.cutouts):
+                    name = name or "{}_cutout_{}".format(side_name, index + 1)
+                    self.sketch_cutout(
+                        kind, name, corner_1, corner_2, overwrite=overwrite)
+                # Cutouts added in bulk share one sketch
+                if len(side.cutout_table):
+                    self.sketch_cutout_shard(
+                        "{}_cutout_table".format(side_name),
+                        side.cutout_table,
+                        overwrite=overwrite)
+            else:
+                (_line_shards, cutout_shards) = self.shard_side(
+                    side, draw_construction)
+                for shard in cutout_shards:
+                    self.sketch_cutout_shard(
+                        "{}_cutouts_{}".format(side_name, shard.index + 1),
+                        shard.cutouts,
+                        overwrite=overwrite)
+            for (index, pattern) in enumerate(side.cutout_patterns):
+                name = pattern.name or "{}_pattern_{}".format(
+                    side_name, index + 1)
+                self.sketch_cutout(
+                    pattern.kind,
+                    name,
+                    pattern.corner_1,
+                    pattern.corner_2,
+                    overwrite=overwrite)
+                self.cutout_patterns[name] = pattern
+
+    def sketch_cutout(self, kind, name, corner_1, corner_2, overwrite=True):
+        # TODO: validate cutout type before creating sketch
+        sketch = self.sketch_container(name, 'cutout')
+        sketch.create(overwrite=overwrite)
+        sketch.draw_geometry((), [(kind, name, corner_1, corner_2)])
+        self.cutout_sketches[name] = sketch
+
+    def sketch_cutout_shard(self, name, cutouts, overwrite=True):
+        """Creates one sketch holding several cutouts.
+
+        Args:
+            name (str): sketch name
+            cutouts: CutoutTable or list of (kind, name, corner_1, corner_2)
+                tuples
+
+        """
+        sketch = self.sketch_container(name, 'cutout')
+        sketch.create(overwrite=overwrite)
+        sketch.draw_geometry((), cutouts)
+        self.cutout_sketches[name] = sketch
+        self.cutout_shards.add(name)
+
+    def sketch_cut_sheet(self, name="cut_sheet", merge_common=True,
+                         overwrite=True):
+        """Draws all sides, as laid out, into one sketch for laser cutting.
+
+        The sketch is meant to be exported (for instance as DXF) and is not
+        extruded or cut.  Construction lines are left out, and cutouts are
+        drawn with patterns expanded.  geometry_util.dxf.box_dxf writes the
+        same sheet without Fusion 360.
+
+        Args:
+            name (str, optional): sketch name
+            merge_common (bool, optional): whether to draw boundaries shared
+                by neighbouring sides once (see
+                geometry_util.common_line.merge_box; useful for nested boxes
+                with zero spacing)
+
+        Returns:
+            the SketchContainer
+
+        """
+        if merge_common:
+            # Imported here, since only needed for cut sheets
+            from geometry_util.common_line import merge_box
+            lines = merge_box(self.box).lines
+        else:
+            lines = self.box.iter_lines(include_construction=False)
+        sketch = self.sketch_container(name, 'cut_sheet')
+        sketch.create(overwrite=overwrite)
+        sketch.draw_geometry(lines, [
+            cutout for side in self.box.sides().values()
+            for cutout in side.iter_cutout_coords()
+        ])
+        return sketch
+
+    def compute_sketches(self):
+        """Recomputes all sketches whose computation was deferred."""
+        for sketch in list(self.sketches.values()) + list(
+                self.cutout_sketches.values()):
+            sketch.compute()
 
     def retrieve(self, sketch_names):
         for side_name in sketch_names:
-            sketch = SketchContainer(side_name, self.root_comp)
+            sketch = self.sketch_container(side_name, 'side')
             sketch.retrieve()
             self.sketches[side_name] = sketch
 
     def retrieve_sides(self):
-        self.retrieve(self.box.sides())
+        self.retrieve([side_name for (side_name, _side) in self.drawn_sides()])
 
     def extrude_sketch(self,
                        sketch_name,
                        thickness: Dim,
                        operation,
-                       name_body=False):
+                       name_body=False,
+                       all_profiles=False):
         """Extrudes the sketch a specified distance in a specified way.
 
         This should not be used on sketches with multiple profiles unless care
@@ -292,13 +780,21 @@ class BoxPlotter(object):
                 component)
             name_body (bool): if true, assign current sketch name to the new
                 body.
+            all_profiles (bool): if true, extrude every profile of the sketch
+                in a single feature.
+
+        Returns:
+            the Fusion 360 extrude feature
         """
         all_sketches = {**self.sketches, **self.cutout_sketches}
         if sketch_name not in all_sketches:
             raise
 
-        all_sketches[sketch_name].extrude(
-            thickness, operation, name_body=name_body)
+        return all_sketches[sketch_name].extrude(
+            thickness,
+            operation,
+            name_body=name_body,
+            all_profiles=all_profiles)
 
     def extrude_sides(self, side_names=None):
         """Extrudes a list of sides.
@@ -306,7 +802,10 @@ class BoxPlotter(object):
         Sides are extruded a distance equal to the box thickness into new
         components.
 
-        If no side names are passed, all sides are extruded.
+        If no side names are passed, all sides are extruded.  Instanced and
+        copied sides are placed as occurrences of (a copy of) their
+        original's component, which must be extruded first (or in the same
+        call), and before cut_sides.
 
         Args:
             side_names: list of side sketch names, or None if all sides should
@@ -315,22 +814,102 @@ class BoxPlotter(object):
         """
         if not side_names:
             side_names = self.box.sides().keys()
+        self.compute_sketches()
         # Extrude sides into new components
         for sketch_name in side_names:
-            self.extrude_sketch(
+            if sketch_name in self.instances or sketch_name in self.copies:
+                continue
+            ext = self.extrude_sketch(
                 sketch_name,
                 self.box.thickness,
                 FeatureOperations.NewComponentFeatureOperation,
                 name_body=True)
+            self.components[sketch_name] = ext.bodies.item(0).parentComponent
+        for sketch_name in side_names:
+            if sketch_name in self.instances or sketch_name in self.copies:
+                self.add_instance(sketch_name)
+
+    def add_instance(self, side_name):
+        """Places an occurrence of the component of a side of the same shape.
+
+        Instanced sides share the original's component.  Copied sides get a
+        new copy of it, which their own cuts then apply to.
+
+        Args:
+            side_name (str): name of an instanced or copied side
+
+        Returns:
+            the new Fusion 360 occurrence
+        """
+        original = self.instances.get(side_name) or self.copies[side_name]
+        sides = self.box.sides()
+        source = sides[original].side_info.bb_sw_corner
+        dest = sides[side_name].side_info.bb_sw_corner
+        transform = Matrix3D.create()
+        transform.translation = Vector3D.create(
+            (dest.x - source.x) * self.conv_factor,
+            (dest.y - source.y) * self.conv_factor, 0)
+        occurrences = self.root_comp.occurrences
+        if side_name in self.copies:
+            occurrence = occurrences.addNewComponentCopy(
+                self.components[original], transform)
+        else:
+            occurrence = occurrences.addExistingComponent(
+                self.components[original], transform)
+        self.components[side_name] = occurrence.component
+        return occurrence
 
     def cut_sides(self):
         """Cut-extrudes all cutout features of all sides.
 
-        Cut depth is equal to box thickness to match extrude_sides
+        Cut depth is equal to box thickness to match extrude_sides.  Cutout
+        shard sketches are cut with all their profiles in one feature.
 
         """
+        self.compute_sketches()
         for (name, sketch) in self.cutout_sketches.items():
-            self.cut_feature(name, self.box.thickness)
+            cut = self.cut_feature(name, self.box.thickness)
+            if name in self.cutout_patterns:
+                self.pattern_feature(cut, self.cutout_patterns[name])
+
+    def pattern_feature(self, feature, pattern):
+        """Repeats a feature with a rectangular pattern feature.
+
+        Pattern steps always point along +x or +y (see CutoutPattern), so
+        the root component's construction axes give the directions.
+
+        Args:
+            feature: Fusion 360 feature to repeat
+            pattern (CutoutPattern): pattern supplying counts and steps
+
+        Returns:
+            the Fusion 360 rectangular pattern feature
+        """
+        if len(pattern) == 1:
+            return None
+        entities = ObjectCollection.create()
+        entities.add(feature)
+        patterns = self.root_comp.features.rectangularPatternFeatures
+        directions = []
+        for (step, count) in ((pattern.step_1, pattern.count_1),
+                              (pattern.step_2, pattern.count_2)):
+            if step.x:
+                axis = self.root_comp.xConstructionAxis
+            else:
+                axis = self.root_comp.yConstructionAxis
+            directions.append(
+                (axis, ValueInput.createByReal(count),
+                 ValueInput.createByReal(
+                     (step.x + step.y) * self.conv_factor)))
+        if pattern.count_1 == 1:
+            directions.reverse()
+        (axis, count, distance) = directions[0]
+        pattern_input = patterns.createInput(
+            entities, axis, count, distance,
+            PatternDistanceType.SpacingPatternDistanceType)
+        if pattern.count_1 > 1 and pattern.count_2 > 1:
+            pattern_input.setDirectionTwo(*directions[1])
+        return patterns.add(pattern_input)
 
     def cut_feature(self, sketch_name, thickness):
         """Cut-extrudes a single cutout feature.
@@ -339,6 +918,11 @@ class BoxPlotter(object):
             sketch_name (str): name of sketch to cut with
             thickness (Dim): distance to cut
 
+        Returns:
+            the Fusion 360 extrude feature
         """
-        self.extrude_sketch(sketch_name, thickness,
-                            FeatureOperations.CutFeatureOperation)
+        return self.extrude_sketch(
+            sketch_name,
+            thickness,
+            FeatureOperations.CutFeatureOperation,
+            all_profiles=sketch_name in self.cutout_shards)
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""Tests BoxPlotter against the fake Fusion 360 API.
+"""
+from fusion360_util.fake_api import make_app
+from fusion360_util.tabbed_box import BoxPlotter
+from geometry_util.box import Box
+from geometry_util.geometry import Point
+from projects.psu_4mm_acrylic.spec import specify_box
+
+
+def make_box():
+    box = Box(100, 50, 65, 3, 2)
+    box.bottom_side.add_cutout('rect', Point(10, 10), Point(20, 15))
+    box.bottom_side.add_cutout('circle', Point(40, 10), Point(46, 16))
+    return box
+
+
+def plot(app, box, **options):
+    plotter = BoxPlotter(app, box, **options)
+    plotter.sketch_sides()
+    plotter.sketch_cutouts()
+    plotter.extrude_sides()
+    plotter.cut_sides()
+    return plotter
+
+
+def sketch_names(app):
+    return sorted(sketch.name
+                  for sketch in app.activeProduct.rootComponent.sketches)
+
+
+def test_unnamed_cutouts_survive_a_run():
+    app = make_app()
+    box = make_box()
+    plotter = plot(app, box)
+    names = sketch_names(app)
+    assert "bottom_cutout_1" in names and "bottom_cutout_2" in names
+    assert len(names) == 6 + 2
+    cuts = [feature for feature in
+            app.activeProduct.rootComponent.features.extrudeFeatures
+            if feature.operation == "cut"]
+    assert [cut.sketch.name for cut in cuts] == [
+        "bottom_cutout_1", "bottom_cutout_2"]
+    assert sorted(plotter.cutout_sketches) == [
+        "bottom_cutout_1", "bottom_cutout_2"]
+
+    # A rerun replaces each sketch instead of another one sharing its ID
+    plot(app, box)
+    assert sketch_names(app) == names
+
+
+def test_unnamed_patterns_get_their_own_sketches():
+    app = make_app()
+    box = Box(100, 50, 65, 3, 2)
+    for y in (5, 20):
+        box.bottom_side.add_cutout_pattern(
+            'circle', Point(5, y), Point(8, y + 3), 4, 6)
+    plotter = plot(app, box)
+    assert sorted(plotter.cutout_patterns) == [
+        "bottom_pattern_1", "bottom_pattern_2"]
+    assert len(app.activeProduct.rootComponent.features
+               .rectangularPatternFeatures) == 2
+
+
+def test_find_instances_splits_instances_and_copies():
+    box = Box(100, 50, 65, 3, 2)
+    box.upper_side.add_cutout('rect', Point(5, 5), Point(15, 10))
+    box.lower_side.add_cutout('rect', Point(5, 5), Point(15, 10))
+    box.left_side.add_cutout('circle', Point(5, 5), Point(9, 9))
+    plotter = BoxPlotter(make_app(), box, instance_sides=True)
+    assert plotter.instances == {"top": "bottom", "lower": "upper"}
+    assert plotter.copies == {"left": "right"}
+    assert [name for (name, _side) in plotter.drawn_sides()] == [
+        "bottom", "right", "upper"]
+    assert [name for (name, _side) in plotter.cutout_sides()] == [
+        "bottom", "right", "upper", "left"]
+
+
+def test_sides_with_other_cutouts_get_component_copies():
+    app = make_app()
+    box = specify_box()
+    plotter = plot(app, box, instance_sides=True, dxf_import=True)
+    assert plotter.instances == {"top": "bottom"}
+    assert plotter.copies == {"left": "right", "lower": "upper"}
+
+    root = app.activeProduct.rootComponent
+    extrudes = [feature.sketch.name for feature in
+                root.features.extrudeFeatures
+                if feature.operation == "new_component"]
+    assert extrudes == ["bottom", "right", "upper"]
+    occurrences = {
+        name: plotter.components[name] for name in ("top", "left", "lower")
+    }
+    assert occurrences["top"] is plotter.components["bottom"]
+    assert occurrences["left"].copy_of is plotter.components["right"]
+    assert occurrences["lower"].copy_of is plotter.components["upper"]
+
+    # The copied upper side keeps its cutouts out of its outline, and every
+    # side with cutouts is cut on its own
+    assert "upper" not in plotter.included_cutouts
+    cut_sketches = {
+        feature.sketch.name for feature in root.features.extrudeFeatures
+        if feature.operation == "cut"
+    }
+    for side_name in ("upper", "left", "lower"):
+        side = box.sides()[side_name]
+        for (index, cutout) in enumerate(side.cutouts):
+            assert (cutout[1] or "{}_cutout_{}".format(
+                side_name, index + 1)) in cut_sketches
+    assert len(root.features.rectangularPatternFeatures) == 1
+
+
+def test_imported_sketches_stay_deferred_until_computed():
+    app = make_app()
+    plotter = BoxPlotter(app, make_box(), dxf_import=True,
+                         defer_compute=True)
+    plotter.sketch_sides()
+    plotter.sketch_cutouts()
+    sketches = list(app.activeProduct.rootComponent.sketches)
+    assert len(sketches) == 6
+    assert all(sketch.isComputeDeferred for sketch in sketches)
+    plotter.extrude_sides()
+    plotter.cut_sides()
+    assert not any(sketch.isComputeDeferred for sketch in sketches)
+    assert not any(
+        feature.deferred_sketch for feature in
+        app.activeProduct.rootComponent.features.extrudeFeatures)
@@ -0,0 +1,36 @@
+"""Python object models of tabbed boxes, independent of Fusion 360.
+
+Submodules are imported on first use, so importing the package is cheap
+and optional tools (exporters, previews, profiling) are only loaded by code
+that uses them.  The main classes are also available from the package
+itself, e.g. ``from geometry_util import Box, Point``.
+
+"""
+
+import importlib
+
+SUBMODULES = ("box", "common_line", "cutout_table", "disk_cache", "dxf",
+              "estimate", "fingerprint", "geometry", "intersect", "joints",
+              "preview", "profiling", "raster", "sharding")
+
+# Names exported by the package, and the submodules defining them
+EXPORTS = {
+    "Box": "box",
+    "Side": "box",
+    "Dim": "geometry",
+    "Line": "geometry",
+    "Point": "geometry",
+    "CutoutTable": "cutout_table",
+}
+
+__all__ = sorted(EXPORTS)
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    if name in EXPORTS:
+        return getattr(
+            importlib.import_module("." + EXPORTS[name], __name__), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(
+        __name__, name))
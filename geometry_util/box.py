@@ -13,8 +13,11 @@ objects.
 """
 
 
+from array import array
 from typing import NamedTuple
-from geometry import Dim, Line, Point
+
+from .cutout_table import CutoutTable, place_cutouts
+from .geometry import Dim, Line, Point
 
 # pylint: disable=too-few-public-methods,C0111,C0103,R0913,R0902
 
@@ -24,32 +27,62 @@ EdgeInfo = NamedTuple('EdgeInfo', [("is_wide", bool), ("is_tall", bool),
                                                                  Dim)])
 
 
-class Edge(object):
-    """Creates and contains lines for an edge of a side.
+def _dim_key(dim):
+    """Returns a hashable key for a Dim (or a plain number)."""
+    if isinstance(dim, Dim):
+        return (dim.dist, dim.dist_label)
+    return dim
+
+
+def _place(coords, origin, degrees):
+    """Rotates coords counter clockwise about (0, 0), then offsets them by
+    origin.  Matches Point.rotate for multiples of 90 degrees."""
+    cos = {0: 1, 90: 0, 180: -1, 270: 0}[degrees % 360]
+    sin = {0: 0, 90: 1, 180: 0, 270: -1}[degrees % 360]
+    (dx, dy) = coords
+    return (origin[0] + cos * dx - sin * dy, origin[1] + sin * dx + cos * dy)
 
-    During creation we assume that we are working with the south edge of the
-    side, and creating from left to right.
+
+class EdgeTemplate(object):
+    """Lines of an edge in its canonical frame, shared by identical edges.
+
+    The template is drawn once per distinct EdgeInfo as a south edge with
+    its left bounding box point at the origin.  Edges place it with a
+    rotation and an offset, so a box only generates each distinct edge shape
+    once (north/south and east/west of a side always match, as do the
+    bottom/top and upper/lower sides).
+
+    Templates are cached; use EdgeTemplate.get rather than the constructor.
 
     Args:
         edge_info (EdgeInfo): Contains init params.  See EdgeInfo documentation
-        bb_left (Point): Left bounding box of this edge.
-        rotate (int, optional): degrees of counter clockwise rotation to apply
 
     Attributes:
-        bb_left (Point): left exterior bounding box point
-        notch_width (Dim): width of this edge
-        notch_height (Dim): height of this edge
-        notch_count (int): number of notches in this edge
-        notch_height_other (Dim): height of joining edges
-        is_wide (bool): whether the edge's width extends to bounding box
-        is_tall (bool): whether the edge's corner height extends to bb
-        bb_right (Point): right exterior bounding box point
-        inner_bb_left (Point): left interior bounding box point
-        lines (list[Line]): lines in this edge
+        points (list[tuple]): distinct line endpoint coordinates
+        lines (list[tuple]): (source index, dest index, is_construction,
+            length) for each line, in the order of Edge.lines
+        bb_right (tuple): right exterior bounding box coordinates
+        inner_bb_left (tuple): left interior bounding box coordinates
 
     """
-    def __init__(self, edge_info: EdgeInfo, bb_left: Point, rotate: int=0):
-        self.bb_left = bb_left
+
+    _cache = {}
+    # Templates are small, but sweeps can create many distinct shapes.
+    CACHE_SIZE = 4096
+
+    @classmethod
+    def get(cls, edge_info: EdgeInfo):
+        key = tuple(_dim_key(value) for value in edge_info)
+        template = cls._cache.get(key)
+        if template is None:
+            if len(cls._cache) >= cls.CACHE_SIZE:
+                cls._cache.clear()
+            template = cls(edge_info)
+            cls._cache[key] = template
+        return template
+
+    def __init__(self, edge_info: EdgeInfo):
+        self.bb_left = Point(0, 0)
         self.notch_width = edge_info.notch_width
         self.notch_height = edge_info.notch_height
         self.notch_count = edge_info.notch_count
@@ -61,7 +94,7 @@ class Edge(object):
 
         self.lines = []
         self.create()
-        self.rotate(rotate)
+        self.flatten()
 
     def create(self):
         """Creates lines and bounding box points."""
@@ -121,24 +154,127 @@ class Edge(object):
         unsorted_lines = inner_lines + outer_lines + vert_lines
         self.lines = sorted(unsorted_lines, key=lambda x: x.coords_for_plot())
 
+    def flatten(self):
+        """Replaces drawn objects with plain coordinates and point indices."""
+        index = {}
+        self.points = []
+        flat_lines = []
+        for line in self.lines:
+            ends = []
+            for point in (line.source, line.dest):
+                if id(point) not in index:
+                    index[id(point)] = len(self.points)
+                    self.points.append(point.coords())
+                ends.append(index[id(point)])
+            flat_lines.append((ends[0], ends[1], line.is_construction,
+                               line.length))
+        self.lines = flat_lines
+        self.bb_right = self.bb_right.coords()
+        self.inner_bb_left = self.inner_bb_left.coords()
+        del self.bb_left
+
+
+class Edge(object):
+    """Creates and contains lines for an edge of a side.
+
+    The edge's shape comes from a cached EdgeTemplate, drawn as the south edge
+    of a side from left to right.  The edge places it at bb_left with the
+    given rotation.  Lines (and the template) are only created when first
+    accessed.
+
+    Args:
+        edge_info (EdgeInfo): Contains init params.  See EdgeInfo documentation
+        bb_left (Point): Left bounding box of this edge.
+        rotate (int, optional): degrees of counter clockwise rotation to apply
+
+    Attributes:
+        bb_left (Point): left exterior bounding box point
+        notch_width (Dim): width of this edge
+        notch_height (Dim): height of this edge
+        notch_count (int): number of notches in this edge
+        notch_height_other (Dim): height of joining edges
+        is_wide (bool): whether the edge's width extends to bounding box
+        is_tall (bool): whether the edge's corner height extends to bb
+        rotation (int): degrees of counter clockwise rotation applied
+        template (EdgeTemplate): shared canonical lines of this edge
+        bb_right (Point): right exterior bounding box point
+        inner_bb_left (Point): left interior bounding box point
+        lines (list[Line]): lines in this edge
+
+    """
+    def __init__(self, edge_info: EdgeInfo, bb_left: Point, rotate: int=0):
+        self.bb_left = bb_left
+        self.notch_width = edge_info.notch_width
+        self.notch_height = edge_info.notch_height
+        self.notch_count = edge_info.notch_count
+        self.notch_height_other = edge_info.notch_height_other
+        self.is_wide = edge_info.is_wide
+        self.is_tall = edge_info.is_tall
+        self.rotation = rotate
+        self.edge_info = edge_info
+        (bb_right, inner_bb_left) = _edge_extent(edge_info)
+        self.bb_right = self.place(bb_right)
+        self.inner_bb_left = self.place(inner_bb_left)
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, i.e. before create has run.
+        if name == 'lines':
+            self.create()
+            return self.__dict__['lines']
+        if name == 'template':
+            self.template = EdgeTemplate.get(self.__dict__['edge_info'])
+            return self.template
+        raise AttributeError(name)
+
+    def place(self, coords):
+        """Returns a point placed from template coordinates."""
+        return Point(*_place(coords, self.bb_left.coords(), self.rotation))
+
+    def create(self):
+        """Creates lines by placing the template's lines at bb_left."""
+        (ox, oy) = self.bb_left.coords()
+        cos = {0: 1, 90: 0, 180: -1, 270: 0}[self.rotation % 360]
+        sin = {0: 0, 90: 1, 180: 0, 270: -1}[self.rotation % 360]
+        points = [
+            Point(ox + cos * dx - sin * dy, oy + sin * dx + cos * dy)
+            for (dx, dy) in self.template.points
+        ]
+        self.lines = [
+            Line(points[source], points[dest], is_construction, length)
+            for (source, dest, is_construction, length) in self.template.lines
+        ]
+
+    def iter_lines(self, include_construction=True):
+        """Yields this edge's lines, optionally skipping construction lines.
+        """
+        for line in self.lines:
+            if include_construction or not line.is_construction:
+                yield line
+
     # Rotate counter clockwise around initial bounding box point.
     def rotate(self, degrees_in: int):
-        around = self.bb_left
+        """Rotates the edge counter clockwise around bb_left.
+
+        The rotation is added to the edge's placement, and lines are placed
+        again from the template when next read.  Line objects read before
+        the call are left as they were.
+        """
         assert (degrees_in % 90 == 0)
-        degrees = degrees_in % 360
-
-        if degrees == 0:
-            pass
-        elif degrees == 90:
-            # Take distinct points in case it was used more than once
-            points = set()
-            for line in self.lines:
-                points.update([line.source, line.dest])
-            for point in points:
-                point.rotate(degrees, around)
-        else:
-            self.rotate(90)
-            self.rotate(degrees - 90)
+        self.rotation = (self.rotation + degrees_in) % 360
+        (bb_right, inner_bb_left) = _edge_extent(self.edge_info)
+        self.bb_right = self.place(bb_right)
+        self.inner_bb_left = self.place(inner_bb_left)
+        self.__dict__.pop('lines', None)
+
+    def canonical_lines(self):
+        """Yields lines as they were before rotation, relative to bb_left.
+
+        Each item is (x0, y0, x1, y1, is_construction), in the frame used by
+        the template (the south edge, drawn from left to right).
+        """
+        points = self.template.points
+        for (source, dest, is_construction, _length) in self.template.lines:
+            yield points[source] + points[dest] + (is_construction, )
 
 SideInfo = NamedTuple(
     'SideInfo', [("bb_sw_corner", Point), ("is_wide", bool), ("is_tall", bool),
@@ -161,10 +297,174 @@ Args:
 """
 
 
+def side_extent(side_info: SideInfo):
+    """Returns the (width, height) of a side's outer bounding box.
+
+    This is computed from the side's info alone, without creating edges.
+    Like Edge, a negative notch count draws no notches.
+    """
+    ew_segments = 2 * max(side_info.ew_notch_count, 0) + 1
+    ns_segments = 2 * max(side_info.ns_notch_count, 0) + 1
+    width = (2 * side_info.ns_notch_height.dist +
+             ew_segments * side_info.ew_notch_width.dist)
+    height = (2 * side_info.ew_notch_height.dist +
+              ns_segments * side_info.ns_notch_width.dist)
+    return width, height
+
+
+def _edge_extent(edge_info: EdgeInfo):
+    """Returns EdgeTemplate's (bb_right, inner_bb_left) without drawing it.
+
+    Sums are taken in the order the template draws its outer lines, so the
+    results are identical to the drawn ones.
+    """
+    x = 0 + edge_info.notch_height_other.dist
+    x += edge_info.notch_width.dist
+    for _notch in range(edge_info.notch_count):
+        x += edge_info.notch_width.dist
+        x += edge_info.notch_width.dist
+    x += edge_info.notch_height_other.dist
+    return ((x, 0), (0 + edge_info.notch_height_other.dist,
+                     0 + edge_info.notch_height.dist))
+
+
+def side_shape_key(side_info: SideInfo):
+    """Returns a hashable key for a side's shape (its info less position).
+    """
+    return tuple(_dim_key(value) for value in side_info[1:])
+
+
+class SideTemplate(object):
+    """Edge placements of a side relative to its southwest corner.
+
+    Computed once per distinct side shape (see side_shape_key) and shared,
+    like EdgeTemplate.  Use SideTemplate.get rather than the constructor.
+    Only edge extents are needed, so no edge is drawn here: placing cutouts
+    on a side costs no line geometry.
+
+    Args:
+        side_info (SideInfo): Contains init params.  See SideInfo documentation
+
+    Attributes:
+        edges (list[tuple]): (face name, EdgeInfo, bb_left offset, rotation)
+            for the south, east, north and west edges
+        bounding_box (dict): map of exterior bounding box offsets
+        inner_bounding_box (dict): map of interior bounding box offsets
+
+    """
+
+    _cache = {}
+    CACHE_SIZE = 4096
+
+    @classmethod
+    def get(cls, side_info: SideInfo):
+        key = side_shape_key(side_info)
+        template = cls._cache.get(key)
+        if template is None:
+            if len(cls._cache) >= cls.CACHE_SIZE:
+                cls._cache.clear()
+            template = cls(side_info)
+            cls._cache[key] = template
+        return template
+
+    def __init__(self, side_info: SideInfo):
+        # For the vertical sides
+        ns_edge_info = EdgeInfo(side_info.is_tall, side_info.is_wide,
+                                side_info.ns_notch_width,
+                                side_info.ns_notch_height,
+                                side_info.ew_notch_height,
+                                side_info.ns_notch_count)
+        # For the horizontal sides
+        ew_edge_info = EdgeInfo(side_info.is_wide, side_info.is_tall,
+                                side_info.ew_notch_width,
+                                side_info.ew_notch_height,
+                                side_info.ns_notch_height,
+                                side_info.ew_notch_count)
+        self.edges = []
+        self.inner_bounding_box = {}
+        self.bounding_box = {'sw': (0.0, 0.0)}
+        bb_left = (0.0, 0.0)
+        for (face, edge_info, rotation, left, right) in (
+                ('south', ew_edge_info, 0, 'sw', 'se'),
+                ('east', ns_edge_info, 90, 'se', 'ne'),
+                ('north', ew_edge_info, 180, 'ne', 'nw'),
+                ('west', ns_edge_info, 270, 'nw', 'sw')):
+            (bb_right, inner_bb_left) = _edge_extent(edge_info)
+            self.edges.append((face, edge_info, bb_left, rotation))
+            self.inner_bounding_box[left] = _place(inner_bb_left, bb_left,
+                                                   rotation)
+            bb_left = _place(bb_right, bb_left, rotation)
+            if right != 'sw':
+                self.bounding_box[right] = bb_left
+
+
+class CutoutPattern(object):
+    """A rectangular grid of identical cutouts on a side.
+
+    The pattern is stored as a seed cutout plus two step vectors, so that
+    Fusion 360 can draw the seed once and repeat it with a pattern feature.
+    Step vectors are normalized to point along +x or +y (the seed is moved
+    to the first instance in that direction), matching the direction of the
+    construction axes used for the pattern feature.
+
+    Args:
+        kind (str): 'circle' or 'rect'
+        name (str): name of the pattern
+        corner_1 (Point): corner of the seed cutout
+        corner_2 (Point): opposite corner of the seed cutout
+        step_1 (Point): vector between neighbouring cutouts in direction one
+        count_1 (int): number of cutouts in direction one
+        step_2 (Point): vector between neighbouring cutouts in direction two
+        count_2 (int): number of cutouts in direction two
+
+    """
+
+    def __init__(self, kind, name, corner_1, corner_2, step_1, count_1,
+                 step_2, count_2):
+        self.kind = kind
+        self.name = name
+        self.count_1 = count_1
+        self.count_2 = count_2
+        shift_x = 0.0
+        shift_y = 0.0
+        for (step, count) in ((step_1, count_1), (step_2, count_2)):
+            if step.x < 0 or step.y < 0:
+                shift_x += (count - 1) * step.x
+                shift_y += (count - 1) * step.y
+        self.step_1 = Point(abs(step_1.x), abs(step_1.y))
+        self.step_2 = Point(abs(step_2.x), abs(step_2.y))
+        shift = Point(shift_x, shift_y)
+        self.corner_1 = corner_1.relative_to(shift)
+        self.corner_2 = corner_2.relative_to(shift)
+
+    def __len__(self):
+        return self.count_1 * self.count_2
+
+    def instance_name(self, index_1, index_2):
+        if self.count_2 == 1:
+            return "{}_{}".format(self.name, index_1)
+        return "{}_{}_{}".format(self.name, index_1, index_2)
+
+    def instances(self):
+        """Yields (kind, name, corner_1, corner_2) for each cutout."""
+        for index_2 in range(self.count_2):
+            for index_1 in range(self.count_1):
+                offset = Point(
+                    index_1 * self.step_1.x + index_2 * self.step_2.x,
+                    index_1 * self.step_1.y + index_2 * self.step_2.y)
+                yield (self.kind, self.instance_name(index_1, index_2),
+                       self.corner_1.relative_to(offset),
+                       self.corner_2.relative_to(offset))
+
+
 class Side(object):
 
     """Creates and contains edges for a side of a box.
 
+    Edges (and the bounding box maps, which are taken from them) are created
+    on first access, so a side that is never drawn or measured costs only
+    its SideInfo.
+
     Args:
         side_info (SideInfo): Contains init params.  See SideInfo documentation
 
@@ -172,6 +472,12 @@ class Side(object):
         bounding_box (dict): map of exterior bounding box points.
         inner_bounding_box (dict): map of interior bounding box points.
         cutouts (list): Features to cut out of this side.
+        cutout_patterns (list[CutoutPattern]): Grids of identical features to
+            cut out of this side.
+        cutout_table (CutoutTable): Features added in bulk by add_cutouts.
+        cutout_requests (list): (method name, arguments) of each add_cutout
+            and add_cutout_pattern call, so that they can be placed again on
+            a reshaped side (see Box.update)
         west_face (Side): west side of box
         north_face (Side): north side of box
         east_face (Side): east side of box
@@ -179,50 +485,88 @@ class Side(object):
 
     """
 
+    # Attributes set by create, which runs when one of them is first needed.
+    _LAZY_ATTRIBUTES = frozenset([
+        'west_face', 'north_face', 'east_face', 'south_face', 'bounding_box',
+        'inner_bounding_box'
+    ])
+
     def __init__(self, side_info: SideInfo):
         self.side_info = side_info
-        self.west_face = None
-        self.north_face = None
-        self.east_face = None
-        self.south_face = None
-        self.bounding_box = None
-        self.inner_bounding_box = None
-        self.create()
         self.cutouts = []
+        self.cutout_patterns = []
+        self.cutout_table = CutoutTable()
+        self.cutout_requests = []
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, i.e. before create has run.
+        if name in Side._LAZY_ATTRIBUTES:
+            self.create()
+            return self.__dict__[name]
+        raise AttributeError(name)
 
     def create(self):
-        # For the vertical sides
-        ns_edge_info = EdgeInfo(
-            self.side_info.is_tall, self.side_info.is_wide,
-            self.side_info.ns_notch_width, self.side_info.ns_notch_height,
-            self.side_info.ew_notch_height, self.side_info.ns_notch_count)
-        # For the horizontal sides
-        ew_edge_info = EdgeInfo(
-            self.side_info.is_wide, self.side_info.is_tall,
-            self.side_info.ew_notch_width, self.side_info.ew_notch_height,
-            self.side_info.ns_notch_height, self.side_info.ew_notch_count)
-        self.south_face = Edge(ew_edge_info, self.side_info.bb_sw_corner)
-        self.east_face = Edge(ns_edge_info, self.south_face.bb_right, 90)
-        self.north_face = Edge(ew_edge_info, self.east_face.bb_right, 180)
-        self.west_face = Edge(ns_edge_info, self.north_face.bb_right, 270)
+        """Creates edges by placing the shared template for this shape."""
+        template = SideTemplate.get(self.side_info)
+        sw = self.side_info.bb_sw_corner
+
+        def at(offset):
+            return Point(sw.x + offset[0], sw.y + offset[1])
+
+        for (face, edge_info, bb_left, rotation) in template.edges:
+            setattr(self, face + "_face",
+                    Edge(edge_info, at(bb_left), rotation))
 
         self.inner_bounding_box = {
-            'sw': self.south_face.inner_bb_left,
-            'se': self.east_face.inner_bb_left,
-            'ne': self.north_face.inner_bb_left,
-            'nw': self.west_face.inner_bb_left,
+            corner: at(offset)
+            for (corner, offset) in template.inner_bounding_box.items()
         }
-
         self.bounding_box = {
-            'sw': self.side_info.bb_sw_corner,
-            'se': self.south_face.bb_right,
-            'ne': self.east_face.bb_right,
-            'nw': self.north_face.bb_right
+            corner: (sw if corner == 'sw' else at(offset))
+            for (corner, offset) in template.bounding_box.items()
         }
 
+    def shape_key(self):
+        """Returns a hashable key shared by all sides of the same shape."""
+        return side_shape_key(self.side_info)
+
+    def instance_key(self, ndigits=6):
+        """Returns a key shared by sides that are identical up to position.
+
+        Sides match if they have the same shape and the same cutouts and
+        cutout patterns relative to their southwest corners.
+
+        Args:
+            ndigits (int, optional): decimal places kept when comparing
+                cutout coordinates
+
+        """
+        sw = self.side_info.bb_sw_corner
+
+        def rel(point):
+            return (round(point.x - sw.x, ndigits),
+                    round(point.y - sw.y, ndigits))
+
+        cutouts = sorted(
+            (kind, (round(x0 - sw.x, ndigits), round(y0 - sw.y, ndigits)),
+             (round(x1 - sw.x, ndigits), round(y1 - sw.y, ndigits)))
+            for (kind, _name, x0, y0, x1, y1) in self._iter_placed_coords())
+        patterns = sorted(
+            (pattern.kind, rel(pattern.corner_1), rel(pattern.corner_2),
+             pattern.step_1.coords(), pattern.count_1,
+             pattern.step_2.coords(), pattern.count_2)
+            for pattern in self.cutout_patterns)
+        return (self.shape_key(), tuple(cutouts), tuple(patterns))
+
+    def iter_lines(self, include_construction=True):
+        """Yields lines of all edges (south, east, north, west) in order."""
+        for edge in (self.south_face, self.east_face, self.north_face,
+                     self.west_face):
+            for line in edge.iter_lines(include_construction):
+                yield line
+
     def all_lines(self):
-        return (self.south_face.lines + self.east_face.lines +
-                self.north_face.lines + self.west_face.lines)
+        return list(self.iter_lines())
 
     def edge_line_list(self):
         return [
@@ -238,27 +582,212 @@ class Side(object):
                    name=None,
                    rotate=0,
                    flipxy=False):
-        import copy
-        c1 = copy.copy(corner_1)
-        c2 = copy.copy(corner_2)
+        c1 = self._place(corner_1, bb_inner, rotate, flipxy)
+        c2 = self._place(corner_2, bb_inner, rotate, flipxy)
+        self.cutouts.append((kind, name, c1, c2))
+        self.cutout_requests.append(
+            ("add_cutout", (kind, corner_1, corner_2, bb_inner, name, rotate,
+                            flipxy)))
+
+    def add_cutouts(self,
+                    kinds,
+                    coords,
+                    bb_inner='sw',
+                    names=None,
+                    rotate=0,
+                    flipxy=False):
+        """Adds many cutouts at once to cutout_table.
+
+        Equivalent to calling add_cutout for each cutout, but the corners are
+        placed in a single pass and stored in arrays rather than as Points.
+
+        Args:
+            kinds: 'circle' or 'rect', or a sequence with one per cutout
+            coords: flat sequence of x0, y0, x1, y1 per cutout (such as an
+                array('d'))
+            bb_inner: inner bounding box corner to measure from, or a
+                sequence with one per cutout
+            names: sequence of names, one per cutout (optional)
+            rotate (int, optional): degrees of counter clockwise rotation
+            flipxy (bool, optional): whether to swap x and y coordinates
+
+        """
+        # Copied, so that later changes by the caller cannot alter replays
+        # (after Box.update) or cache keys
+        (kinds, bb_inner, names) = [
+            value if value is None or isinstance(value, str) else
+            tuple(value) for value in (kinds, bb_inner, names)
+        ]
+        coords = array('d', coords)
+        place_cutouts(self.cutout_table, self.inner_bounding_box, kinds,
+                      coords, bb_inner, names, rotate, flipxy)
+        self.cutout_requests.append(
+            ("add_cutouts", (kinds, coords, bb_inner, names, rotate, flipxy)))
+
+    def add_cutout_pattern(self,
+                           kind,
+                           corner_1,
+                           corner_2,
+                           count_x,
+                           step_x,
+                           count_y=1,
+                           step_y=0,
+                           bb_inner='sw',
+                           name=None,
+                           rotate=0,
+                           flipxy=False):
+        """Adds a rectangular (or linear) grid of identical cutouts.
+
+        corner_1 and corner_2 describe the first cutout, exactly as for
+        add_cutout.  Copies are repeated count_x times step_x apart and
+        count_y times step_y apart, with steps measured in the same frame as
+        the corners (so positive steps go into the side).
+
+        Args:
+            kind (str): 'circle' or 'rect'
+            corner_1 (Point): corner of the first cutout
+            corner_2 (Point): opposite corner of the first cutout
+            count_x (int): number of cutouts along x
+            step_x (float): distance between cutouts along x
+            count_y (int, optional): number of cutouts along y
+            step_y (float, optional): distance between cutouts along y
+            bb_inner (str, optional): inner bounding box corner to measure
+                from
+            name (str, optional): name of the pattern (instances get index
+                suffixes)
+            rotate (int, optional): degrees of counter clockwise rotation
+            flipxy (bool, optional): whether to swap x and y coordinates
+
+        """
+        self.cutout_requests.append(
+            ("add_cutout_pattern", (kind, corner_1, corner_2, count_x, step_x,
+                                    count_y, step_y, bb_inner, name, rotate,
+                                    flipxy)))
+        origin = self._place(Point(0, 0), bb_inner, rotate, flipxy)
+        dir_1 = self._place(Point(step_x, 0), bb_inner, rotate, flipxy)
+        dir_2 = self._place(Point(0, step_y), bb_inner, rotate, flipxy)
+        self.cutout_patterns.append(
+            CutoutPattern(kind, name,
+                          self._place(corner_1, bb_inner, rotate, flipxy),
+                          self._place(corner_2, bb_inner, rotate, flipxy),
+                          Point(dir_1.x - origin.x, dir_1.y - origin.y),
+                          count_x,
+                          Point(dir_2.x - origin.x, dir_2.y - origin.y),
+                          count_y))
+
+    def has_cutout_requests(self):
+        """Returns whether every cutout and pattern has a recorded request."""
+        requested = sum(
+            len(args[1]) // 4 if method == "add_cutouts" else 1
+            for (method, args) in self.cutout_requests)
+        return requested == (len(self.cutouts) + len(self.cutout_patterns) +
+                             len(self.cutout_table))
+
+    def replay_cutouts(self, other: 'Side'):
+        """Places the cutouts requested on another side onto this one.
+
+        Raises:
+            ValueError: if the other side has cutouts that were not added
+                through add_cutout or add_cutout_pattern (such as cutouts
+                loaded from a cache), which cannot be placed again.
+        """
+        if not other.has_cutout_requests():
+            raise ValueError("Side has cutouts without recorded requests")
+        for (method, args) in other.cutout_requests:
+            getattr(self, method)(*args)
+
+    def shift_cutouts(self, other: 'Side'):
+        """Copies another side's placed cutouts, shifted by the difference
+        between the two sides' southwest corners."""
+        (old, new) = (other.side_info.bb_sw_corner, self.side_info.bb_sw_corner)
+        delta = Point(new.x - old.x, new.y - old.y)
+        self.cutouts = [(kind, name, corner_1.relative_to(delta),
+                         corner_2.relative_to(delta))
+                        for (kind, name, corner_1, corner_2) in other.cutouts]
+        self.cutout_patterns = [
+            CutoutPattern(pattern.kind, pattern.name,
+                          pattern.corner_1.relative_to(delta),
+                          pattern.corner_2.relative_to(delta), pattern.step_1,
+                          pattern.count_1, pattern.step_2, pattern.count_2)
+            for pattern in other.cutout_patterns
+        ]
+        self.cutout_table = other.cutout_table.shifted(delta.x, delta.y)
+        self.cutout_requests = list(other.cutout_requests)
+
+    def iter_cutouts(self):
+        """Yields all cutouts, expanding patterns one instance at a time."""
+        for cutout in self.cutouts:
+            yield cutout
+        for cutout in self.cutout_table:
+            yield cutout
+        for pattern in self.cutout_patterns:
+            for cutout in pattern.instances():
+                yield cutout
+
+    def _iter_placed_coords(self):
+        for (kind, name, corner_1, corner_2) in self.cutouts:
+            yield (kind, name, corner_1.x, corner_1.y, corner_2.x, corner_2.y)
+        for row in self.cutout_table.iter_coords():
+            yield row
+
+    def iter_cutout_coords(self):
+        """Yields (kind, name, x0, y0, x1, y1) for all cutouts, as
+        iter_cutouts, without creating Points for the cutout table."""
+        for row in self._iter_placed_coords():
+            yield row
+        for pattern in self.cutout_patterns:
+            for (kind, name, corner_1, corner_2) in pattern.instances():
+                yield (kind, name, corner_1.x, corner_1.y, corner_2.x,
+                       corner_2.y)
+
+    def _place(self, point, bb_inner, rotate, flipxy):
+        """Maps a point given relative to an inner bounding box corner onto
+        the side."""
+        x, y = point.coords()
         # Change signs so positive relative movements go into the side
         if 'n' in bb_inner:
-            c1.y = -corner_1.y
-            c2.y = -corner_2.y
+            y = -y
         if 'e' in bb_inner:
-            c1.x = -corner_1.x
-            c2.x = -corner_2.x
+            x = -x
 
         if flipxy:
-            c1 = Point(c1.y, c1.x)
-            c2 = Point(c2.y, c2.x)
+            x, y = y, x
 
         bb = self.inner_bounding_box[bb_inner]
-        c1 = c1.relative_to(bb)
-        c2 = c2.relative_to(bb)
-        c1.rotate(rotate, bb)
-        c2.rotate(rotate, bb)
-        self.cutouts.append((kind, name, c1, c2))
+        placed = Point(x, y).relative_to(bb)
+        placed.rotate(rotate, bb)
+        return placed
+
+
+def tab_count(length: float, thickness: float, multiple: int):
+    """Returns the odd number of tabs for a length, with segments at least
+    multiple times the thickness long (may be below 1 for short lengths).
+    """
+    segment_upper_bound = (length / thickness) // multiple
+    tab_upper_bound = (segment_upper_bound - 1) // 2
+    return (tab_upper_bound
+            if tab_upper_bound % 2 == 1 else tab_upper_bound - 1)
+
+
+BoxUpdate = NamedTuple('BoxUpdate', [("rebuilt", list), ("moved", list),
+                                     ("edges", dict)])
+BoxUpdate.__doc__ = """Sides and edges changed by Box.update.
+Args:
+    rebuilt: names of sides whose shape changed
+    moved: names of sides with an unchanged shape in a new position
+    edges: map of rebuilt side names to the faces ('south', 'east', 'north',
+        'west') whose edge shape changed
+
+"""
+
+
+def _edge_keys(side_info: SideInfo):
+    """Maps each face of a side to a hashable key of its edge's shape."""
+    return {
+        face: tuple(_dim_key(value) for value in edge_info)
+        for (face, edge_info, _bb_left, _rotation) in SideTemplate.get(
+            side_info).edges
+    }
 
 
 class Box(object):
@@ -292,8 +821,18 @@ class Box(object):
         spacing (float): Description
         tab_width (Optional[int]): Description
         bb_sw_point (Optional[Point]): Description
+        nested (Optional[bool]): if true, neighbouring sides are laid out with
+            their tabs interlocked, so that with zero spacing they share
+            boundaries and can be cut along common lines.  Spacing is then the
+            distance between a tab's tip and the bottom of the slot it sits
+            in (tab side walls stay shared).
+
+    Sides are created on first access; side_infos holds what is needed to
+    create them.  Parameters can be changed in place with update, which only
+    replaces the sides they affect.
 
     Attributes:
+        side_infos (dict): map of side names to SideInfo objects
         bottom_side (Side): bottom side object
         left_side (Side): left side object
         lower_side (Side): lower side object
@@ -311,7 +850,27 @@ class Box(object):
             thickness: float,
             spacing: float,
             tab_width: int=False,
-            bb_sw_point: Point=False):
+            bb_sw_point: Point=False,
+            nested: bool=False):
+        self._assign(width, height, depth, thickness, spacing, tab_width,
+                     bb_sw_point, nested)
+        self.create()
+
+    # Sides whose shape each parameter affects.  Any parameter can move
+    # sides, since the sides are laid out next to each other.
+    SHAPE_DEPENDENCIES = {
+        "width": ("bottom", "upper", "top", "lower"),
+        "height": ("right", "upper", "left", "lower"),
+        "depth": ("bottom", "right", "left", "top"),
+        "thickness": ("bottom", "right", "upper", "left", "top", "lower"),
+        "spacing": (),
+        "tab_width": (),
+        "bb_sw_point": (),
+        "nested": (),
+    }
+
+    def _assign(self, width, height, depth, thickness, spacing, tab_width,
+                bb_sw_point, nested):
         self.width = Dim(float(width), "W")
         self.height = Dim(float(height), "H")
         self.depth = Dim(float(depth), "D")
@@ -319,71 +878,175 @@ class Box(object):
         self.spacing = Dim(spacing, "SPACING")
         self.tab_width = tab_width
         self.bb_sw_point = bb_sw_point if bb_sw_point else Point(0, 0)
+        self.nested = nested
+
+    def params(self):
+        """Returns the Box arguments of this box as a dict."""
+        return {
+            "width": self.width.dist,
+            "height": self.height.dist,
+            "depth": self.depth.dist,
+            "thickness": self.thickness.dist,
+            "spacing": self.spacing.dist,
+            "tab_width": self.tab_width,
+            "bb_sw_point": self.bb_sw_point,
+            "nested": self.nested,
+        }
+
+    def update(self, **params) -> BoxUpdate:
+        """Changes box parameters in place.
+
+        Only sides whose shape may depend on a changed parameter (see
+        SHAPE_DEPENDENCIES) are compared for a change of shape; the others can
+        at most move.  Changed sides are replaced by new Side objects, with
+        their cutouts placed again from the original requests (moved sides
+        whose cutouts were loaded from a cache have them shifted instead),
+        while unchanged sides (and any lines already created) are kept.
+        Edge shapes that did not change are placed from cached templates
+        rather than drawn again.
+
+        Args:
+            params: new values of Box arguments (width, height, depth,
+                thickness, spacing, tab_width, bb_sw_point or nested)
+
+        Returns:
+            BoxUpdate of the sides and edges that changed
+
+        Raises:
+            ValueError: for unknown parameters, or if a side whose shape
+                changed has cutouts that cannot be placed again (see
+                Side.replay_cutouts).
+        """
+        unknown = sorted(set(params) - set(Box.SHAPE_DEPENDENCIES))
+        if unknown:
+            raise ValueError("Unknown box parameters: {}".format(
+                ", ".join(unknown)))
+        reshaped = set()
+        for name in params:
+            reshaped.update(Box.SHAPE_DEPENDENCIES[name])
+        old_params = self.params()
+        old_infos = self.side_infos
+        self._assign(**dict(old_params, **params))
         self.create()
 
+        rebuilt = []
+        moved = []
+        edges = {}
+        for (name, info) in self.side_infos.items():
+            old_info = old_infos[name]
+            if (name in reshaped and
+                    side_shape_key(info) != side_shape_key(old_info)):
+                rebuilt.append(name)
+                (old_keys, new_keys) = (_edge_keys(old_info), _edge_keys(info))
+                edges[name] = tuple(face for face in new_keys
+                                    if new_keys[face] != old_keys[face])
+            elif info.bb_sw_corner.coords() != old_info.bb_sw_corner.coords():
+                moved.append(name)
+            else:
+                # Keep the existing side and its info
+                self.side_infos[name] = old_info
+
+        # Check before replacing anything, so a failed update changes nothing
+        for name in rebuilt:
+            old_side = self.__dict__.get(name + "_side")
+            if old_side is not None and not old_side.has_cutout_requests():
+                self._assign(**old_params)
+                self.side_infos = old_infos
+                raise ValueError(
+                    "Cannot reshape {} side: its cutouts were not added "
+                    "through add_cutout".format(name))
+        for name in rebuilt + moved:
+            old_side = self.__dict__.get(name + "_side")
+            # Sides not yet created have no cutouts and stay lazy
+            if old_side is not None:
+                side = Side(self.side_infos[name])
+                if old_side.has_cutout_requests():
+                    side.replay_cutouts(old_side)
+                else:
+                    side.shift_cutouts(old_side)
+                setattr(self, name + "_side", side)
+        return BoxUpdate(rebuilt, moved, edges)
+
     def create(self):
-        """Creates sides of the box.
+        """Lays out the sides of the box.
 
-        Uses the inputs to create sides of a box with appropiate tabs and
-        shapes.
+        Uses the inputs to determine the tabs, shapes and positions of the
+        sides of a box.  Positions come from each side's outer extent, so no
+        side is created here: each is created on first access.
         """
 
         (tab_num_w, tab_width_w) = self.calc_tab_num_and_length(self.width)
         (tab_num_h, tab_width_h) = self.calc_tab_num_and_length(self.height)
         (tab_num_d, tab_width_d) = self.calc_tab_num_and_length(self.depth)
+        # Nested sides overlap their neighbours' bounding boxes by the depth
+        # of a tab, which is the box thickness.
+        gap = self.spacing + -self.thickness if self.nested else self.spacing
+        spacing = gap.dist
 
         # Draw the bottom side w x d.  We assume it is short and narrow so the
         # lid is easier to place (bottom will be identical to the lid)
         bottom_info = SideInfo(self.bb_sw_point, False, False, tab_width_w,
                                self.thickness, tab_num_w, tab_width_d,
                                self.thickness, tab_num_d)
-        self.bottom_side = Side(bottom_info)
+        (bottom_w, bottom_h) = side_extent(bottom_info)
 
         # Draw right side h x d
-        spacing_line = self.bottom_side.bounding_box['se'].draw_horiz(
-            self.spacing, True)
+        right_sw = Point(self.bb_sw_point.x + bottom_w + spacing,
+                         self.bb_sw_point.y)
         # Since this is horizontal to a narrow side it must be wide.
         # We also make it tall (this is optional but has to oppose upper/lower)
-        right_info = SideInfo(spacing_line.dest, True, True, tab_width_h,
+        right_info = SideInfo(right_sw, True, True, tab_width_h,
                               self.thickness, tab_num_h, tab_width_d,
                               self.thickness, tab_num_d)
-        self.right_side = Side(right_info)
 
         # Draw upper side w x h
-        spacing_line = self.bottom_side.bounding_box['nw'].draw_vert(
-            self.spacing, True)
+        upper_sw = Point(self.bb_sw_point.x,
+                         self.bb_sw_point.y + bottom_h + spacing)
         # Since it fits vertically against a short side it must be tall
-        upper_info = SideInfo(spacing_line.dest, False, True, tab_width_w,
+        upper_info = SideInfo(upper_sw, False, True, tab_width_w,
                               self.thickness, tab_num_w, tab_width_h,
                               self.thickness, tab_num_h)
-        self.upper_side = Side(upper_info)
 
         # Draw left side h x d
-        spacing_line = self.bottom_side.bounding_box['sw'].draw_horiz(
-            -(self.spacing + self.height + 2 * self.thickness), True)
+        spacing_line = self.bb_sw_point.draw_horiz(
+            -(gap + self.height + 2 * self.thickness), True)
         left_info = SideInfo(spacing_line.dest, True, True, tab_width_h,
                              self.thickness, tab_num_h, tab_width_d,
                              self.thickness, tab_num_d)
-        self.left_side = Side(left_info)
 
         # Draw top side w x d
-        spacing_line = self.right_side.bounding_box['se'].draw_horiz(
-            self.spacing, True)
+        top_sw = Point(right_sw.x + side_extent(right_info)[0] + spacing,
+                       right_sw.y)
         # Since this is horizontal to a wide side it must be narrow
-        top_info = SideInfo(spacing_line.dest, False, False, tab_width_w,
+        top_info = SideInfo(top_sw, False, False, tab_width_w,
                             self.thickness, tab_num_w, tab_width_d,
                             self.thickness, tab_num_d)
-        self.top_side = Side(top_info)
 
         # Draw lower side w x h
-        spacing_line = self.bottom_side.bounding_box['sw'].draw_vert(
-            -(self.spacing + self.height + 2 * self.thickness), True)
+        spacing_line = self.bb_sw_point.draw_vert(
+            -(gap + self.height + 2 * self.thickness), True)
         # Since it fits vertically against a short side it must be tall
         lower_info = SideInfo(spacing_line.dest, False, True, tab_width_w,
                               self.thickness, tab_num_w, tab_width_h,
                               self.thickness, tab_num_h)
-        self.lower_side = Side(lower_info)
-        # import ipdb; ipdb.set_trace()
+
+        self.side_infos = {
+            "bottom": bottom_info,
+            "right": right_info,
+            "upper": upper_info,
+            "left": left_info,
+            "top": top_info,
+            "lower": lower_info
+        }
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, i.e. before a side is built.
+        if name.endswith("_side") and name[:-5] in self.__dict__.get(
+                'side_infos', {}):
+            side = Side(self.side_infos[name[:-5]])
+            setattr(self, name, side)
+            return side
+        raise AttributeError(name)
 
     def calc_tab_num_and_length(self, dim: Dim):
         """Determines number and length of tab segments for a given length.
@@ -394,23 +1057,22 @@ class Box(object):
         Returns:
             number of tabs (int), length of segments (Dim)
         """
-        segment_upper_bound_2 = (dim.dist / self.thickness.dist) // 2
-        tab_upper_bound_2 = (segment_upper_bound_2 - 1) // 2
-        num_tabs_2 = (tab_upper_bound_2 if tab_upper_bound_2 % 2 == 1 else
-                      tab_upper_bound_2 - 1)
+        num_tabs_2 = tab_count(dim.dist, self.thickness.dist, 2)
         # But we prefer at least 3 tabs with 3x thickness
-        segment_upper_bound_3 = (dim.dist / self.thickness.dist) // 3
-        tab_upper_bound_3 = (segment_upper_bound_3 - 1) // 2
-        num_tabs_3 = (tab_upper_bound_3 if tab_upper_bound_3 % 2 == 1 else
-                      tab_upper_bound_3 - 1)
+        num_tabs_3 = tab_count(dim.dist, self.thickness.dist, 3)
         num_tabs = num_tabs_3 if num_tabs_3 >= 3 else num_tabs_2
         return int(num_tabs), dim / (2 * num_tabs + 1)
 
+    def iter_lines(self, include_construction=True):
+        """Yields lines from all sides, creating each side as it is reached.
+        """
+        for side in self.sides().values():
+            for line in side.iter_lines(include_construction):
+                yield line
+
     def all_lines(self):
         """Returns lines from all sides in a single list."""
-        return self.bottom_side.all_lines() + self.right_side.all_lines(
-        ) + self.upper_side.all_lines() + self.left_side.all_lines(
-        ) + self.top_side.all_lines() + self.lower_side.all_lines()
+        return list(self.iter_lines())
 
     def sides(self):
         """Returns dict of box's sides."""
@@ -1,47 +1,23 @@
 #!/usr/bin/python3
-"""Tests Box class by plotting a sample box's sides.
+"""Tests Box class by rendering a sample box's sides to a PNG preview.
 """
-from box import Box
-from box import Point
+import sys
 
-def plot_box(box: Box):
-    """Uses matplotlib to plot a box."""
-    import matplotlib.pyplot as plt
+from geometry_util.box import Box
+from geometry_util.box import Point
+from geometry_util.raster import save_box_png
 
-    plt.figure()
 
-    xlist = []
-    ylist = []
-    plt.ylabel("vertical")
-    plt.xlabel("horiztonal")
-    plt.title('Edge')
-    plt.xlim(-100, 280)
-    plt.ylim(-100, 150)
-    for side in box.sides().values():
-        xlist = []
-        ylist = []
-        for edge_lines in side.edge_line_list():
-            for line in edge_lines:
-                if not line.is_construction:
-                    x_coords, y_coords = line.coords_for_plot()
-                    xlist.extend(x_coords)
-                    ylist.extend(y_coords)
-        plt.plot(xlist, ylist)
-
-    for side in box.sides().values():
-        for (kind, _name, corner_1, corner_2) in side.cutouts:
-            if kind == "circle":
-                # Just draw a diagonal line for now
-                plt.plot([corner_1.y, corner_2.y],
-                         [corner_1.x, corner_2.x], '--')
-
-    plt.show()
+def plot_box(box: Box, path="box_test.png"):
+    """Renders a box (lines and cutouts) to a PNG file."""
+    save_box_png(box, path)
+    return path
 
 
 def main():
     """Test case to validate box coordinate creation"""
     box = Box(100, 50, 65, 3, 2, bb_sw_point=Point(0, 0))
-    plot_box(box)
+    print("Wrote {}".format(plot_box(box, *sys.argv[1:2])))
 
 if __name__ == "__main__":
     main()
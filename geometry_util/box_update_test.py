@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Tests in-place Box parameter updates.
+"""
+import pytest
+
+from geometry_util.box import Box, Point
+
+
+def add_cutouts(box):
+    box.upper_side.add_cutout('rect', Point(5, 5), Point(20, 15))
+    box.bottom_side.add_cutout('circle', Point(10, 10), Point(16, 16),
+                               bb_inner='ne')
+    box.right_side.add_cutout_pattern('rect', Point(4, 4), Point(6, 8), 3,
+                                      5.0, name='vent')
+    return box
+
+
+def geometry(box):
+    return {
+        name: ([line.source.coords() + line.dest.coords()
+                for line in side.iter_lines()],
+               [(kind, name, c1.coords(), c2.coords())
+                for (kind, name, c1, c2) in side.iter_cutouts()])
+        for (name, side) in box.sides().items()
+    }
+
+
+def test_update_matches_new_box():
+    box = add_cutouts(Box(100, 50, 65, 3, 2))
+    box.all_lines()
+    update = box.update(width=130)
+    assert sorted(update.rebuilt) == ["bottom", "lower", "top", "upper"]
+    assert update.moved == ["right"]
+    # Only the edges along the width change shape
+    assert update.edges["bottom"] == ("south", "north")
+    fresh = add_cutouts(Box(130, 50, 65, 3, 2))
+    assert geometry(box) == geometry(fresh)
+
+
+def test_update_keeps_unaffected_sides():
+    box = add_cutouts(Box(100, 50, 65, 3, 2))
+    (upper, lower) = (box.upper_side, box.lower_side)
+    update = box.update(depth=80)
+    assert "upper" not in update.rebuilt and "lower" not in update.rebuilt
+    assert box.lower_side is lower
+    # The upper side moves up past the deeper bottom side
+    assert update.moved == ["upper"] and box.upper_side is not upper
+    assert geometry(box) == geometry(add_cutouts(Box(100, 50, 80, 3, 2)))
+
+    bottom = box.bottom_side
+    assert box.update(spacing=2) == ([], [], {})
+    assert box.bottom_side is bottom
+
+
+def test_update_rejects_unknown_parameters():
+    box = Box(100, 50, 65, 3, 2)
+    with pytest.raises(ValueError):
+        box.update(colour="red")
+    assert box.width.dist == 100
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""Common-line cutting: cut boundaries shared by neighbouring sides once.
+
+When sides are butted together (see the nested option of Box), a laser
+would trace each shared boundary twice, once per side.  The segments of all
+sides are hashed by the line they lie on, and overlapping collinear pieces
+are merged so that every piece of every boundary is emitted exactly once.
+dxf.box_dxf and BoxPlotter.sketch_cut_sheet use merge_box when asked to
+(merge_common), to write a whole box as one cut sheet.
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+from typing import NamedTuple
+
+from .geometry import Line, Point
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913
+
+CommonLineResult = NamedTuple('CommonLineResult',
+                              [("lines", list), ("cut_length", float),
+                               ("merged_length", float),
+                               ("entity_count", int),
+                               ("merged_count", int)])
+CommonLineResult.__doc__ = """Lines to cut after merging, with savings.
+Args:
+    lines: merged lines, each shared piece appearing once
+    cut_length: total length of the input lines
+    merged_length: total length of the merged lines
+    entity_count: number of input lines
+    merged_count: number of merged lines
+
+"""
+
+
+def saved_length(result: CommonLineResult) -> float:
+    return result.cut_length - result.merged_length
+
+
+def saved_count(result: CommonLineResult) -> int:
+    return result.entity_count - result.merged_count
+
+
+def merge_common_lines(lines, tolerance=1e-6):
+    """Merges collinear lines that overlap into single lines.
+
+    Lines that only touch end to end are kept separate, so savings reflect
+    shared boundaries only.
+
+    Args:
+        lines: iterable of horizontal or vertical geometric lines
+        tolerance (float, optional): coordinate snapping distance
+
+    Returns:
+        CommonLineResult
+
+    """
+    # Spatial hash: (is_horizontal, snapped fixed coordinate) -> intervals
+    buckets = {}
+    cut_length = 0.0
+    entity_count = 0
+    for line in lines:
+        (sx, sy), (dx, dy) = line.source.coords(), line.dest.coords()
+        entity_count += 1
+        if abs(sy - dy) <= tolerance:
+            key = (True, int(round(sy / tolerance)))
+            interval = (min(sx, dx), max(sx, dx), sy)
+        elif abs(sx - dx) <= tolerance:
+            key = (False, int(round(sx / tolerance)))
+            interval = (min(sy, dy), max(sy, dy), sx)
+        else:
+            raise ValueError(
+                "Only horizontal and vertical lines are supported: "
+                "{}".format(line))
+        cut_length += interval[1] - interval[0]
+        buckets.setdefault(key, []).append(interval)
+
+    merged = []
+    merged_length = 0.0
+    for ((is_horizontal, _fixed), intervals) in buckets.items():
+        intervals.sort()
+        runs = []
+        for (lo, hi, fixed) in intervals:
+            if runs and lo < runs[-1][1] - tolerance:
+                runs[-1][1] = max(runs[-1][1], hi)
+            else:
+                runs.append([lo, hi, fixed])
+        for (lo, hi, fixed) in runs:
+            merged_length += hi - lo
+            if is_horizontal:
+                merged.append(Line(Point(lo, fixed), Point(hi, fixed)))
+            else:
+                merged.append(Line(Point(fixed, lo), Point(fixed, hi)))
+
+    return CommonLineResult(merged, cut_length, merged_length, entity_count,
+                            len(merged))
+
+
+def merge_box(box, tolerance=1e-6):
+    """Merges shared boundaries across all real lines of a box.
+
+    Args:
+        box (Box): box whose sides are merged (typically nested, with zero
+            spacing)
+        tolerance (float, optional): coordinate snapping distance
+
+    Returns:
+        CommonLineResult
+
+    """
+    return merge_common_lines(box.iter_lines(include_construction=False),
+                              tolerance)
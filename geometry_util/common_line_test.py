@@ -0,0 +1,23 @@
+#!/usr/bin/python3
+"""Tests common-line merging on spaced and nested box layouts.
+"""
+from geometry_util.box import Box
+from geometry_util.common_line import merge_box, saved_count, saved_length
+from geometry_util.intersect import find_intersections
+from geometry_util.joints import verify_box
+
+
+def test_spaced_sides_share_nothing():
+    result = merge_box(Box(100, 50, 65, 3, 2))
+    assert saved_count(result) == 0
+    assert abs(saved_length(result)) < 1e-6
+
+
+def test_nested_sides_share_boundaries():
+    box = Box(100, 50, 65, 3, 0, nested=True)
+    assert verify_box(box) == []
+    result = merge_box(box)
+    assert saved_count(result) > 0
+    assert saved_length(result) > 0
+    # Each shared piece is emitted once, and nothing crosses
+    assert find_intersections(result.lines) == []
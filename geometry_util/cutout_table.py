@@ -0,0 +1,185 @@
+#!/usr/bin/python3
+"""Array-backed storage for many cutouts of a side.
+
+Side.add_cutout places one cutout per call and stores it as a tuple of two
+Points.  A CutoutTable instead keeps a whole batch in flat arrays: a kind
+code per cutout, four doubles per cutout (the placed corners), and a list
+of names.  place_cutouts fills a table from arrays of corner coordinates in
+a single pass, applying the same anchor sign flips, x/y swap, offset and
+rotation as Side.add_cutout (with the same floating point operations, so
+the results are identical).
+
+Consumers that only need numbers (exporters, previews, estimates) iterate
+CutoutTable.iter_coords, which creates no Point objects.  Iterating the
+table itself yields (kind, name, corner_1, corner_2) tuples like
+Side.cutouts.
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+from array import array
+
+from .geometry import Point
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913,R0914
+
+CUTOUT_KINDS = ('rect', 'circle')
+_KIND_CODES = {kind: code for (code, kind) in enumerate(CUTOUT_KINDS)}
+
+# cos and sin of the supported rotations, as in Point.rotate
+_ROTATIONS = {0: (1, 0), 90: (0, 1), 180: (-1, 0), 270: (0, -1)}
+
+
+class CutoutTable(object):
+    """Placed cutouts stored in flat arrays.
+
+    Attributes:
+        kinds (array): index into CUTOUT_KINDS of each cutout
+        coords (array): x0, y0, x1, y1 of each cutout's corners
+        names (list): name of each cutout (may be None)
+
+    """
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.coords = array('d')
+        self.names = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        for (kind, name, x0, y0, x1, y1) in self.iter_coords():
+            yield (kind, name, Point(x0, y0), Point(x1, y1))
+
+    def iter_coords(self):
+        """Yields (kind, name, x0, y0, x1, y1) for each cutout."""
+        coords = self.coords.tolist()
+        for (index, code) in enumerate(self.kinds):
+            start = 4 * index
+            yield ((CUTOUT_KINDS[code], self.names[index]) +
+                   tuple(coords[start:start + 4]))
+
+    def append(self, kind, name, x0, y0, x1, y1):
+        """Adds one placed cutout."""
+        self.kinds.append(_kind_code(kind))
+        self.coords.extend((x0, y0, x1, y1))
+        self.names.append(name)
+
+    def shifted(self, dx, dy):
+        """Returns a copy of this table moved by (dx, dy)."""
+        table = CutoutTable()
+        table.kinds = array('B', self.kinds)
+        table.coords = array('d', [
+            value + (dy if index % 2 else dx)
+            for (index, value) in enumerate(self.coords)
+        ])
+        table.names = list(self.names)
+        return table
+
+
+def _kind_code(kind):
+    try:
+        return _KIND_CODES[kind]
+    except KeyError:
+        raise ValueError("Unknown cutout kind: {}".format(kind))
+
+
+def _per_cutout(value, count, what):
+    """Returns a list of count values from a single value or a sequence."""
+    if value is None or isinstance(value, str):
+        return [value] * count
+    values = list(value)
+    if len(values) != count:
+        raise ValueError("Expected {} {}, got {}".format(
+            count, what, len(values)))
+    return values
+
+
+def place_cutouts(table,
+                  inner_bounding_box,
+                  kinds,
+                  coords,
+                  bb_inner='sw',
+                  names=None,
+                  rotate=0,
+                  flipxy=False):
+    """Places a batch of cutouts and adds them to a table.
+
+    Each cutout is placed exactly as Side.add_cutout would place it.
+
+    Args:
+        table (CutoutTable): table to add to
+        inner_bounding_box (dict): map of a side's interior bounding box
+            points
+        kinds: 'circle' or 'rect', or a sequence with one per cutout
+        coords: flat sequence of x0, y0, x1, y1 per cutout (such as an
+            array('d')), relative to the anchors
+        bb_inner: inner bounding box corner to measure from, or a sequence
+            with one per cutout
+        names: sequence of names, one per cutout (optional)
+        rotate (int, optional): degrees of counter clockwise rotation, a
+            multiple of 90
+        flipxy (bool, optional): whether to swap x and y coordinates
+
+    Raises:
+        ValueError: if the arguments have mismatched lengths, or for an
+            unknown kind or rotation.
+
+    """
+    if len(coords) % 4:
+        raise ValueError("Expected 4 coordinates per cutout, got {}".format(
+            len(coords)))
+    count = len(coords) // 4
+    codes = [_kind_code(kind) for kind in _per_cutout(kinds, count, "kinds")]
+    anchors = _per_cutout(bb_inner, count, "anchors")
+    names = _per_cutout(names, count, "names")
+    if rotate % 90:
+        raise ValueError("Rotation must be a multiple of 90: {}".format(rotate))
+    (cos, sin) = _ROTATIONS[rotate % 360]
+
+    # Signs and origin of each anchor, as in Side._place
+    frames = {}
+    for anchor in set(anchors):
+        bb = inner_bounding_box[anchor]
+        frames[anchor] = (-1 if 'e' in anchor else 1,
+                          -1 if 'n' in anchor else 1, bb.x, bb.y)
+
+    values = coords.tolist() if isinstance(coords, array) else list(coords)
+    placed = []
+    for (index, anchor) in enumerate(anchors):
+        (sign_x, sign_y, ox, oy) = frames[anchor]
+        for start in (4 * index, 4 * index + 2):
+            x = values[start] if sign_x > 0 else -values[start]
+            y = values[start + 1] if sign_y > 0 else -values[start + 1]
+            if flipxy:
+                (x, y) = (y, x)
+            (px, py) = (x + ox, y + oy)
+            placed.append(ox + cos * (px - ox) - sin * (py - oy))
+            placed.append(oy + sin * (px - ox) + cos * (py - oy))
+
+    table.kinds.extend(codes)
+    table.coords.extend(placed)
+    table.names.extend(names)
+
+
+def cutout_coords(cutouts):
+    """Yields (kind, name, x0, y0, x1, y1) for cutouts of any form.
+
+    Args:
+        cutouts: a CutoutTable, or an iterable of (kind, name, corner_1,
+            corner_2) tuples or of (kind, name, x0, y0, x1, y1) tuples
+
+    """
+    if isinstance(cutouts, CutoutTable):
+        for row in cutouts.iter_coords():
+            yield row
+        return
+    for cutout in cutouts:
+        if len(cutout) == 6:
+            yield cutout
+        else:
+            (kind, name, corner_1, corner_2) = cutout
+            yield (kind, name, corner_1.x, corner_1.y, corner_2.x,
+                   corner_2.y)
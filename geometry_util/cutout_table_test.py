@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Tests bulk cutout placement against Side.add_cutout.
+"""
+from array import array
+
+import pytest
+
+from geometry_util.box import Box, Point
+from geometry_util.cutout_table import CutoutTable, cutout_coords
+from geometry_util.disk_cache import GeometryCache
+from geometry_util.fingerprint import fingerprint_box
+
+ANCHORS = ['sw', 'se', 'nw', 'ne']
+
+
+def holes(count):
+    coords = array('d')
+    for index in range(count):
+        (x, y) = (3.1 + 7.3 * (index % 9), 4.7 + 5.9 * (index // 9))
+        coords.extend((x, y, x + 2.5, y + 1.5))
+    return coords
+
+
+@pytest.mark.parametrize("rotate,flipxy", [(0, False), (90, True),
+                                           (180, False), (270, True)])
+def test_bulk_matches_individual(rotate, flipxy):
+    coords = holes(40)
+    kinds = ['rect' if index % 3 else 'circle' for index in range(40)]
+    anchors = [ANCHORS[index % 4] for index in range(40)]
+    names = ["hole_{}".format(index) for index in range(40)]
+
+    single = Box(120, 100, 220, 4.7625, 2).upper_side
+    for index in range(40):
+        single.add_cutout(kinds[index], Point(*coords[4 * index:4 * index + 2]),
+                          Point(*coords[4 * index + 2:4 * index + 4]),
+                          anchors[index], names[index], rotate, flipxy)
+    bulk = Box(120, 100, 220, 4.7625, 2).upper_side
+    bulk.add_cutouts(kinds, coords, anchors, names, rotate, flipxy)
+
+    assert not bulk.cutouts and len(bulk.cutout_table) == 40
+    assert list(bulk.cutout_table.iter_coords()) == list(
+        cutout_coords(single.cutouts))
+    assert bulk.instance_key() == single.instance_key()
+
+
+def test_table_flows_through_consumers(tmp_path):
+    box = Box(100, 50, 65, 3, 2)
+    box.top_side.add_cutouts('circle', holes(18))
+    reference = Box(100, 50, 65, 3, 2)
+    for (_kind, _name, x0, y0, x1, y1) in cutout_coords(
+            box.top_side.cutout_table):
+        reference.top_side.cutouts.append(('circle', None, Point(x0, y0),
+                                           Point(x1, y1)))
+    assert fingerprint_box(box) == fingerprint_box(reference)
+
+    cache = GeometryCache(str(tmp_path))
+    cache.get(box)
+    loaded = cache.get(box)
+    assert cache.hits == 1
+    assert isinstance(loaded.top_side.cutout_table, CutoutTable)
+    assert fingerprint_box(loaded) == fingerprint_box(box)
+
+    # Bulk requests are replayed when the side is reshaped
+    update = box.update(width=110)
+    assert "top" in update.rebuilt and len(box.top_side.cutout_table) == 18
+
+
+def test_bulk_rejects_bad_input():
+    side = Box(100, 50, 65, 3, 2).upper_side
+    with pytest.raises(ValueError):
+        side.add_cutouts('rect', [1, 2, 3])
+    with pytest.raises(ValueError):
+        side.add_cutouts(['rect'], holes(2))
+    with pytest.raises(ValueError):
+        side.add_cutouts('hexagon', holes(1))
+    assert not side.cutout_requests and not len(side.cutout_table)
+
+
+def test_bulk_requests_keep_their_own_copy():
+    box = Box(100, 50, 65, 3, 2)
+    coords = holes(3)
+    names = ["a", "b", "c"]
+    box.upper_side.add_cutouts('rect', coords, names=names)
+    before = fingerprint_box(box)
+    coords[0] = 50.0
+    names[0] = "z"
+    box.update(width=100)
+    box.update(width=110)
+    box.update(width=100)
+    assert fingerprint_box(box) == before
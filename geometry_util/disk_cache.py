@@ -0,0 +1,455 @@
+#!/usr/bin/python3
+"""Persistent on-disk cache of generated box geometry, shared by processes.
+
+Scripts, previews and sweeps in separate processes tend to rebuild the same
+boxes.  A box's lines are stored once in a cache directory, in a file named
+by a hash of everything the lines depend on: the Box arguments, the placed
+cutouts and cutout patterns of every side, and the source code of the
+modules generating the lines (GEOMETRY_SOURCES), so editing them never
+returns stale geometry.  Building a Box and adding cutouts only lays out
+sides (no edge is drawn), so looking a box up costs no line geometry.
+
+Each file is a small JSON header followed by the line coordinates as raw
+doubles.  Files are memory-mapped on load, and lines are read straight from
+the mapping as they are iterated.
+
+Files are written to a temporary name and moved into place, so readers only
+ever see complete files, and processes storing the same box at once simply
+replace each other's identical file.  Once the directory grows past its
+size cap, the least recently used files are removed.
+
+Run this module to warm the cache from a specification file, or to show or
+clear the cache.
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+from .box import Box, CutoutPattern, Side, SideInfo
+from .geometry import Dim, Line, Point
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913,R0902
+
+# Bump whenever the file layout changes.
+FORMAT_VERSION = 3
+# Modules (in this package) whose source is hashed into every key
+GEOMETRY_SOURCES = ("box.py", "geometry.py", "cutout_table.py")
+
+CACHE_ENV = "CAD_MODELING_CACHE"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+SUFFIX = ".geo"
+
+_MAGIC = b"CADGEO01"
+_PREFIX = struct.Struct("<8sQ")
+# Doubles per line: source x, source y, dest x, dest y, is_construction
+_STRIDE = 5
+# Temporary files older than this are left over from crashed writers.
+_STALE_SECONDS = 3600
+
+_geometry_version = None
+
+
+def geometry_version():
+    """Returns a hex digest of the source of GEOMETRY_SOURCES."""
+    global _geometry_version  # pylint: disable=global-statement
+    if _geometry_version is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in GEOMETRY_SOURCES:
+            with open(os.path.join(directory, name), "rb") as source:
+                digest.update(name.encode() + b"\0" + source.read())
+        _geometry_version = digest.hexdigest()
+    return _geometry_version
+
+
+def default_directory():
+    """Returns the cache directory: $CAD_MODELING_CACHE, or one under ~."""
+    return os.environ.get(CACHE_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "cad_modeling", "geometry")
+
+
+def _encode(value):
+    if isinstance(value, Dim):
+        return {"dim": [value.dist, value.dist_label]}
+    if isinstance(value, Point):
+        return {"point": [value.x, value.y]}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict) and "point" in value:
+        return Point(*value["point"])
+    if isinstance(value, dict) and "dim" in value:
+        return Dim(*value["dim"])
+    return value
+
+
+def box_params(box):
+    """Returns the Box arguments of a box as plain values."""
+    return dict(box.params(), bb_sw_point=_encode(box.bb_sw_point))
+
+
+def _side_cutouts(side):
+    cutouts = [[kind, name, _encode(corner_1), _encode(corner_2)]
+               for (kind, name, corner_1, corner_2) in side.cutouts]
+    table = side.cutout_table
+    table = [table.kinds.tolist(), table.names, table.coords.tolist()]
+    patterns = [[
+        pattern.kind, pattern.name,
+        _encode(pattern.corner_1),
+        _encode(pattern.corner_2),
+        _encode(pattern.step_1), pattern.count_1,
+        _encode(pattern.step_2), pattern.count_2
+    ] for pattern in side.cutout_patterns]
+    return (cutouts, patterns, table)
+
+
+def box_key(box):
+    """Returns the cache key (a hex digest) of a box and its cutouts."""
+    record = {
+        "version": FORMAT_VERSION,
+        "geometry": geometry_version(),
+        "params": box_params(box),
+        "cutouts": {
+            side_name: _side_cutouts(side)
+            for (side_name, side) in box.sides().items()
+        },
+    }
+    text = json.dumps(record, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class CachedSide(Side):
+    """A side whose lines are read from a cache file.
+
+    Bounding boxes, cutouts and cutout patterns are restored from the file,
+    so nothing is computed until an edge itself is asked for (for instance
+    by joint checks), in which case it is built as for any side.
+
+    Args:
+        side_info (SideInfo): side's inputs, as for Side
+        coords (memoryview): line coordinates, five doubles per line
+        bounding_box (dict): map of exterior bounding box points
+        inner_bounding_box (dict): map of interior bounding box points
+
+    Attributes:
+        coords (memoryview): line coordinates (see Args)
+
+    """
+
+    def __init__(self, side_info: SideInfo, coords, bounding_box,
+                 inner_bounding_box):
+        super().__init__(side_info)
+        self.coords = coords
+        self.bounding_box = bounding_box
+        self.inner_bounding_box = inner_bounding_box
+
+    def iter_lines(self, include_construction=True):
+        """Yields lines (south, east, north, west) from the cached coords."""
+        coords = self.coords
+        for start in range(0, len(coords), _STRIDE):
+            is_construction = coords[start + 4]
+            if include_construction or not is_construction:
+                yield Line(
+                    Point(coords[start], coords[start + 1]),
+                    Point(coords[start + 2], coords[start + 3]),
+                    bool(is_construction))
+
+
+class CachedBox(Box):
+    """A box whose sides are CachedSides.
+
+    Args:
+        params (dict): Box arguments (see box_params)
+        sides (dict): map of side names to CachedSides
+
+    """
+
+    def __init__(self, params, sides):
+        super().__init__(**params)
+        for (side_name, side) in sides.items():
+            setattr(self, side_name + "_side", side)
+
+
+def _read_box(mapped):
+    """Returns the CachedBox in a mapped cache file, or None for a file of
+    another version.
+
+    Raises:
+        struct.error, AttributeError, KeyError, IndexError, TypeError,
+            ValueError: if the file is truncated or malformed
+    """
+    (magic, header_size) = _PREFIX.unpack_from(mapped)
+    start = _PREFIX.size + header_size
+    header = json.loads(mapped[_PREFIX.size:start].decode())
+    if (magic != _MAGIC or header.get("version") != FORMAT_VERSION or
+            header.get("geometry") != geometry_version() or
+            header.get("byteorder") != sys.byteorder):
+        return None
+    coords = memoryview(mapped)[start:].cast("d")
+
+    sides = {}
+    for (side_name, record) in header["sides"]:
+        if not 0 <= record["offset"] <= record["end"] <= len(coords):
+            raise ValueError("Line coordinates out of range")
+        (cutouts, patterns, table) = record["cutouts"]
+        side = CachedSide(
+            SideInfo(*[_decode(value) for value in record["side_info"]]),
+            coords[record["offset"]:record["end"]], {
+                corner: _decode(point)
+                for (corner, point) in record["bounding_box"].items()
+            }, {
+                corner: _decode(point)
+                for (corner, point) in record["inner_bounding_box"].items()
+            })
+        side.cutouts = [(kind, name, _decode(corner_1), _decode(corner_2))
+                        for (kind, name, corner_1, corner_2) in cutouts]
+        side.cutout_patterns = [
+            CutoutPattern(*[_decode(value) for value in pattern])
+            for pattern in patterns
+        ]
+        side.cutout_table.kinds = array("B", table[0])
+        side.cutout_table.names = table[1]
+        side.cutout_table.coords = array("d", table[2])
+        sides[side_name] = side
+    return CachedBox(
+        {name: _decode(value)
+         for (name, value) in header["params"].items()}, sides)
+
+
+class GeometryCache(object):
+    """Stores and loads box geometry in a directory.
+
+    Args:
+        directory (str, optional): cache directory, created if missing.
+            Defaults to default_directory().
+        max_bytes (int, optional): size above which least recently used
+            files are removed
+
+    Attributes:
+        hits: number of boxes loaded by this instance
+        misses: number of boxes stored by this instance
+
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, box):
+        """Returns the cached copy of a box, storing the box on a miss.
+
+        Args:
+            box (Box): box with all its cutouts added
+
+        Returns:
+            a CachedBox on a hit, otherwise box itself
+
+        """
+        key = box_key(box)
+        cached = self.load(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        self.store(box, key)
+        return box
+
+    def load(self, key):
+        """Returns the CachedBox stored under key, or None.
+
+        A file that cannot be read as this version's geometry (truncated,
+        malformed, or written by another version) is removed.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                mapped = mmap.mmap(
+                    cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            box = _read_box(mapped)
+        except (struct.error, AttributeError, KeyError, IndexError,
+                TypeError, ValueError):
+            box = None
+        if box is None:
+            _remove(path)
+            return None
+        try:
+            # Marks the file as recently used for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return box
+
+    def store(self, box, key=None):
+        """Writes a box's geometry to the cache.
+
+        Returns:
+            path of the cache file
+
+        """
+        key = key or box_key(box)
+        coords = array("d")
+        sides = []
+        for (side_name, side) in box.sides().items():
+            offset = len(coords)
+            for line in side.iter_lines():
+                coords.extend((line.source.x, line.source.y, line.dest.x,
+                               line.dest.y, 1.0 if line.is_construction else
+                               0.0))
+            sides.append((side_name, {
+                "side_info": [_encode(value) for value in side.side_info],
+                "offset": offset,
+                "end": len(coords),
+                "bounding_box": {
+                    corner: _encode(point)
+                    for (corner, point) in side.bounding_box.items()
+                },
+                "inner_bounding_box": {
+                    corner: _encode(point)
+                    for (corner, point) in side.inner_bounding_box.items()
+                },
+                "cutouts": _side_cutouts(side),
+            }))
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "geometry": geometry_version(),
+            "byteorder": sys.byteorder,
+            "params": box_params(box),
+            "sides": sides,
+        }).encode()
+        # Pad so the doubles start 8-byte aligned
+        header += b" " * (-(len(header) + _PREFIX.size) % 8)
+
+        path = self.path(key)
+        # Imported here, since scripts loading from the cache never store
+        import tempfile
+        (handle, temp_path) = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as cache_file:
+                cache_file.write(_PREFIX.pack(_MAGIC, len(header)))
+                cache_file.write(header)
+                cache_file.write(coords.tobytes())
+            os.replace(temp_path, path)
+        except OSError:
+            # Another process has the file open (on Windows); it holds the
+            # same geometry, so there is nothing to do.
+            _remove(temp_path)
+        self.evict()
+        return path
+
+    def entries(self):
+        """Returns (mtime, size, path) for each cache file, oldest first."""
+        found = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.endswith(SUFFIX):
+                    found.append((stat.st_mtime, stat.st_size, entry.path))
+                elif (entry.name.endswith(".tmp") and
+                      time.time() - stat.st_mtime > _STALE_SECONDS):
+                    _remove(entry.path)
+        return sorted(found)
+
+    def size(self):
+        return sum(size for (_mtime, size, _path) in self.entries())
+
+    def evict(self):
+        """Removes least recently used files until under max_bytes.
+
+        The most recently used file is always kept.
+        """
+        entries = self.entries()
+        total = sum(size for (_mtime, size, _path) in entries)
+        for (_mtime, size, path) in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            if _remove(path):
+                total -= size
+
+    def clear(self):
+        for (_mtime, _size, path) in self.entries():
+            _remove(path)
+
+
+def _remove(path):
+    """Removes a file, returning whether it was removed."""
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+_default_cache = None
+
+
+def cached(box):
+    """Returns the cached copy of a box from the default cache.
+
+    See GeometryCache.get.  If the cache directory cannot be used, box is
+    returned as it is.
+    """
+    global _default_cache  # pylint: disable=global-statement
+    try:
+        if _default_cache is None:
+            _default_cache = GeometryCache()
+        return _default_cache.get(box)
+    except OSError:
+        return box
+
+
+def main(argv=None):
+    """Warms, shows or clears the cache."""
+    import argparse
+    import runpy
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--directory", help="cache directory")
+    subparsers = parser.add_subparsers(dest="command")
+    warm = subparsers.add_parser(
+        "warm", help="store the box returned by a specification file")
+    warm.add_argument("spec", help="Python file defining the function")
+    warm.add_argument("--function", default="specify_box")
+    subparsers.add_parser("show", help="list cache files")
+    subparsers.add_parser("clear", help="remove all cache files")
+    args = parser.parse_args(argv)
+
+    cache = GeometryCache(args.directory)
+    if args.command == "warm":
+        box = runpy.run_path(args.spec)[args.function]()
+        cache.get(box)
+        print("{} {}".format("hit" if cache.hits else "stored",
+                             cache.path(box_key(box))))
+    elif args.command == "clear":
+        cache.clear()
+    else:
+        for (mtime, size, path) in cache.entries():
+            print("{}  {:>9}  {}".format(
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime)), size,
+                os.path.basename(path)))
+        print("{} bytes in {}".format(cache.size(), cache.directory))
+
+
+if __name__ == "__main__":
+    main()
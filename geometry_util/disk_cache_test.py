@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""Tests the on-disk geometry cache.
+"""
+
+from geometry_util.box import Box, EdgeTemplate, SideTemplate
+from geometry_util import disk_cache
+from geometry_util.disk_cache import (_MAGIC, _PREFIX, CachedBox,
+                                      GeometryCache, box_key)
+from geometry_util.fingerprint import fingerprint_box, side_fingerprints
+from geometry_util.geometry import Point
+from projects.psu_4mm_acrylic.spec import specify_box
+
+
+def psu_box():
+    return specify_box()
+
+
+def test_round_trip_matches_and_skips_geometry(tmp_path):
+    cache = GeometryCache(str(tmp_path))
+    box = psu_box()
+    assert cache.get(box) is box
+    expected = side_fingerprints(box)
+
+    EdgeTemplate._cache.clear()
+    SideTemplate._cache.clear()
+    loaded = cache.get(psu_box())
+    assert isinstance(loaded, CachedBox)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert side_fingerprints(loaded) == expected
+    # Neither building the box nor reading its lines drew an edge
+    assert not EdgeTemplate._cache
+    assert loaded.lower_side.cutout_patterns[0].name == "banana"
+    assert (loaded.upper_side.instance_key() ==
+            box.upper_side.instance_key())
+
+
+def test_key_covers_arguments_and_cutouts():
+    box = Box(100, 50, 65, 3, 2)
+    key = box_key(box)
+    assert key == box_key(Box(100, 50, 65, 3, 2))
+    assert key != box_key(Box(100, 50, 65, 3, 2, nested=True))
+    box.top_side.add_cutout('circle', Point(5, 5), Point(9, 9))
+    assert key != box_key(box)
+
+
+def test_eviction_keeps_newest(tmp_path):
+    cache = GeometryCache(str(tmp_path), max_bytes=1)
+    first = Box(100, 50, 65, 3, 2)
+    second = Box(120, 50, 65, 3, 2)
+    cache.get(first)
+    cache.get(second)
+    assert [path for (_mtime, _size, path) in cache.entries()
+            ] == [cache.path(box_key(second))]
+    assert fingerprint_box(cache.get(second)) == fingerprint_box(second)
+
+
+def test_damaged_files_are_misses(tmp_path):
+    cache = GeometryCache(str(tmp_path))
+    box = Box(100, 50, 65, 3, 2)
+    path = cache.store(box)
+    with open(path, "rb") as cache_file:
+        data = cache_file.read()
+    for damaged in (data[:12], data[:40], data[:-12], data[:-40],
+                    data.replace(b'"sides"', b'"sidez"')):
+        with open(path, "wb") as cache_file:
+            cache_file.write(damaged)
+        assert cache.load(box_key(box)) is None
+        assert not cache.entries()
+
+
+def test_corrupt_header_is_a_miss(tmp_path):
+    cache = GeometryCache(str(tmp_path))
+    box = Box(100, 50, 65, 3, 2)
+    path = cache.store(box)
+    for header in (b"[]", b"3", b'"sides"'):
+        with open(path, "wb") as cache_file:
+            cache_file.write(_PREFIX.pack(_MAGIC, len(header)) + header)
+        assert cache.load(box_key(box)) is None
+        assert not cache.entries()
+
+
+def test_key_covers_geometry_source(monkeypatch):
+    box = Box(100, 50, 65, 3, 2)
+    key = box_key(box)
+    monkeypatch.setattr(disk_cache, "_geometry_version", "edited")
+    assert box_key(box) != key
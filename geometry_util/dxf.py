@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+"""Writes precise DXF files from geometric lines and cutouts.
+
+The output is ASCII DXF R12, the flavour most widely imported: a header
+giving the version, then an ENTITIES section of LINE and CIRCLE entities.
+R12 has no header variable for units ($INSUNITS came with later versions),
+so coordinates are unitless; box units are millimetres, and scale converts
+them.  Coordinates are written with repr, so they read back exactly.  Rectangle
+cutouts become four lines, and circle cutouts follow
+SketchContainer.draw_circle_from_2_points (the horizontal distance between
+the corners sets the diameter).
+
+Real lines, construction lines and cutouts are put on separate layers.
+box_dxf writes a whole box layout as one cut sheet, optionally cutting
+boundaries shared by neighbouring sides once (see common_line).
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+import io
+
+from .common_line import merge_box
+from .cutout_table import cutout_coords
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913
+
+LAYER_OUTLINE = "0"
+LAYER_CONSTRUCTION = "CONSTRUCTION"
+LAYER_CUTOUTS = "CUTOUTS"
+
+
+def dxf_entities(lines, cutouts=(), scale=1.0, offset=(0.0, 0.0)):
+    """Lists the DXF entities for lines and cutouts.
+
+    Args:
+        lines: iterable of geometric lines
+        cutouts: CutoutTable or iterable of cutouts (see
+            cutout_table.cutout_coords)
+        scale (float, optional): factor applied to all coordinates
+        offset (tuple, optional): (x, y) added to coordinates before scaling
+
+    Returns:
+        list of ('LINE', layer, x0, y0, x1, y1) and
+        ('CIRCLE', layer, center_x, center_y, radius) tuples
+
+    """
+    (offset_x, offset_y) = offset
+
+    def line_entity(layer, x0, y0, x1, y1):
+        return ("LINE", layer, (x0 + offset_x) * scale,
+                (y0 + offset_y) * scale, (x1 + offset_x) * scale,
+                (y1 + offset_y) * scale)
+
+    entities = []
+    for line in lines:
+        layer = LAYER_CONSTRUCTION if line.is_construction else LAYER_OUTLINE
+        entities.append(
+            line_entity(layer, line.source.x, line.source.y, line.dest.x,
+                        line.dest.y))
+    for (kind, _name, cx0, cy0, cx1, cy1) in cutout_coords(cutouts):
+        if kind == 'rect':
+            corners = [(cx0, cy0), (cx1, cy0), (cx1, cy1), (cx0, cy1)]
+            for index in range(4):
+                ((x0, y0), (x1, y1)) = (corners[index],
+                                        corners[(index + 1) % 4])
+                entities.append(line_entity(LAYER_CUTOUTS, x0, y0, x1, y1))
+        elif kind == 'circle':
+            entities.append(
+                ("CIRCLE", LAYER_CUTOUTS,
+                 scale * ((cx0 + cx1) / 2.0 + offset_x),
+                 scale * ((cy0 + cy1) / 2.0 + offset_y),
+                 scale * abs(cx1 - cx0) / 2.0))
+        else:
+            raise ValueError("Unknown cutout kind: {}".format(kind))
+    return entities
+
+
+def _pairs(entities):
+    yield (0, "SECTION")
+    yield (2, "HEADER")
+    yield (9, "$ACADVER")
+    yield (1, "AC1009")
+    yield (0, "ENDSEC")
+    yield (0, "SECTION")
+    yield (2, "ENTITIES")
+    for entity in entities:
+        yield (0, entity[0])
+        yield (8, entity[1])
+        if entity[0] == "LINE":
+            (x0, y0, x1, y1) = entity[2:]
+            yield (10, repr(x0))
+            yield (20, repr(y0))
+            yield (30, "0.0")
+            yield (11, repr(x1))
+            yield (21, repr(y1))
+            yield (31, "0.0")
+        else:
+            (center_x, center_y, radius) = entity[2:]
+            yield (10, repr(center_x))
+            yield (20, repr(center_y))
+            yield (30, "0.0")
+            yield (40, repr(radius))
+    yield (0, "ENDSEC")
+    yield (0, "EOF")
+
+
+def write_dxf(stream,
+              lines,
+              cutouts=(),
+              scale=1.0,
+              offset=(0.0, 0.0)) -> int:
+    """Writes lines and cutouts to a text stream as DXF.
+
+    Args:
+        stream: text stream to write to
+        lines: iterable of geometric lines
+        cutouts: CutoutTable or iterable of cutouts (see
+            cutout_table.cutout_coords)
+        scale (float, optional): factor applied to all coordinates
+        offset (tuple, optional): (x, y) added to coordinates before scaling
+
+    Returns:
+        number of entities written
+
+    """
+    entities = dxf_entities(lines, cutouts, scale, offset)
+    stream.write("".join("{:>3}\n{}\n".format(code, value)
+                         for (code, value) in _pairs(entities)))
+    return len(entities)
+
+
+def side_dxf(side,
+             include_construction=False,
+             include_cutouts=True,
+             scale=1.0):
+    """Returns a side as DXF text.
+
+    Args:
+        side (Side): side to write
+        include_construction (bool, optional): whether to write
+            construction lines
+        include_cutouts (bool, optional): whether to write cutouts (with
+            patterns expanded)
+        scale (float, optional): factor applied to all coordinates
+
+    Returns:
+        (text, entity count) pair
+
+    """
+    stream = io.StringIO()
+    count = write_dxf(
+        stream,
+        side.iter_lines(include_construction=include_construction),
+        side.iter_cutout_coords() if include_cutouts else (), scale)
+    return (stream.getvalue(), count)
+
+
+def box_dxf(box,
+            merge_common=False,
+            include_cutouts=True,
+            scale=1.0):
+    """Returns all sides of a box, as laid out, as one DXF cut sheet.
+
+    Construction lines are left out.
+
+    Args:
+        box (Box): box to write
+        merge_common (bool, optional): whether to write boundaries shared by
+            neighbouring sides once (see common_line.merge_box; useful for
+            nested boxes with zero spacing)
+        include_cutouts (bool, optional): whether to write cutouts (with
+            patterns expanded)
+        scale (float, optional): factor applied to all coordinates
+
+    Returns:
+        (text, entity count) pair
+
+    """
+    if merge_common:
+        lines = merge_box(box).lines
+    else:
+        lines = box.iter_lines(include_construction=False)
+    cutouts = ()
+    if include_cutouts:
+        cutouts = [
+            cutout for side in box.sides().values()
+            for cutout in side.iter_cutout_coords()
+        ]
+    stream = io.StringIO()
+    count = write_dxf(stream, lines, cutouts, scale)
+    return (stream.getvalue(), count)
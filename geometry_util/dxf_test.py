@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Tests DXF output of sides.
+"""
+from geometry_util.box import Box
+from geometry_util.common_line import merge_box
+from geometry_util.dxf import box_dxf, dxf_entities, side_dxf
+from geometry_util.geometry import Point
+
+
+def read_pairs(text):
+    lines = text.split("\n")
+    return [(int(lines[index]), lines[index + 1])
+            for index in range(0, len(lines) - 1, 2)]
+
+
+def test_side_dxf_is_exact():
+    box = Box(100, 50, 65, 3, 2)
+    side = box.bottom_side
+    side.add_cutout('rect', Point(5, 5), Point(15, 10), name="plug")
+    side.add_cutout_pattern(
+        'circle', Point(30, 5), Point(34, 9), 3, 6, name="jack")
+    (text, count) = side_dxf(side, scale=0.5)
+    pairs = read_pairs(text)
+
+    # Only R12 header variables
+    assert pairs[:5] == [(0, "SECTION"), (2, "HEADER"), (9, "$ACADVER"),
+                         (1, "AC1009"), (0, "ENDSEC")]
+    assert pairs[-1] == (0, "EOF")
+    kinds = [value for (code, value) in pairs if code == 0]
+    lines = list(side.iter_lines(include_construction=False))
+    assert kinds.count("LINE") == len(lines) + 4
+    assert kinds.count("CIRCLE") == 3
+    assert count == len(lines) + 4 + 3
+
+    # Coordinates read back exactly
+    xs = [float(value) for (code, value) in pairs if code == 10]
+    assert xs[0] == lines[0].source.x * 0.5
+    radii = [float(value) for (code, value) in pairs if code == 40]
+    assert radii == [1.0, 1.0, 1.0]
+
+
+def test_side_dxf_without_cutouts():
+    side = Box(100, 50, 65, 3, 2).bottom_side
+    side.add_cutout('rect', Point(5, 5), Point(15, 10))
+    (_text, count) = side_dxf(
+        side, include_construction=True, include_cutouts=False)
+    assert count == len(list(side.iter_lines()))
+
+
+def test_dxf_offset():
+    side = Box(100, 50, 65, 3, 2).bottom_side
+    side.add_cutout('circle', Point(5, 5), Point(9, 9))
+    line = next(side.iter_lines(include_construction=False))
+    entities = dxf_entities([line], side.cutouts, scale=0.5, offset=(10, 20))
+    assert entities[0][2:4] == ((line.source.x + 10) * 0.5,
+                                (line.source.y + 20) * 0.5)
+    (kind, _layer, center_x, _center_y, radius) = entities[1]
+    assert kind == "CIRCLE"
+    assert (center_x, radius) == (
+        (side.cutouts[0][2].x + 2 + 10) * 0.5, 1.0)
+
+
+def test_box_dxf_merges_common_lines():
+    box = Box(100, 50, 65, 3, 0, nested=True)
+    box.top_side.add_cutout('circle', Point(5, 5), Point(9, 9))
+    (_text, count) = box_dxf(box)
+    (merged_text, merged_count) = box_dxf(box, merge_common=True)
+    assert count == len(list(box.iter_lines(include_construction=False))) + 1
+    assert merged_count == len(merge_box(box).lines) + 1
+    assert merged_count < count
+    assert read_pairs(merged_text).count((0, "CIRCLE")) == 1
@@ -0,0 +1,289 @@
+#!/usr/bin/python3
+"""Laser cut time and cost estimates for boxes.
+
+A box is reduced to the numbers a laser cutter's time depends on:
+
+- cut length: the real (non-construction) lines plus cutout outlines
+- pierce count: one per closed contour, i.e. per connected piece of a
+  side's outline and per cutout
+- rapid travel: head moves between contours, visiting each contour's
+  start point nearest first from the machine origin
+- material: the part area (outlines less cutouts) and the sheet area (the
+  bounding box of the laid out sides)
+
+Each is computed in one pass over a side's lines.  Estimates can be made
+for single boxes, batches of boxes, or parameter sweeps, and for each tab
+strategy of Box.calc_tab_num_and_length.
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+import argparse
+import itertools
+import math
+from typing import NamedTuple
+
+from .box import Box, tab_count
+from .raster import box_bounds
+from .sharding import loops
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913,R0914
+
+Rates = NamedTuple('Rates', [("feed", float), ("rapid", float),
+                             ("pierce", float), ("per_minute", float),
+                             ("per_area", float)])
+Rates.__doc__ = """Machine and material rates.
+Args:
+    feed: cutting speed in mm/s
+    rapid: travel speed between contours in mm/s
+    pierce: seconds to pierce the material at each contour
+    per_minute: machine cost per minute
+    per_area: material cost per square mm of sheet
+
+"""
+
+DEFAULT_RATES = Rates(feed=20.0, rapid=200.0, pierce=0.5, per_minute=1.0,
+                      per_area=0.0)
+
+Estimate = NamedTuple('Estimate', [("cut_length", float),
+                                   ("pierce_count", int),
+                                   ("rapid_length", float),
+                                   ("part_area", float),
+                                   ("sheet_area", float),
+                                   ("seconds", float), ("cost", float)])
+Estimate.__doc__ = """Machine time and cost of cutting a design.
+Args:
+    cut_length: total cut length in mm
+    pierce_count: number of pierces (closed contours)
+    rapid_length: travel between contours in mm
+    part_area: area of the parts in square mm
+    sheet_area: area of the sheet the parts are laid out on in square mm
+    seconds: estimated machine time
+    cost: estimated machine and material cost
+
+"""
+
+# Tab strategies: segment lengths in multiples of the thickness, where
+# 'auto' is Box's own choice (3x if that gives at least 3 tabs, else 2x).
+TAB_STRATEGIES = ("auto", "2x", "3x")
+
+
+def _loop_area(lines, tolerance=1e-6):
+    """Returns the area enclosed by a closed loop of lines (0 if open)."""
+    neighbours = {}
+    points = {}
+    for line in lines:
+        ends = []
+        for point in (line.source, line.dest):
+            key = (int(round(point.x / tolerance)),
+                   int(round(point.y / tolerance)))
+            points[key] = point
+            ends.append(key)
+        neighbours.setdefault(ends[0], []).append(ends[1])
+        neighbours.setdefault(ends[1], []).append(ends[0])
+    if any(len(found) != 2 for found in neighbours.values()):
+        return 0.0
+    start = next(iter(neighbours))
+    (previous, current) = (start, neighbours[start][0])
+    twice_area = 0.0
+    visited = 1
+    while True:
+        (x0, y0) = points[previous].coords()
+        (x1, y1) = points[current].coords()
+        twice_area += x0 * y1 - x1 * y0
+        if current == start:
+            break
+        (first, second) = neighbours[current]
+        (previous, current) = (current, second if first == previous else
+                               first)
+        visited += 1
+    if visited != len(neighbours):
+        return 0.0
+    return abs(twice_area) / 2.0
+
+
+def _cutout_metrics(kind, x0, y0, x1, y1):
+    """Returns (perimeter, area) of a cutout as drawn in Fusion 360."""
+    width = abs(x1 - x0)
+    if kind == 'circle':
+        return (math.pi * width, math.pi * width * width / 4.0)
+    height = abs(y1 - y0)
+    return (2 * (width + height), width * height)
+
+
+def _rapid_length(starts, origin=(0.0, 0.0)):
+    """Length of a nearest-first tour from origin through all starts."""
+    remaining = list(starts)
+    (x, y) = origin
+    total = 0.0
+    while remaining:
+        index = min(
+            range(len(remaining)),
+            key=lambda i: (remaining[i][0] - x)**2 + (remaining[i][1] - y)**2)
+        (next_x, next_y) = remaining.pop(index)
+        total += math.hypot(next_x - x, next_y - y)
+        (x, y) = (next_x, next_y)
+    return total
+
+
+def estimate_box(box, rates=DEFAULT_RATES) -> Estimate:
+    """Estimates the time and cost of cutting a box.
+
+    Args:
+        box (Box): box to estimate, with its cutouts
+        rates (Rates, optional): machine and material rates
+
+    """
+    cut_length = 0.0
+    part_area = 0.0
+    starts = []
+    for side in box.sides().values():
+        for piece in loops(side.iter_lines(include_construction=False)):
+            cut_length += math.fsum(
+                abs(line.dest.x - line.source.x) +
+                abs(line.dest.y - line.source.y) for line in piece)
+            part_area += _loop_area(piece)
+            starts.append(piece[0].source.coords())
+        for (kind, _name, x0, y0, x1, y1) in side.iter_cutout_coords():
+            (perimeter, area) = _cutout_metrics(kind, x0, y0, x1, y1)
+            cut_length += perimeter
+            part_area -= area
+            starts.append((x0, y0))
+
+    (min_x, min_y, max_x, max_y) = box_bounds(box)
+    sheet_area = (max_x - min_x) * (max_y - min_y)
+    rapid_length = _rapid_length(starts)
+    seconds = (cut_length / rates.feed + rapid_length / rates.rapid +
+               len(starts) * rates.pierce)
+    cost = seconds / 60.0 * rates.per_minute + sheet_area * rates.per_area
+    return Estimate(cut_length, len(starts), rapid_length, part_area,
+                    sheet_area, seconds, cost)
+
+
+def estimate_boxes(boxes, rates=DEFAULT_RATES):
+    """Returns a list of Estimates, one per box."""
+    return [estimate_box(box, rates) for box in boxes]
+
+
+class _FixedTabBox(Box):
+    """Box whose tab segments are a fixed multiple of the thickness."""
+
+    def __init__(self, multiple, *args, **kwargs):
+        self.tab_multiple = multiple
+        super().__init__(*args, **kwargs)
+
+    def calc_tab_num_and_length(self, dim):
+        num_tabs = tab_count(dim.dist, self.thickness.dist, self.tab_multiple)
+        return int(num_tabs), dim / (2 * num_tabs + 1)
+
+
+def tab_strategy_box(strategy, *args, **kwargs):
+    """Returns a Box built with one of TAB_STRATEGIES.
+
+    Args:
+        strategy (str): 'auto', '2x' or '3x'
+        args, kwargs: Box arguments
+
+    Returns:
+        the Box, or None if the strategy gives no tabs on some side
+
+    """
+    if strategy == "auto":
+        box = Box(*args, **kwargs)
+    else:
+        box = _FixedTabBox(int(strategy[:-1]), *args, **kwargs)
+    dims = (box.width, box.height, box.depth)
+    if any(box.calc_tab_num_and_length(dim)[0] < 1 for dim in dims):
+        return None
+    return box
+
+
+def compare_tab_strategies(width,
+                           height,
+                           depth,
+                           thickness,
+                           spacing,
+                           rates=DEFAULT_RATES,
+                           **kwargs):
+    """Estimates a box under each tab strategy.
+
+    Cutouts are not included, since they are the same for every strategy.
+
+    Returns:
+        dict from strategy names to Estimates (None where the strategy gives
+        no tabs)
+
+    """
+    estimates = {}
+    for strategy in TAB_STRATEGIES:
+        box = tab_strategy_box(strategy, width, height, depth, thickness,
+                               spacing, **kwargs)
+        estimates[strategy] = None if box is None else estimate_box(
+            box, rates)
+    return estimates
+
+
+def sweep(widths,
+          heights,
+          depths,
+          thicknesses,
+          spacing,
+          rates=DEFAULT_RATES,
+          strategies=("auto", ),
+          **kwargs):
+    """Estimates every combination of box parameters and tab strategies.
+
+    Yields:
+        ((width, height, depth, thickness, strategy), Estimate or None)
+
+    """
+    for (width, height, depth, thickness,
+         strategy) in itertools.product(widths, heights, depths, thicknesses,
+                                        strategies):
+        box = tab_strategy_box(strategy, width, height, depth, thickness,
+                               spacing, **kwargs)
+        yield ((width, height, depth, thickness, strategy),
+               None if box is None else estimate_box(box, rates))
+
+
+def format_estimates(estimates):
+    """Returns a text table of a dict from labels to Estimates."""
+    lines = ["{:<8}{:>11}{:>8}{:>11}{:>12}{:>9}{:>9}".format(
+        "", "cut mm", "pierce", "rapid mm", "sheet mm2", "seconds", "cost")]
+    for (label, estimate) in estimates.items():
+        if estimate is None:
+            lines.append("{:<8}{:>11}".format(label, "no tabs"))
+            continue
+        lines.append("{:<8}{:>11.1f}{:>8}{:>11.1f}{:>12.0f}{:>9.1f}{:>9.2f}"
+                     .format(label, estimate.cut_length,
+                             estimate.pierce_count, estimate.rapid_length,
+                             estimate.sheet_area, estimate.seconds,
+                             estimate.cost))
+    return "\n".join(lines)
+
+
+def main():
+    """Compares tab strategies for a sample (or given) box."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "dims",
+        nargs="*",
+        type=float,
+        default=[100, 50, 65, 3, 2],
+        help="width height depth thickness spacing")
+    parser.add_argument("--feed", type=float, default=DEFAULT_RATES.feed)
+    parser.add_argument("--rapid", type=float, default=DEFAULT_RATES.rapid)
+    parser.add_argument("--pierce", type=float, default=DEFAULT_RATES.pierce)
+    parser.add_argument(
+        "--per-minute", type=float, default=DEFAULT_RATES.per_minute)
+    parser.add_argument(
+        "--per-area", type=float, default=DEFAULT_RATES.per_area)
+    args = parser.parse_args()
+    rates = Rates(args.feed, args.rapid, args.pierce, args.per_minute,
+                  args.per_area)
+    print(format_estimates(compare_tab_strategies(*args.dims, rates=rates)))
+
+
+if __name__ == "__main__":
+    main()
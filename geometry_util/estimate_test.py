@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Tests laser cut time and cost estimates.
+"""
+from geometry_util.box import Box
+from geometry_util.estimate import (Rates, TAB_STRATEGIES,
+                                    compare_tab_strategies, estimate_box,
+                                    sweep)
+from geometry_util.fingerprint import fingerprint_box
+from geometry_util.geometry import Point
+
+
+def test_estimate_box_metrics():
+    box = Box(100, 50, 65, 3, 2)
+    plain = estimate_box(box)
+    assert plain.pierce_count == 6
+    assert abs(plain.cut_length - fingerprint_box(box).real_length) < 1e-6
+    # Each side's area lies between its inner and outer bounding boxes
+    def area(corners):
+        return ((corners['ne'].x - corners['sw'].x) *
+                (corners['ne'].y - corners['sw'].y))
+
+    sides = box.sides().values()
+    inner = sum(area(side.inner_bounding_box) for side in sides)
+    outer = sum(area(side.bounding_box) for side in sides)
+    assert inner < plain.part_area < outer < plain.sheet_area
+
+    box.top_side.add_cutout('rect', Point(5, 5), Point(15, 10))
+    with_cutout = estimate_box(box)
+    assert with_cutout.pierce_count == 7
+    assert abs(with_cutout.cut_length - plain.cut_length - 30) < 1e-9
+    assert abs(plain.part_area - with_cutout.part_area - 50) < 1e-9
+    assert with_cutout.seconds > plain.seconds
+
+    rates = Rates(feed=10.0, rapid=100.0, pierce=1.0, per_minute=60.0,
+                  per_area=0.0)
+    slow = estimate_box(box, rates)
+    assert abs(slow.seconds - (with_cutout.cut_length / 10.0 +
+                               with_cutout.rapid_length / 100.0 + 7)) < 1e-9
+    assert abs(slow.cost - slow.seconds) < 1e-9
+
+
+def test_tab_strategies_and_sweep():
+    estimates = compare_tab_strategies(100, 50, 65, 3, 2)
+    assert tuple(estimates) == TAB_STRATEGIES
+    # Longer segments mean fewer notches to cut
+    assert estimates["3x"].cut_length < estimates["2x"].cut_length
+    assert compare_tab_strategies(40, 30, 30, 6, 2)["3x"] is None
+
+    results = list(
+        sweep([75.5, 100], [50], [65, 220], [3], 2, strategies=("2x", "3x")))
+    assert len(results) == 8
+    assert all(estimate.cut_length > 0 for (_params, estimate) in results)
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""Canonical geometry fingerprints for regression testing.
+
+A fingerprint is a hash plus summary statistics of a side's (or box's)
+lines and cutouts.  Coordinates are snapped to a grid (1e-6 by default),
+and each line's endpoints are put in a fixed order.  Each item is hashed on
+its own and the item hashes are summed, so the result does not depend on
+the order lines or cutouts were generated in.  Everything is computed in a
+single pass over the geometry.
+
+Cutout names are not part of the geometry, and cutout patterns are
+expanded, so a pattern and the equivalent individual cutouts match.
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+import hashlib
+from typing import NamedTuple
+
+# pylint: disable=too-few-public-methods,C0111,C0103
+
+DIGITS = 6
+_MASK = (1 << 64) - 1
+
+Fingerprint = NamedTuple('Fingerprint', [("digest", str), ("lines", int),
+                                         ("real_lines", int),
+                                         ("real_length", float),
+                                         ("bounds", tuple),
+                                         ("cutouts", int)])
+Fingerprint.__doc__ = """Order-independent summary of some geometry.
+Args:
+    digest: hex hash of the snapped geometry
+    lines: number of lines, construction lines included
+    real_lines: number of non-construction lines
+    real_length: total length of non-construction lines
+    bounds: (min_x, min_y, max_x, max_y) of all line endpoints
+    cutouts: number of cutouts (pattern instances counted individually)
+
+"""
+
+
+def _item_hash(item) -> int:
+    digest = hashlib.blake2b(repr(item).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class _Accumulator(object):
+    """Running sums for a fingerprint."""
+
+    def __init__(self, digits):
+        self.scale = 10**digits
+        self.digits = digits
+        self.hash_sum = 0
+        self.lines = 0
+        self.real_lines = 0
+        self.real_length = 0.0
+        self.cutouts = 0
+        self.bounds = None
+
+    def snap(self, value):
+        return int(round(value * self.scale))
+
+    def add_line(self, line):
+        source = (self.snap(line.source.x), self.snap(line.source.y))
+        dest = (self.snap(line.dest.x), self.snap(line.dest.y))
+        ends = (source, dest) if source <= dest else (dest, source)
+        self.hash_sum += _item_hash(("line", ends, line.is_construction))
+        self.lines += 1
+        if not line.is_construction:
+            self.real_lines += 1
+            self.real_length += abs(line.dest.x - line.source.x) + abs(
+                line.dest.y - line.source.y)
+        xs = (line.source.x, line.dest.x)
+        ys = (line.source.y, line.dest.y)
+        if self.bounds is None:
+            self.bounds = [min(xs), min(ys), max(xs), max(ys)]
+        else:
+            bounds = self.bounds
+            bounds[0] = min(bounds[0], xs[0], xs[1])
+            bounds[1] = min(bounds[1], ys[0], ys[1])
+            bounds[2] = max(bounds[2], xs[0], xs[1])
+            bounds[3] = max(bounds[3], ys[0], ys[1])
+
+    def add_cutout(self, kind, x0, y0, x1, y1):
+        corners = sorted([(self.snap(x0), self.snap(y0)),
+                          (self.snap(x1), self.snap(y1))])
+        self.hash_sum += _item_hash(("cutout", kind, tuple(corners)))
+        self.cutouts += 1
+
+    def result(self):
+        digest = "{:016x}{:08x}{:08x}".format(self.hash_sum & _MASK,
+                                             self.lines, self.cutouts)
+        bounds = tuple(round(value, self.digits)
+                       for value in (self.bounds or (0.0, 0.0, 0.0, 0.0)))
+        return Fingerprint(digest, self.lines, self.real_lines,
+                           round(self.real_length, self.digits), bounds,
+                           self.cutouts)
+
+
+def _add_side(accumulator, side):
+    for line in side.iter_lines():
+        accumulator.add_line(line)
+    for (kind, _name, x0, y0, x1, y1) in side.iter_cutout_coords():
+        accumulator.add_cutout(kind, x0, y0, x1, y1)
+
+
+def fingerprint_side(side, digits=DIGITS) -> Fingerprint:
+    """Returns the fingerprint of a side's lines and cutouts.
+
+    Args:
+        side (Side): side to fingerprint
+        digits (int, optional): decimal places kept when snapping
+
+    """
+    accumulator = _Accumulator(digits)
+    _add_side(accumulator, side)
+    return accumulator.result()
+
+
+def fingerprint_box(box, digits=DIGITS) -> Fingerprint:
+    """Returns the fingerprint of all sides of a box together.
+
+    Args:
+        box (Box): box to fingerprint
+        digits (int, optional): decimal places kept when snapping
+
+    """
+    accumulator = _Accumulator(digits)
+    for side in box.sides().values():
+        _add_side(accumulator, side)
+    return accumulator.result()
+
+
+def side_fingerprints(box, digits=DIGITS):
+    """Returns a dict from side names to side fingerprints."""
+    return {
+        side_name: fingerprint_side(side, digits)
+        for (side_name, side) in box.sides().items()
+    }
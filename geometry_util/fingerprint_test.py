@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""Regression tests comparing geometry fingerprints against stored goldens.
+
+Run this file directly to regenerate the goldens after an intended
+geometry change:
+
+    python3 -m geometry_util.fingerprint_test
+
+"""
+import itertools
+import json
+import os.path
+
+from geometry_util.box import Box
+from geometry_util.fingerprint import fingerprint_box, side_fingerprints
+from geometry_util.geometry import Point
+from projects.psu_4mm_acrylic.spec import specify_box
+
+GOLDEN_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "goldens",
+    "fingerprints.json")
+
+WIDTHS = [40, 75.5, 100, 120, 220]
+HEIGHTS = [30, 50, 100, 137.25]
+DEPTHS = [30, 65, 220]
+THICKNESSES = [3, 4.7625, 6]
+NESTED = [False, True]
+
+
+def box_matrix():
+    """Yields (key, box) for every box in the parameter matrix."""
+    for (width, height, depth, thickness, nested) in itertools.product(
+            WIDTHS, HEIGHTS, DEPTHS, THICKNESSES, NESTED):
+        key = "box/{}x{}x{}x{}{}".format(width, height, depth, thickness,
+                                         "/nested" if nested else "")
+        yield key, Box(width, height, depth, thickness, 0 if nested else 2,
+                       nested=nested)
+
+
+def psu_box():
+    return specify_box()
+
+
+def compute_fingerprints():
+    results = {
+        key: fingerprint_box(box)._asdict()
+        for (key, box) in box_matrix()
+    }
+    box = psu_box()
+    results["psu_4mm_acrylic"] = fingerprint_box(box)._asdict()
+    for (side_name, found) in side_fingerprints(box).items():
+        results["psu_4mm_acrylic/" + side_name] = found._asdict()
+    # Match the JSON representation of the goldens
+    return json.loads(json.dumps(results))
+
+
+def test_fingerprints_match_goldens():
+    with open(GOLDEN_PATH) as golden_file:
+        goldens = json.load(golden_file)
+    found = compute_fingerprints()
+    assert sorted(found) == sorted(goldens)
+    mismatched = [key for key in goldens if found[key] != goldens[key]]
+    assert mismatched == []
+
+
+def test_fingerprint_ignores_order_and_names():
+    first = Box(100, 50, 65, 3, 2)
+    second = Box(100, 50, 65, 3, 2)
+    first.bottom_side.add_cutout('rect', Point(5, 5), Point(10, 10))
+    second.bottom_side.add_cutout('rect', Point(10, 10), Point(5, 5),
+                                  name="renamed")
+    second.bottom_side.south_face.lines.reverse()
+    assert fingerprint_box(first) == fingerprint_box(second)
+
+
+def test_pattern_matches_individual_cutouts():
+    first = Box(100, 50, 65, 3, 2)
+    second = Box(100, 50, 65, 3, 2)
+    first.upper_side.add_cutout_pattern(
+        'circle', Point(5, 5), Point(8, 8), 4, 6, 2, 5, bb_inner='ne')
+    for (index_x, index_y) in itertools.product(range(4), range(2)):
+        offset = Point(6 * index_x, 5 * index_y)
+        second.upper_side.add_cutout(
+            'circle', Point(5, 5).relative_to(offset),
+            Point(8, 8).relative_to(offset), bb_inner='ne')
+    assert fingerprint_box(first) == fingerprint_box(second)
+    assert fingerprint_box(first) != fingerprint_box(Box(100, 50, 65, 3, 2))
+
+
+def write_goldens():
+    with open(GOLDEN_PATH, "w") as golden_file:
+        json.dump(compute_fingerprints(), golden_file, indent=1,
+                  sort_keys=True)
+        golden_file.write("\n")
+
+
+if __name__ == "__main__":
+    write_goldens()
+    print("Wrote {}".format(GOLDEN_PATH))
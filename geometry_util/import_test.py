@@ -0,0 +1,21 @@
+#!/usr/bin/python3
+"""Guards the import cost of a Fusion 360 script start.
+"""
+import geometry_util
+from geometry_util.profiling import (OPTIONAL_MODULES, SCRIPT_IMPORTS,
+                                     measure_imports)
+
+
+def test_packages_load_submodules_lazily():
+    report = measure_imports(("geometry_util", "fusion360_util"), repeat=1)
+    assert [
+        name for name in report.modules
+        if name.startswith(("geometry_util.", "fusion360_util.", "adsk"))
+    ] == []
+    assert geometry_util.Box is geometry_util.box.Box
+
+
+def test_script_start_skips_optional_modules():
+    report = measure_imports(SCRIPT_IMPORTS, repeat=1)
+    assert "fusion360_util.tabbed_box" in report.modules
+    assert not set(report.modules) & set(OPTIONAL_MODULES)
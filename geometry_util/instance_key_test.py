@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""Tests the keys used to reuse one Fusion 360 component for several sides.
+"""
+from geometry_util.box import Box, Point
+
+
+def test_opposite_sides_share_keys():
+    box = Box(100, 50, 65, 3, 2)
+    for (side, opposite) in (("bottom", "top"), ("left", "right"),
+                             ("upper", "lower")):
+        sides = box.sides()
+        assert sides[side].shape_key() == sides[opposite].shape_key()
+        assert sides[side].instance_key() == sides[opposite].instance_key()
+    assert box.bottom_side.shape_key() != box.left_side.shape_key()
+
+
+def test_cutouts_are_compared_relative_to_the_side():
+    box = Box(100, 50, 65, 3, 2)
+    for side in (box.bottom_side, box.top_side):
+        side.add_cutout('rect', Point(5, 5), Point(15, 10))
+    assert box.bottom_side.instance_key() == box.top_side.instance_key()
+
+    box.top_side.add_cutout('circle', Point(30, 5), Point(36, 11))
+    assert box.bottom_side.instance_key() != box.top_side.instance_key()
+    assert box.bottom_side.shape_key() == box.top_side.shape_key()
+
+
+def test_cutout_names_do_not_matter():
+    box = Box(100, 50, 65, 3, 2)
+    box.bottom_side.add_cutout('rect', Point(5, 5), Point(15, 10), name="a")
+    box.top_side.add_cutout('rect', Point(5, 5), Point(15, 10), name="b")
+    assert box.bottom_side.instance_key() == box.top_side.instance_key()
+
+
+def test_patterns_are_compared():
+    box = Box(100, 50, 65, 3, 2)
+    for side in (box.bottom_side, box.top_side):
+        side.add_cutout_pattern('circle', Point(5, 5), Point(8, 8), 4, 6)
+    assert box.bottom_side.instance_key() == box.top_side.instance_key()
+
+    box.left_side.add_cutout_pattern('circle', Point(5, 5), Point(8, 8), 4, 6)
+    box.right_side.add_cutout_pattern('circle', Point(5, 5), Point(8, 8), 3,
+                                      6)
+    assert box.left_side.instance_key() != box.right_side.instance_key()
@@ -0,0 +1,326 @@
+#!/usr/bin/python3
+"""Self-intersection and overlap checks for generated sketch geometry.
+
+Fusion 360 can hang or fail silently when handed sketches with crossing or
+overlapping segments.  The functions here find such problems in pure Python
+before anything is passed to the API.
+
+Sides are made of horizontal and vertical lines only, so a sweep over x that
+keeps the active horizontal segments in a Fenwick tree over their y values
+finds every crossing in O((n + k) log n).  Collinear overlaps are found by
+sorting the segments that share a line.  Circle cutouts are bucketed in a
+uniform grid and only checked against the segments and circles in their
+cells.
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+import bisect
+import math
+from typing import NamedTuple
+
+from .geometry import Point
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913,R0914
+
+Intersection = NamedTuple('Intersection', [("kind", str), ("point", Point),
+                                           ("refs", tuple)])
+Intersection.__doc__ = """A problem found between two pieces of geometry.
+Args:
+    kind: one of 'crossing', 't-junction', 'overlap', 'duplicate' or
+        'degenerate'
+    point: location of the problem (start of the shared piece for overlaps)
+    refs: the offending lines (or cutout names for cutout outlines)
+
+"""
+
+# Event ordering for the sweep: horizontal segments open before verticals at
+# the same x are queried, and close after them, so touching endpoints count.
+_OPEN, _QUERY, _CLOSE = 0, 1, 2
+
+
+def _quantize(value: float, tolerance: float) -> int:
+    return int(round(value / tolerance))
+
+
+def _cutout_segments(cutouts):
+    """Splits cutouts into outline segments (for rects) and circles.
+
+    Circles follow SketchContainer.draw_circle_from_2_points: the horizontal
+    distance between the corners sets the diameter.
+    """
+    segments = []
+    circles = []
+    for (kind, name, corner_1, corner_2) in cutouts:
+        if kind == 'rect':
+            x1, y1 = corner_1.coords()
+            x2, y2 = corner_2.coords()
+            corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+            for index in range(4):
+                segments.append((corners[index], corners[(index + 1) % 4],
+                                 name))
+        elif kind == 'circle':
+            center = ((corner_1.x + corner_2.x) / 2.0,
+                      (corner_1.y + corner_2.y) / 2.0)
+            radius = abs(corner_2.x - corner_1.x) / 2.0
+            circles.append((center, radius, name))
+    return segments, circles
+
+
+def _collinear_overlaps(groups, horizontal, tolerance, found):
+    """Finds overlapping segments among segments sharing a line."""
+    for (fixed, segs) in groups.items():
+        segs.sort(key=lambda seg: seg[:2])
+        reach = None
+        for seg in segs:
+            (lo, hi, ref) = seg
+            if reach is not None and lo < reach[1]:
+                kind = ('duplicate' if (lo, hi) == reach[:2] else 'overlap')
+                coords = (lo, fixed) if horizontal else (fixed, lo)
+                found.append(
+                    Intersection(kind,
+                                 Point(coords[0] * tolerance,
+                                       coords[1] * tolerance),
+                                 (reach[2], ref)))
+            if reach is None or hi > reach[1]:
+                reach = seg
+
+
+class _ActiveRows(object):
+    """Active horizontal segments bucketed by y, with a Fenwick tree of
+    bucket sizes so that adding, removing and finding the next occupied y
+    all take O(log n).
+
+    Args:
+        ys: sorted distinct y values of all horizontal segments
+    """
+
+    def __init__(self, ys):
+        self.ys = ys
+        self.tree = [0] * (len(ys) + 1)
+        self.rows = [set() for _ in ys]
+        self.top = 1 << max(len(ys).bit_length() - 1, 0)
+
+    def _add(self, rank, delta):
+        rank += 1
+        while rank < len(self.tree):
+            self.tree[rank] += delta
+            rank += rank & -rank
+
+    def _count_below(self, rank):
+        total = 0
+        while rank > 0:
+            total += self.tree[rank]
+            rank -= rank & -rank
+        return total
+
+    def _rank_of_count(self, count):
+        """Returns the rank holding the count'th (0-based) active segment."""
+        position = 0
+        step = self.top
+        while step:
+            if (position + step < len(self.tree) and
+                    self.tree[position + step] <= count):
+                position += step
+                count -= self.tree[position]
+            step >>= 1
+        return position
+
+    def add(self, y, index):
+        rank = bisect.bisect_left(self.ys, y)
+        self.rows[rank].add(index)
+        self._add(rank, 1)
+
+    def remove(self, y, index):
+        rank = bisect.bisect_left(self.ys, y)
+        self.rows[rank].discard(index)
+        self._add(rank, -1)
+
+    def between(self, y0, y1):
+        """Yields (y, index) of active segments with y0 <= y <= y1, in
+        order."""
+        rank = bisect.bisect_left(self.ys, y0)
+        end = bisect.bisect_right(self.ys, y1)
+        count = self._count_below(rank)
+        total = self._count_below(len(self.ys))
+        while count < total:
+            rank = self._rank_of_count(count)
+            if rank >= end:
+                return
+            row = self.rows[rank]
+            for index in sorted(row):
+                yield (self.ys[rank], index)
+            count += len(row)
+
+
+def _sweep(horizontals, verticals, tolerance, found):
+    """Reports crossings and T-junctions between horizontals and verticals.
+
+    Segments meeting at an endpoint of both (corners of an outline) are
+    expected and not reported.
+    """
+    events = []
+    for (index, (y, x0, x1, _ref)) in enumerate(horizontals):
+        events.append((x0, _OPEN, index))
+        events.append((x1, _CLOSE, index))
+    for (index, (x, _y0, _y1, _ref)) in enumerate(verticals):
+        events.append((x, _QUERY, index))
+    events.sort()
+
+    active = _ActiveRows(sorted({seg[0] for seg in horizontals}))
+    for (x, kind, index) in events:
+        if kind == _OPEN:
+            active.add(horizontals[index][0], index)
+        elif kind == _CLOSE:
+            active.remove(horizontals[index][0], index)
+        else:
+            (_x, y0, y1, v_ref) = verticals[index]
+            for (y, h_index) in active.between(y0, y1):
+                (_y, x0, x1, h_ref) = horizontals[h_index]
+                v_end = y in (y0, y1)
+                h_end = x in (x0, x1)
+                if v_end and h_end:
+                    continue
+                found.append(
+                    Intersection('t-junction' if v_end or h_end else
+                                 'crossing',
+                                 Point(x * tolerance, y * tolerance),
+                                 (h_ref, v_ref)))
+
+
+def _cells(x0, y0, x1, y1, cell):
+    """Yields the (column, row) grid cells a rectangle touches."""
+    for col in range(int(math.floor(x0 / cell)),
+                     int(math.floor(x1 / cell)) + 1):
+        for row in range(int(math.floor(y0 / cell)),
+                         int(math.floor(y1 / cell)) + 1):
+            yield (col, row)
+
+
+def _circle_hits(circles, segments, tolerance, found):
+    """Reports circles crossing segments or other circles.
+
+    Circles are bucketed in a uniform grid of cells about one (median)
+    circle across, so each circle is only compared with the segments and
+    circles that share a cell with its bounding box.
+    """
+    if not circles:
+        return
+    diameters = sorted(2 * radius for (_center, radius, _name) in circles)
+    cell = max(diameters[len(diameters) // 2], 1e3 * tolerance)
+    grid = {}
+    for (index, ((cx, cy), radius, _name)) in enumerate(circles):
+        reach = radius + tolerance
+        for key in _cells(cx - reach, cy - reach, cx + reach, cy + reach,
+                          cell):
+            grid.setdefault(key, []).append(index)
+
+    near_segments = [set() for _ in circles]
+    for (seg_index, ((x0, y0), (x1, y1), _ref)) in enumerate(segments):
+        (lo_x, hi_x) = sorted((x0, x1))
+        (lo_y, hi_y) = sorted((y0, y1))
+        if (hi_x - lo_x) + (hi_y - lo_y) > 64 * cell:
+            # Long outline segments: only visit cells holding circles
+            keys = [
+                key for key in grid
+                if (lo_x <= (key[0] + 1) * cell and key[0] * cell <= hi_x and
+                    lo_y <= (key[1] + 1) * cell and key[1] * cell <= hi_y)
+            ]
+        else:
+            keys = _cells(lo_x, lo_y, hi_x, hi_y, cell)
+        for key in keys:
+            for index in grid.get(key, ()):
+                near_segments[index].add(seg_index)
+
+    for (index, ((cx, cy), radius, name)) in enumerate(circles):
+        for seg_index in sorted(near_segments[index]):
+            ((x0, y0), (x1, y1), ref) = segments[seg_index]
+            if (max(x0, x1) < cx - radius or min(x0, x1) > cx + radius or
+                    max(y0, y1) < cy - radius or min(y0, y1) > cy + radius):
+                continue
+            # Closest point on an axis-aligned segment is a clamp.
+            px = min(max(cx, min(x0, x1)), max(x0, x1))
+            py = min(max(cy, min(y0, y1)), max(y0, y1))
+            near = math.hypot(px - cx, py - cy)
+            far = max(math.hypot(x0 - cx, y0 - cy),
+                      math.hypot(x1 - cx, y1 - cy))
+            if near - tolerance <= radius <= far + tolerance:
+                found.append(Intersection('crossing', Point(px, py),
+                                          (name, ref)))
+        reach = radius + tolerance
+        others = set()
+        for key in _cells(cx - reach, cy - reach, cx + reach, cy + reach,
+                          cell):
+            others.update(other for other in grid[key] if other > index)
+        for other_index in sorted(others):
+            ((ox, oy), other_radius, other) = circles[other_index]
+            if math.hypot(ox - cx, oy - cy) < radius + other_radius - \
+                    tolerance:
+                found.append(Intersection('overlap', Point(cx, cy),
+                                          (name, other)))
+
+
+def find_intersections(lines, cutouts=(), tolerance=1e-6):
+    """Finds crossings, T-junctions and overlaps among lines and cutouts.
+
+    Coordinates are snapped to a grid of size tolerance, so endpoints that
+    differ only by floating point error are treated as equal.
+
+    Args:
+        lines: iterable of axis-aligned geometric lines
+        cutouts: iterable of (kind, name, corner_1, corner_2) cutouts
+        tolerance (float, optional): coordinate snapping distance
+
+    Returns:
+        list of Intersection records (empty if the geometry is clean)
+
+    """
+    found = []
+    cutout_segments, circles = _cutout_segments(cutouts)
+    all_segments = [(line.source.coords(), line.dest.coords(), line)
+                    for line in lines] + cutout_segments
+
+    horizontals = []
+    verticals = []
+    horiz_groups = {}
+    vert_groups = {}
+    for ((sx, sy), (dx, dy), ref) in all_segments:
+        x0, y0 = _quantize(sx, tolerance), _quantize(sy, tolerance)
+        x1, y1 = _quantize(dx, tolerance), _quantize(dy, tolerance)
+        if x0 == x1 and y0 == y1:
+            found.append(Intersection('degenerate', Point(sx, sy), (ref, )))
+        elif y0 == y1:
+            (lo, hi) = sorted((x0, x1))
+            horizontals.append((y0, lo, hi, ref))
+            horiz_groups.setdefault(y0, []).append((lo, hi, ref))
+        elif x0 == x1:
+            (lo, hi) = sorted((y0, y1))
+            verticals.append((x0, lo, hi, ref))
+            vert_groups.setdefault(x0, []).append((lo, hi, ref))
+        else:
+            raise ValueError(
+                "Only horizontal and vertical lines are supported: "
+                "{}".format(ref))
+
+    _collinear_overlaps(horiz_groups, True, tolerance, found)
+    _collinear_overlaps(vert_groups, False, tolerance, found)
+    _sweep(horizontals, verticals, tolerance, found)
+    _circle_hits(circles, all_segments, tolerance, found)
+    return found
+
+
+def check_side(side, tolerance=1e-6):
+    """Checks a side's real (non-construction) lines and its cutouts.
+
+    Args:
+        side (Side): side to check
+        tolerance (float, optional): coordinate snapping distance
+
+    Returns:
+        list of Intersection records (empty if the side is clean)
+
+    """
+    return find_intersections(
+        side.iter_lines(include_construction=False), side.iter_cutouts(),
+        tolerance)
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""Tests intersection checks on generated sides and hand-made segments.
+"""
+from geometry_util.box import Box
+from geometry_util.geometry import Line, Point
+from geometry_util.intersect import check_side, find_intersections
+
+
+def test_generated_sides_are_clean():
+    box = Box(100, 50, 65, 3, 2, bb_sw_point=Point(0, 0))
+    for side in box.sides().values():
+        assert check_side(side) == []
+
+
+def test_crossing_and_t_junction():
+    horiz = Line(Point(0, 0), Point(10, 0))
+    crossing = Line(Point(5, -5), Point(5, 5))
+    touching = Line(Point(8, 0), Point(8, 5))
+    kinds = sorted(found.kind
+                   for found in find_intersections([horiz, crossing,
+                                                    touching]))
+    assert kinds == ['crossing', 't-junction']
+
+
+def test_duplicates_and_overlaps():
+    lines = [
+        Line(Point(0, 0), Point(10, 0)),
+        Line(Point(10, 0), Point(0, 0)),
+        Line(Point(0, 3), Point(0, 8)),
+        Line(Point(0, 5), Point(0, 9)),
+    ]
+    kinds = sorted(found.kind for found in find_intersections(lines))
+    assert kinds == ['duplicate', 'overlap']
+
+
+def test_misplaced_cutout():
+    box = Box(100, 50, 65, 3, 2, bb_sw_point=Point(0, 0))
+    side = box.bottom_side
+    side.add_cutout('rect', Point(-5, 5), Point(10, 10), name="bad")
+    side.add_cutout('circle', Point(20, 20), Point(30, 30), name="a")
+    side.add_cutout('circle', Point(25, 20), Point(35, 30), name="b")
+    found = {(found.kind, found.refs[0]) for found in check_side(side)}
+    assert ('crossing', 'bad') in found
+    assert ('overlap', 'a') in found
+
+
+def test_sweep_matches_brute_force():
+    # A grid where every horizontal crosses every vertical
+    horiz = [Line(Point(0, y), Point(20, y)) for y in range(1, 20, 2)]
+    vert = [Line(Point(x, 0), Point(x, 20)) for x in range(1, 20, 3)]
+    found = find_intersections(horiz + vert)
+    assert len(found) == len(horiz) * len(vert)
+    assert {(f.refs[0], f.refs[1]) for f in found} == {
+        (h, v) for h in horiz for v in vert}
+
+
+def test_large_circle_pattern():
+    box = Box(150, 150, 150, 3, 2, bb_sw_point=Point(0, 0))
+    side = box.bottom_side
+    side.add_cutout_pattern('circle', Point(5, 5), Point(6, 6), 40, 3, 40, 3,
+                            name="vent")
+    assert check_side(side) == []
+    # One stray hole overlapping the grid and one crossing the outline
+    side.add_cutout('circle', Point(5.5, 5.5), Point(7.5, 7.5), name="odd")
+    side.add_cutout('circle', Point(-3, 60), Point(3, 66), name="edge")
+    found = {(found.kind, found.refs[0]) for found in check_side(side)}
+    assert found == {('overlap', 'odd'), ('crossing', 'edge')}
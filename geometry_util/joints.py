@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+"""Finger-joint mating checks between adjacent sides of a box.
+
+Each edge is reduced to its tab intervals: the stretches (measured along the
+edge from its left bounding box point, before rotation) where the side's real
+outline reaches the outer bounding box.  Two edges that meet when the box is
+folded must be exact complements between their corners, and must not both
+claim the same corner.
+
+Sides are traversed counter clockwise, so two sides sharing a fold traverse
+it in opposite directions and one profile is reversed before comparing.
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+from typing import NamedTuple
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913
+
+# Pairs of (side name, face name) that meet when the box is folded.  Side
+# names follow Box.sides().
+MATING_EDGES = [
+    (("bottom", "north"), ("upper", "south")),
+    (("bottom", "south"), ("lower", "north")),
+    (("bottom", "east"), ("right", "west")),
+    (("bottom", "west"), ("left", "east")),
+    (("top", "west"), ("right", "east")),
+    (("top", "north"), ("upper", "north")),
+    (("top", "south"), ("lower", "south")),
+    (("top", "east"), ("left", "west")),
+    (("upper", "east"), ("right", "north")),
+    (("upper", "west"), ("left", "north")),
+    (("lower", "east"), ("right", "south")),
+    (("lower", "west"), ("left", "south")),
+]
+
+JointMismatch = NamedTuple('JointMismatch', [("edge_a", str), ("edge_b", str),
+                                             ("kind", str),
+                                             ("interval", tuple)])
+JointMismatch.__doc__ = """A place where two mating edges do not interlock.
+Args:
+    edge_a: first edge, as "side.face"
+    edge_b: second edge, as "side.face"
+    kind: 'length' (edges differ in length), 'overlap' (both edges have a
+        tab) or 'gap' (neither edge has a tab between the corners)
+    interval: (start, end) along edge_a's profile
+
+"""
+
+
+def edge_length(edge) -> float:
+    """Returns the length of an edge between its bounding box points."""
+    return (2 * edge.notch_height_other.dist +
+            (2 * max(edge.notch_count, 0) + 1) * edge.notch_width.dist)
+
+
+def _merge(intervals, tolerance):
+    """Sorts intervals and merges those that touch."""
+    merged = []
+    for (lo, hi) in sorted(intervals):
+        if merged and lo <= merged[-1][1] + tolerance:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return [tuple(interval) for interval in merged]
+
+
+def _intersect(first, second, tolerance):
+    """Intersects two sorted, merged interval lists in a single pass."""
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        lo = max(first[i][0], second[j][0])
+        hi = min(first[i][1], second[j][1])
+        if hi - lo > tolerance:
+            result.append((lo, hi))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _complement(intervals, lo, hi, tolerance):
+    """Returns the parts of [lo, hi] not covered by sorted intervals."""
+    result = []
+    cursor = lo
+    for (start, end) in intervals:
+        if start - cursor > tolerance:
+            result.append((cursor, min(start, hi)))
+        cursor = max(cursor, end)
+    if hi - cursor > tolerance:
+        result.append((cursor, hi))
+    return result
+
+
+def tab_intervals(edge, tolerance=1e-6):
+    """Extracts an edge's tab intervals from its lines.
+
+    Args:
+        edge (Edge): edge to profile
+        tolerance (float, optional): distance under which values are equal
+
+    Returns:
+        sorted list of (start, end) intervals along the edge
+
+    """
+    tabs = []
+    for (x0, y0, x1, y1, is_construction) in edge.canonical_lines():
+        if (not is_construction and abs(y0) <= tolerance and
+                abs(y1) <= tolerance and abs(x1 - x0) > tolerance):
+            tabs.append((min(x0, x1), max(x0, x1)))
+    return _merge(tabs, tolerance)
+
+
+def verify_edges(edge_a, edge_b, names=("a", "b"), tolerance=1e-6):
+    """Checks that two mating edges interlock.
+
+    Args:
+        edge_a (Edge): first edge
+        edge_b (Edge): edge that meets edge_a when the box is folded
+        names (tuple, optional): labels used in the report
+        tolerance (float, optional): distance under which values are equal
+
+    Returns:
+        list of JointMismatch records (empty if the edges interlock)
+
+    """
+    length = edge_length(edge_a)
+    if abs(length - edge_length(edge_b)) > tolerance:
+        return [JointMismatch(names[0], names[1], 'length',
+                              (length, edge_length(edge_b)))]
+
+    tabs_a = tab_intervals(edge_a, tolerance)
+    tabs_b = _merge([(length - hi, length - lo)
+                     for (lo, hi) in tab_intervals(edge_b, tolerance)],
+                    tolerance)
+
+    mismatches = [
+        JointMismatch(names[0], names[1], 'overlap', interval)
+        for interval in _intersect(tabs_a, tabs_b, tolerance)
+    ]
+    # Corners may be left empty for the third side meeting there.
+    corner = max(edge_a.notch_height_other.dist,
+                 edge_b.notch_height_other.dist)
+    either = _merge(tabs_a + tabs_b, tolerance)
+    mismatches.extend(
+        JointMismatch(names[0], names[1], 'gap', interval)
+        for interval in _complement(either, corner, length - corner,
+                                    tolerance))
+    return mismatches
+
+
+def verify_box(box, tolerance=1e-6):
+    """Checks that all twelve joints of a box interlock.
+
+    Args:
+        box (Box): box to check
+        tolerance (float, optional): distance under which values are equal
+
+    Returns:
+        list of JointMismatch records (empty if the box is sound)
+
+    """
+    sides = box.sides()
+    mismatches = []
+    for ((side_a, face_a), (side_b, face_b)) in MATING_EDGES:
+        edge_a = getattr(sides[side_a], face_a + "_face")
+        edge_b = getattr(sides[side_b], face_b + "_face")
+        names = ("{}.{}".format(side_a, face_a),
+                 "{}.{}".format(side_b, face_b))
+        mismatches.extend(verify_edges(edge_a, edge_b, names, tolerance))
+    return mismatches
@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+"""Tests finger-joint mating checks on generated boxes.
+"""
+from geometry_util.box import Box, Side
+from geometry_util.joints import verify_box, verify_edges
+
+
+def test_generated_boxes_interlock():
+    for (width, height, depth, thickness) in [(100, 50, 65, 3),
+                                              (120, 100, 220, 4.7625),
+                                              (30, 30, 30, 3)]:
+        box = Box(width, height, depth, thickness, 2)
+        assert verify_box(box) == []
+
+
+def test_mismatched_side_is_reported():
+    box = Box(100, 50, 65, 3, 2)
+    # Same outline size, but tabs where the bottom side also has tabs
+    wrong_upper = Side(box.upper_side.side_info._replace(is_tall=False))
+    found = verify_edges(box.bottom_side.north_face, wrong_upper.south_face)
+    assert found
+    assert {mismatch.kind for mismatch in found} <= {'overlap', 'gap'}
+
+
+def test_length_mismatch():
+    box = Box(100, 50, 65, 3, 2)
+    found = verify_edges(box.bottom_side.north_face, box.right_side.north_face)
+    assert [mismatch.kind for mismatch in found] == ['length']
@@ -0,0 +1,330 @@
+#!/usr/bin/python3
+"""Live SVG previews of a box specification.
+
+Watches a specification file (such as projects/psu_4mm_acrylic/spec.py),
+runs it again whenever it is saved, and serves the resulting box as an SVG
+page that refreshes itself:
+
+``python3 -m geometry_util.preview projects/psu_4mm_acrylic/spec.py``
+
+then open http://localhost:8000/.
+
+Each side is drawn as an SVG fragment relative to its southwest corner and
+cached by Side.instance_key, so after an edit only the sides whose shape or
+cutouts changed have their lines created and drawn again; moved sides reuse
+their fragment at the new position.  Specifications are run in this process,
+so modules they import (and the edge and side template caches) stay loaded
+between runs.
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+import argparse
+import http.server
+import os
+import runpy
+import sys
+import threading
+import time
+import traceback
+
+from .raster import box_bounds
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0902
+
+STYLE = ("fill:none;stroke:black;stroke-width:1;"
+         "vector-effect:non-scaling-stroke")
+CONSTRUCTION_STYLE = ("fill:none;stroke:#9ac;stroke-width:1;"
+                      "stroke-dasharray:4 2;vector-effect:non-scaling-stroke")
+CUTOUT_STYLE = ("fill:#ddd;stroke:#666;stroke-width:1;"
+                "vector-effect:non-scaling-stroke")
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>body {{margin: 0; font-family: sans-serif}}
+#error {{color: #b00; white-space: pre-wrap; margin: 8px}}
+#preview svg {{width: 100vw; height: 95vh}}</style></head>
+<body><div id="error"></div><div id="preview"></div>
+<script>
+var version = null;
+function poll() {{
+  fetch("/version").then(function (response) {{
+    return response.text();
+  }}).then(function (text) {{
+    if (text === version) {{ return null; }}
+    version = text;
+    return Promise.all([fetch("/preview.svg").then(r => r.text()),
+                        fetch("/error").then(r => r.text())]);
+  }}).then(function (parts) {{
+    if (parts) {{
+      document.getElementById("preview").innerHTML = parts[0];
+      document.getElementById("error").textContent = parts[1];
+    }}
+  }}).catch(function () {{}}).then(function () {{
+    setTimeout(poll, {interval});
+  }});
+}}
+poll();
+</script></body></html>
+"""
+
+
+def _number(value):
+    return "{:.6g}".format(value)
+
+
+def side_svg(side, include_construction=False):
+    """Returns SVG elements drawing a side relative to its southwest corner.
+
+    Cutouts are drawn the way SketchContainer creates them in Fusion 360
+    (circles use the horizontal distance between the corners as diameter).
+    """
+    sw = side.side_info.bb_sw_corner
+    paths = {False: [], True: []}
+    for line in side.iter_lines(include_construction):
+        paths[line.is_construction].append("M{} {}L{} {}".format(
+            _number(line.source.x - sw.x), _number(line.source.y - sw.y),
+            _number(line.dest.x - sw.x), _number(line.dest.y - sw.y)))
+    elements = [
+        '<path style="{}" d="{}"/>'.format(style, "".join(paths[key]))
+        for (key, style) in ((False, STYLE), (True, CONSTRUCTION_STYLE))
+        if paths[key]
+    ]
+    for (kind, _name, x0, y0, x1, y1) in side.iter_cutout_coords():
+        (x0, y0, x1, y1) = (x0 - sw.x, y0 - sw.y, x1 - sw.x, y1 - sw.y)
+        if kind == 'circle':
+            elements.append(
+                '<circle style="{}" cx="{}" cy="{}" r="{}"/>'.format(
+                    CUTOUT_STYLE, _number((x0 + x1) / 2.0),
+                    _number((y0 + y1) / 2.0), _number(abs(x1 - x0) / 2.0)))
+        else:
+            elements.append(
+                '<rect style="{}" x="{}" y="{}" width="{}" height="{}"/>'
+                .format(CUTOUT_STYLE, _number(min(x0, x1)), _number(
+                    min(y0, y1)), _number(abs(x1 - x0)), _number(
+                        abs(y1 - y0))))
+    return "".join(elements)
+
+
+class SvgCache(object):
+    """Side SVG fragments keyed by Side.instance_key.
+
+    Attributes:
+        hits: number of fragments reused
+        misses: number of fragments drawn
+
+    """
+
+    CACHE_SIZE = 256
+
+    def __init__(self):
+        self.fragments = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fragment(self, side, include_construction=False):
+        """Returns side_svg of a side, drawing it only if not cached."""
+        key = (side.instance_key(), include_construction)
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            self.misses += 1
+            if len(self.fragments) >= SvgCache.CACHE_SIZE:
+                self.fragments.clear()
+            fragment = side_svg(side, include_construction)
+            self.fragments[key] = fragment
+        else:
+            self.hits += 1
+        return fragment
+
+
+def box_svg(box, cache=None, include_construction=False, margin=5.0):
+    """Returns an SVG document drawing all sides of a box.
+
+    Args:
+        box (Box): box to draw
+        cache (SvgCache, optional): cache of side fragments to use
+        include_construction (bool, optional): also draw construction lines
+        margin (float, optional): blank border in box units
+
+    """
+    cache = cache or SvgCache()
+    (min_x, min_y, max_x, max_y) = box_bounds(box)
+    parts = [
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="{} {} {} {}">'
+        .format(
+            _number(min_x - margin), _number(-max_y - margin),
+            _number(max_x - min_x + 2 * margin),
+            _number(max_y - min_y + 2 * margin)),
+        # Flip y so that it points up, as in the box's coordinates
+        '<g transform="scale(1,-1)">'
+    ]
+    for (name, side) in box.sides().items():
+        sw = side.side_info.bb_sw_corner
+        parts.append('<g id="{}" transform="translate({} {})">{}</g>'.format(
+            name, _number(sw.x), _number(sw.y),
+            cache.fragment(side, include_construction)))
+    parts.append("</g></svg>")
+    return "".join(parts)
+
+
+class PreviewWatcher(object):
+    """Runs a specification file again whenever it changes.
+
+    Args:
+        spec (str): Python file defining the function
+        function (str, optional): name of the function returning a Box
+        include_construction (bool, optional): also draw construction lines
+
+    Attributes:
+        svg (str): SVG of the last box built without errors
+        error (str): traceback of the last run, or '' if it succeeded
+        version (int): number of runs so far
+        seconds (float): time taken by the last run and drawing
+
+    """
+
+    def __init__(self, spec, function="specify_box",
+                 include_construction=False):
+        self.spec = os.path.abspath(spec)
+        self.function = function
+        self.include_construction = include_construction
+        self.cache = SvgCache()
+        self.lock = threading.Lock()
+        self.stamp = None
+        self.svg = ""
+        self.error = ""
+        self.version = 0
+        self.seconds = 0.0
+
+    def poll(self):
+        """Rebuilds the preview if the file changed.
+
+        Returns:
+            whether the file was run again
+        """
+        try:
+            status = os.stat(self.spec)
+            stamp = (status.st_mtime_ns, status.st_size)
+        except OSError:
+            stamp = None
+        if stamp == self.stamp:
+            return False
+        self.stamp = stamp
+        start = time.perf_counter()
+        try:
+            box = runpy.run_path(self.spec)[self.function]()
+            svg = box_svg(box, self.cache, self.include_construction)
+            error = ""
+        except Exception:  # pylint: disable=broad-except
+            # Keep showing the last good preview alongside the error
+            svg = self.svg
+            error = traceback.format_exc()
+        with self.lock:
+            self.svg = svg
+            self.error = error
+            self.version += 1
+            self.seconds = time.perf_counter() - start
+        return True
+
+    def watch(self, interval=0.05, stop=None, report=None):
+        """Polls until stop (a threading.Event) is set.
+
+        Args:
+            interval (float, optional): seconds between checks
+            stop (threading.Event, optional): ends the loop when set
+            report (callable, optional): called with the watcher after each
+                run
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            if self.poll() and report:
+                report(self)
+            stop.wait(interval)
+
+
+def make_handler(watcher, interval=100):
+    """Returns a request handler class serving a watcher's preview.
+
+    Args:
+        watcher (PreviewWatcher): watcher to serve
+        interval (int, optional): milliseconds between page checks for a new
+            version
+    """
+
+    class PreviewHandler(http.server.BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            with watcher.lock:
+                contents = {
+                    "/": ("text/html",
+                          PAGE.format(
+                              title=os.path.basename(watcher.spec),
+                              interval=interval)),
+                    "/preview.svg": ("image/svg+xml", watcher.svg),
+                    "/version": ("text/plain", str(watcher.version)),
+                    "/error": ("text/plain", watcher.error),
+                }.get(self.path)
+            if contents is None:
+                self.send_error(404)
+                return
+            body = contents[1].encode()
+            self.send_response(200)
+            self.send_header("Content-Type", contents[0] + "; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+    return PreviewHandler
+
+
+def _report(watcher):
+    if watcher.error:
+        print(watcher.error, file=sys.stderr)
+    else:
+        print("Rebuilt in {:.1f} ms ({} sides drawn, {} reused)".format(
+            watcher.seconds * 1000, watcher.cache.misses, watcher.cache.hits))
+    watcher.cache.hits = 0
+    watcher.cache.misses = 0
+
+
+def main(argv=None):
+    """Serves a live preview of a specification file."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("spec", help="Python file defining the function")
+    parser.add_argument("--function", default="specify_box")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--construction", action="store_true",
+                        help="draw construction lines")
+    parser.add_argument("--output", help="write the SVG to a file and exit")
+    args = parser.parse_args(argv)
+
+    watcher = PreviewWatcher(args.spec, args.function, args.construction)
+    if args.output:
+        watcher.poll()
+        if watcher.error:
+            sys.exit(watcher.error)
+        with open(args.output, "w") as stream:
+            stream.write(watcher.svg)
+        return
+
+    server = http.server.ThreadingHTTPServer(("localhost", args.port),
+                                             make_handler(watcher))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print("Serving http://localhost:{}/ (Ctrl-C to stop)".format(
+        server.server_address[1]))
+    try:
+        watcher.watch(report=_report)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
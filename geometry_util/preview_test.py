@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""Tests SVG previews and the specification watcher.
+"""
+import http.server
+import os
+import threading
+import urllib.request
+
+from geometry_util.box import Box, Point
+from geometry_util.preview import (PreviewWatcher, SvgCache, box_svg,
+                                   make_handler)
+
+SPEC = """
+from geometry_util.box import Box, Point
+
+
+def specify_box():
+    box = Box({width}, 50, 65, 3, 2)
+    box.upper_side.add_cutout('circle', Point(5, 5), Point(11, 11))
+    return box
+"""
+
+
+def test_box_svg_reuses_unchanged_sides():
+    cache = SvgCache()
+    svg = box_svg(Box(100, 50, 65, 3, 2), cache)
+    assert svg.startswith("<svg") and svg.count('<g id=') == 6
+    # Opposite sides match
+    assert (cache.misses, cache.hits) == (3, 3)
+    box = Box(100, 50, 65, 3, 2)
+    box.upper_side.add_cutout('rect', Point(5, 5), Point(20, 15))
+    svg = box_svg(box, cache)
+    assert (cache.misses, cache.hits) == (4, 8)
+    assert svg.count("<rect") == 1
+
+
+def test_watcher_reruns_changed_spec(tmp_path):
+    spec = os.path.join(str(tmp_path), "spec.py")
+    with open(spec, "w") as stream:
+        stream.write(SPEC.format(width=100))
+    watcher = PreviewWatcher(spec)
+    assert watcher.poll() and not watcher.error
+    assert not watcher.poll()
+    first = watcher.svg
+    assert "<circle" in first
+
+    with open(spec, "w") as stream:
+        stream.write(SPEC.format(width=120.5))
+    assert watcher.poll() and watcher.svg != first
+    assert watcher.version == 2
+
+    with open(spec, "w") as stream:
+        stream.write(SPEC.format(width="oops"))
+    assert watcher.poll()
+    assert "NameError" in watcher.error
+    assert watcher.svg  # the last good preview is kept
+
+    server = http.server.ThreadingHTTPServer(("localhost", 0),
+                                             make_handler(watcher))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = "http://localhost:{}/".format(server.server_address[1])
+        with urllib.request.urlopen(url + "version") as response:
+            assert response.read() == b"3"
+        with urllib.request.urlopen(url + "preview.svg") as response:
+            assert response.read().decode() == watcher.svg
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,303 @@
+#!/usr/bin/python3
+"""Opt-in allocation and memory profiling of box geometry builds.
+
+A box is built one phase at a time (laying out sides, drawing edge
+templates, placing and rotating lines, adding cutouts).  Each phase is
+wrapped in tracemalloc snapshots and a count of live geometry objects, so
+the report shows what each phase allocates and which source lines and
+classes are responsible.
+
+Profiling is slow and is never done by the normal build path.  Run this
+module directly for a text summary of a sample box, or pass --json to write
+the full report.
+
+measure_imports times the imports of a Fusion 360 script start in fresh
+interpreters, with the Fusion 360 API replaced by stubs, and lists the
+modules they load, so that startup regressions can be caught (see
+--imports).
+
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from typing import NamedTuple
+
+from .box import Box, EdgeTemplate, SideTemplate
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913,R0914
+
+# Modules whose classes are counted.
+COUNTED_MODULES = ("geometry", "box")
+PHASES = ("sides", "edges", "rotation", "cutouts")
+
+# What a Fusion 360 script start (projects/psu_4mm_acrylic) imports, apart
+# from the Fusion 360 API
+SCRIPT_IMPORTS = ("fusion360_util", "fusion360_util.history",
+                  "fusion360_util.tabbed_box", "fusion360_util.handle_index",
+                  "geometry_util.disk_cache", "geometry_util.intersect",
+                  "geometry_util.cutout_table",
+                  "projects.psu_4mm_acrylic.spec")
+# Fusion 360 API modules replaced by stubs when measuring imports
+API_STUBS = ("adsk", "adsk.core", "adsk.fusion")
+# Modules that script start must not load (they are only needed by options
+# or tools that import them on first use)
+OPTIONAL_MODULES = ("geometry_util.dxf", "geometry_util.sharding",
+                    "geometry_util.preview", "geometry_util.raster",
+                    "geometry_util.estimate", "geometry_util.profiling",
+                    "argparse", "tempfile", "http.server", "numpy",
+                    "matplotlib")
+# Rough seconds expected for SCRIPT_IMPORTS, shown by --imports (wall times
+# vary too much between machines to be checked by tests)
+IMPORT_BUDGET = 0.25
+
+ImportReport = NamedTuple('ImportReport', [("seconds", float),
+                                           ("modules", list)])
+ImportReport.__doc__ = """Cost of importing some modules.
+Args:
+    seconds: best wall time of the imports over the runs
+    modules: names of all modules the imports loaded
+
+"""
+
+_IMPORT_CODE = """
+import sys, time, types
+
+def stub_class(name):
+    return type(name, (object, ), {})
+
+for name in sys.argv[1].split(","):
+    if name:
+        stub = types.ModuleType(name)
+        stub.__getattr__ = stub_class
+        sys.modules[name] = stub
+before = set(sys.modules)
+start = time.perf_counter()
+for name in sys.argv[2:]:
+    __import__(name)
+print(time.perf_counter() - start)
+print(" ".join(sorted(set(sys.modules) - before)))
+"""
+
+
+def count_objects():
+    """Counts live instances of geometry_util classes by class name."""
+    return Counter(
+        type(obj).__name__ for obj in gc.get_objects()
+        if type(obj).__module__.rsplit(".", 1)[-1] in COUNTED_MODULES)
+
+
+def _measure(name, action, top):
+    """Runs action and returns (result, phase report)."""
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]
+    gc.collect()
+    objects_before = count_objects()
+    before = tracemalloc.take_snapshot().filter_traces(ignore)
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    (current_before, _peak) = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    result = action()
+
+    seconds = time.perf_counter() - start
+    (current_after, peak) = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot().filter_traces(ignore)
+    objects = count_objects()
+    objects.subtract(objects_before)
+
+    top_allocations = [{
+        "location": "{}:{}".format(stat.traceback[0].filename,
+                                   stat.traceback[0].lineno),
+        "size_bytes": stat.size_diff,
+        "count": stat.count_diff,
+    } for stat in after.compare_to(before, "lineno")[:top]
+                       if stat.size_diff > 0]
+    return result, {
+        "name": name,
+        "seconds": seconds,
+        "allocated_bytes": current_after - current_before,
+        "peak_bytes": peak - current_before,
+        "objects": {key: value
+                    for (key, value) in sorted(objects.items()) if value},
+        "top_allocations": top_allocations,
+    }
+
+
+def _edges(box):
+    return [
+        edge for side in box.sides().values()
+        for edge in (side.south_face, side.east_face, side.north_face,
+                     side.west_face)
+    ]
+
+
+def profile_box(width,
+                height,
+                depth,
+                thickness,
+                spacing,
+                cutouts=None,
+                cold=True,
+                top=5,
+                **kwargs):
+    """Builds a box phase by phase and reports allocations per phase.
+
+    Args:
+        width, height, depth, thickness, spacing: as for Box
+        cutouts (callable, optional): called with the box to add cutouts
+        cold (bool, optional): clear the edge and side template caches
+            first, so template drawing is included
+        top (int, optional): allocation sites listed per phase
+        kwargs: other Box arguments
+
+    Returns:
+        dict report (JSON-serializable), see format_summary
+
+    """
+    if cold:
+        EdgeTemplate._cache.clear()
+        SideTemplate._cache.clear()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        phases = []
+
+        def sides():
+            built = Box(width, height, depth, thickness, spacing, **kwargs)
+            built.sides()
+            return built
+
+        (box, report) = _measure("sides", sides, top)
+        phases.append(report)
+        # Edges draw their templates and place their lines only when first
+        # used, so each phase touches exactly the part it measures.
+        phases.append(
+            _measure("edges", lambda: [
+                edge.template for edge in _edges(box)
+            ], top)[1])
+        phases.append(
+            _measure("rotation", lambda: [
+                edge.lines for edge in _edges(box)
+            ], top)[1])
+        phases.append(
+            _measure("cutouts", lambda: cutouts(box)
+                     if cutouts else None, top)[1])
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    totals = Counter()
+    for phase in phases:
+        totals.update(phase["objects"])
+    return {
+        "box": {
+            "width": width,
+            "height": height,
+            "depth": depth,
+            "thickness": thickness,
+            "spacing": spacing,
+        },
+        "phases": phases,
+        "total_seconds": sum(phase["seconds"] for phase in phases),
+        "total_allocated_bytes": sum(phase["allocated_bytes"]
+                                     for phase in phases),
+        "total_objects": dict(sorted(totals.items())),
+    }
+
+
+def measure_imports(modules=SCRIPT_IMPORTS, repeat=5,
+                    stubs=API_STUBS) -> ImportReport:
+    """Imports modules in fresh interpreters started from the repo root.
+
+    Args:
+        modules (tuple, optional): names of the modules to import
+        repeat (int, optional): number of interpreters to time
+        stubs (tuple, optional): names of modules to replace by stubs whose
+            attributes are empty classes (not counted as loaded)
+
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs = [
+        subprocess.run([sys.executable, "-c", _IMPORT_CODE,
+                        ",".join(stubs)] + list(modules),
+                       cwd=root, check=True, stdout=subprocess.PIPE,
+                       universal_newlines=True).stdout.split("\n")
+        for _ in range(repeat)
+    ]
+    return ImportReport(
+        min(float(run[0]) for run in runs), runs[0][1].split())
+
+
+def report_json(report, path=None):
+    """Returns the report as JSON, writing it to path if given."""
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path:
+        with open(path, "w") as json_file:
+            json_file.write(text)
+    return text
+
+
+def format_summary(report):
+    """Returns a short text summary of a report."""
+    lines = ["{:<10}{:>10}{:>12}{:>12}  {}".format("phase", "ms", "net KiB",
+                                                   "peak KiB", "objects")]
+    for phase in report["phases"]:
+        objects = ", ".join("{}={}".format(name, count)
+                            for (name, count) in phase["objects"].items())
+        lines.append("{:<10}{:>10.2f}{:>12.1f}{:>12.1f}  {}".format(
+            phase["name"], phase["seconds"] * 1000,
+            phase["allocated_bytes"] / 1024.0, phase["peak_bytes"] / 1024.0,
+            objects))
+        if phase["top_allocations"]:
+            site = phase["top_allocations"][0]
+            lines.append("{:<10}top: {} ({:.1f} KiB)".format(
+                "", site["location"], site["size_bytes"] / 1024.0))
+    lines.append("{:<10}{:>10.2f}{:>12.1f}".format(
+        "total", report["total_seconds"] * 1000,
+        report["total_allocated_bytes"] / 1024.0))
+    return "\n".join(lines)
+
+
+def main():
+    """Profiles a sample (or given) box and prints a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "dims",
+        nargs="*",
+        type=float,
+        default=[100, 50, 65, 3, 2],
+        help="width height depth thickness spacing")
+    parser.add_argument("--json", help="path to write the full report")
+    parser.add_argument(
+        "--imports",
+        action="store_true",
+        help="time the imports of a Fusion 360 script start instead")
+    args = parser.parse_args()
+    if args.imports:
+        report = measure_imports()
+        print("{:.1f} ms (budget {:.0f} ms), {} modules loaded".format(
+            report.seconds * 1000, IMPORT_BUDGET * 1000,
+            len(report.modules)))
+        optional = sorted(set(report.modules) & set(OPTIONAL_MODULES))
+        if optional:
+            print("optional modules loaded: " + ", ".join(optional))
+        return
+    report = profile_box(*args.dims)
+    if args.json:
+        report_json(report, args.json)
+    print(format_summary(report))
+
+
+if __name__ == "__main__":
+    main()
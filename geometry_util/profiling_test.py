@@ -0,0 +1,24 @@
+#!/usr/bin/python3
+"""Tests the opt-in build profiler.
+"""
+import json
+
+from geometry_util.geometry import Point
+from geometry_util.profiling import (PHASES, format_summary, profile_box,
+                                     report_json)
+
+
+def test_profile_reports_each_phase():
+    def cutouts(box):
+        box.bottom_side.add_cutout('rect', Point(5, 5), Point(10, 10))
+
+    report = profile_box(100, 50, 65, 3, 2, cutouts=cutouts)
+    assert [phase["name"] for phase in report["phases"]] == list(PHASES)
+    by_name = {phase["name"]: phase for phase in report["phases"]}
+    assert by_name["sides"]["objects"]["Side"] == 6
+    assert by_name["edges"]["objects"]["Edge"] == 24
+    assert by_name["edges"]["objects"]["EdgeTemplate"] > 0
+    assert by_name["rotation"]["objects"]["Line"] > 0
+    assert "EdgeTemplate" not in by_name["rotation"]["objects"]
+    assert json.loads(report_json(report))["phases"]
+    assert "rotation" in format_summary(report)
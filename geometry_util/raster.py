@@ -0,0 +1,241 @@
+#!/usr/bin/python3
+"""Headless raster previews of boxes.
+
+Lines and cutouts are drawn straight into an 8-bit grayscale buffer, which
+can be written out as a PNG.  Only the standard library is used, so previews
+work anywhere geometry_util does (including Fusion 360's interpreter) and are
+fast enough for bulk previews of parameter sweeps.
+
+These classes do not depend on the Fusion 360 API.
+
+"""
+
+import struct
+import zlib
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913,R0902
+
+BACKGROUND = 255
+LINE = 0
+CUTOUT = 96
+
+
+class Raster(object):
+    """A grayscale image buffer mapped onto a rectangle of the x-y plane.
+
+    The rectangle is scaled uniformly to fit within the image (less a
+    margin) and centered, with y pointing up as in the geometry.
+
+    Args:
+        bounds (tuple): (min_x, min_y, max_x, max_y) to fit in the image
+        width (int, optional): image width in pixels
+        height (int, optional): image height in pixels.  Defaults to the
+            height that preserves the aspect ratio of bounds.
+        margin (int, optional): blank border in pixels
+
+    Attributes:
+        pixels (bytearray): row-major pixel values, top row first
+        scale (float): pixels per geometry unit
+
+    """
+
+    def __init__(self, bounds, width=800, height=None, margin=10):
+        (min_x, min_y, max_x, max_y) = bounds
+        span_x = max(max_x - min_x, 1e-9)
+        span_y = max(max_y - min_y, 1e-9)
+        if height is None:
+            height = int(round((width - 2 * margin) * span_y / span_x)) + \
+                2 * margin
+        self.width = max(int(width), 1)
+        self.height = max(int(height), 1)
+        self.scale = min((self.width - 2 * margin) / span_x,
+                         (self.height - 2 * margin) / span_y)
+        self.offset_x = (self.width - span_x * self.scale) / 2.0 - \
+            min_x * self.scale
+        self.offset_y = (self.height - span_y * self.scale) / 2.0 + \
+            max_y * self.scale
+        self.pixels = bytearray([BACKGROUND]) * (self.width * self.height)
+
+    def to_pixel(self, x, y):
+        """Returns the (column, row) of a point."""
+        return (int(round(self.offset_x + x * self.scale)),
+                int(round(self.offset_y - y * self.scale)))
+
+    def _clip(self, x0, y0, x1, y1):
+        """Clips a line to the image with the Liang-Barsky algorithm.
+
+        Returns:
+            ((c0, r0), (c1, r1)) pixels of the visible part, or None if the
+            line misses the image
+        """
+        (px0, py0) = (self.offset_x + x0 * self.scale,
+                      self.offset_y - y0 * self.scale)
+        (dx, dy) = ((x1 - x0) * self.scale, (y0 - y1) * self.scale)
+        # Keep whatever rounds to a pixel inside the image
+        (low, high_x, high_y) = (-0.49, self.width - 0.51,
+                                 self.height - 0.51)
+        (t0, t1) = (0.0, 1.0)
+        for (p, q) in ((-dx, px0 - low), (dx, high_x - px0),
+                       (-dy, py0 - low), (dy, high_y - py0)):
+            if p == 0:
+                if q < 0:
+                    return None
+                continue
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+            if t0 > t1:
+                return None
+        return ((int(round(px0 + t0 * dx)), int(round(py0 + t0 * dy))),
+                (int(round(px0 + t1 * dx)), int(round(py0 + t1 * dy))))
+
+    def draw_line(self, x0, y0, x1, y1, value=LINE):
+        """Draws the part of a line between two points that is in the image.
+
+        Horizontal and vertical lines (all box lines) are filled with a
+        single slice assignment.  Other lines use Bresenham's algorithm.
+        """
+        clipped = self._clip(x0, y0, x1, y1)
+        if clipped is None:
+            return
+        ((c0, r0), (c1, r1)) = clipped
+        width = self.width
+        if r0 == r1:
+            (c0, c1) = sorted((c0, c1))
+            start = r0 * width
+            self.pixels[start + c0:start + c1 + 1] = bytes([value]) * (
+                c1 - c0 + 1)
+        elif c0 == c1:
+            (r0, r1) = sorted((r0, r1))
+            self.pixels[r0 * width + c0:r1 * width + c0 + 1:width] = bytes(
+                [value]) * (r1 - r0 + 1)
+        else:
+            d_col, d_row = abs(c1 - c0), -abs(r1 - r0)
+            s_col = 1 if c0 < c1 else -1
+            s_row = 1 if r0 < r1 else -1
+            err = d_col + d_row
+            while True:
+                self.pixels[r0 * width + c0] = value
+                if c0 == c1 and r0 == r1:
+                    break
+                err2 = 2 * err
+                if err2 >= d_row:
+                    err += d_row
+                    c0 += s_col
+                if err2 <= d_col:
+                    err += d_col
+                    r0 += s_row
+
+    def draw_rect(self, x0, y0, x1, y1, value=CUTOUT):
+        """Draws the outline of an axis-aligned rectangle."""
+        self.draw_line(x0, y0, x1, y0, value)
+        self.draw_line(x1, y0, x1, y1, value)
+        self.draw_line(x1, y1, x0, y1, value)
+        self.draw_line(x0, y1, x0, y0, value)
+
+    def draw_circle(self, cx, cy, radius, value=CUTOUT):
+        """Draws a circle outline with the midpoint circle algorithm."""
+        (col, row) = self.to_pixel(cx, cy)
+        rad = int(round(radius * self.scale))
+        x, y, err = rad, 0, 1 - rad
+        width, height, pixels = self.width, self.height, self.pixels
+        while x >= y:
+            for (d_col, d_row) in ((x, y), (y, x), (-y, x), (-x, y),
+                                   (-x, -y), (-y, -x), (y, -x), (x, -y)):
+                c, r = col + d_col, row + d_row
+                if 0 <= c < width and 0 <= r < height:
+                    pixels[r * width + c] = value
+            y += 1
+            if err < 0:
+                err += 2 * y + 1
+            else:
+                x -= 1
+                err += 2 * (y - x) + 1
+
+    def to_png(self):
+        """Returns the image encoded as a grayscale PNG."""
+        width = self.width
+        raw = bytearray()
+        for row in range(self.height):
+            raw.append(0)  # No filter
+            raw += self.pixels[row * width:(row + 1) * width]
+
+        def chunk(kind, data):
+            body = kind + data
+            return (struct.pack(">I", len(data)) + body +
+                    struct.pack(">I", zlib.crc32(body) & 0xffffffff))
+
+        header = struct.pack(">IIBBBBB", width, self.height, 8, 0, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+                chunk(b"IDAT", zlib.compress(bytes(raw), 6)) +
+                chunk(b"IEND", b""))
+
+    def save_png(self, path):
+        with open(path, "wb") as png_file:
+            png_file.write(self.to_png())
+
+
+def box_bounds(box):
+    """Returns (min_x, min_y, max_x, max_y) enclosing all sides of a box,
+    including cutouts that extend past a side."""
+    corners = [
+        point.coords() for side in box.sides().values()
+        for point in side.bounding_box.values()
+    ]
+    for side in box.sides().values():
+        for (kind, _name, x0, y0, x1, y1) in side.iter_cutout_coords():
+            if kind == 'circle':
+                # Drawn with the horizontal distance as diameter
+                (cx, cy) = ((x0 + x1) / 2.0, (y0 + y1) / 2.0)
+                radius = abs(x1 - x0) / 2.0
+                corners.extend(((cx - radius, cy - radius),
+                                (cx + radius, cy + radius)))
+            else:
+                corners.extend(((x0, y0), (x1, y1)))
+    xs = [x for (x, _y) in corners]
+    ys = [y for (_x, y) in corners]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def draw_cutout(raster, kind, x0, y0, x1, y1):
+    """Draws a cutout the way SketchContainer creates it in Fusion 360.
+
+    Circles use the horizontal distance between the corners as diameter.
+    """
+    if kind == 'circle':
+        raster.draw_circle((x0 + x1) / 2.0, (y0 + y1) / 2.0,
+                           abs(x1 - x0) / 2.0)
+    elif kind == 'rect':
+        raster.draw_rect(x0, y0, x1, y1)
+
+
+def render_box(box, width=800, height=None, margin=10,
+               include_construction=False):
+    """Rasterizes a box's lines and cutouts, fitted to the image.
+
+    Args:
+        box (Box): box to draw
+        width (int, optional): image width in pixels
+        height (int, optional): image height in pixels (defaults to fit)
+        margin (int, optional): blank border in pixels
+        include_construction (bool, optional): also draw construction lines
+
+    Returns:
+        Raster containing the drawing
+
+    """
+    raster = Raster(box_bounds(box), width, height, margin)
+    for side in box.sides().values():
+        for line in side.iter_lines(include_construction):
+            raster.draw_line(line.source.x, line.source.y, line.dest.x,
+                             line.dest.y)
+        for (kind, _name, x0, y0, x1, y1) in side.iter_cutout_coords():
+            draw_cutout(raster, kind, x0, y0, x1, y1)
+    return raster
+
+
+def save_box_png(box, path, **kwargs):
+    """Renders a box (see render_box for options) and saves it as a PNG."""
+    render_box(box, **kwargs).save_png(path)
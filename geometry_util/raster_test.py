@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""Tests headless raster previews.
+"""
+import struct
+import zlib
+
+from geometry_util.box import Box
+from geometry_util.geometry import Point
+from geometry_util.raster import (BACKGROUND, CUTOUT, LINE, Raster, box_bounds,
+                                  render_box)
+
+
+def test_render_box_fits_and_encodes():
+    box = Box(100, 50, 65, 3, 2, bb_sw_point=Point(0, 0))
+    raster = render_box(box, width=400, margin=5)
+    assert raster.width == 400
+    assert LINE in raster.pixels
+
+    png = raster.to_png()
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    (width, height) = struct.unpack(">II", png[16:24])
+    assert (width, height) == (raster.width, raster.height)
+    # Every outline pixel column lies inside the margins
+    for row in range(raster.height):
+        line = raster.pixels[row * width:(row + 1) * width]
+        assert set(line[:4]) == {BACKGROUND}
+        assert set(line[-4:]) == {BACKGROUND}
+
+
+def test_png_round_trip():
+    raster = Raster((0, 0, 10, 10), width=20, height=20, margin=0)
+    raster.draw_line(0, 5, 10, 5)
+    png = raster.to_png()
+    idat = png.index(b"IDAT")
+    length = struct.unpack(">I", png[idat - 4:idat])[0]
+    raw = zlib.decompress(png[idat + 4:idat + 4 + length])
+    assert len(raw) == 20 * 21
+    assert raw[1:21] == bytes(raster.pixels[:20])
+
+
+def test_circle_is_drawn_as_circle():
+    raster = Raster((-10, -10, 10, 10), width=101, height=101, margin=0)
+    raster.draw_circle(0, 0, 5)
+    (col, row) = raster.to_pixel(0, 0)
+    rad = int(round(5 * raster.scale))
+    assert raster.pixels[row * raster.width + col + rad] == CUTOUT
+    assert raster.pixels[(row - rad) * raster.width + col] == CUTOUT
+    assert raster.pixels[row * raster.width + col] == BACKGROUND
+
+
+def test_lines_off_the_image_are_clipped():
+    raster = Raster((0, 0, 10, 10), width=11, height=11, margin=0)
+    # Leaves the image at the top; only the visible part is drawn
+    raster.draw_line(2, 5, 2, 30)
+    (col, row) = raster.to_pixel(2, 5)
+    column = raster.pixels[col::raster.width]
+    assert list(column) == ([LINE] * (row + 1) + [BACKGROUND] *
+                            (raster.height - row - 1))
+    # Entirely outside: nothing is smeared along the border
+    raster.draw_line(-5, -5, -5, 20)
+    raster.draw_line(20, 12, 30, 40)
+    assert raster.pixels.count(LINE) == row + 1
+    # Diagonal crossing a corner keeps its slope
+    raster.draw_line(-2, 8, 4, 14)
+    (col, row) = raster.to_pixel(0, 10)
+    assert raster.pixels[row * raster.width + col] == LINE
+
+
+def test_bounds_include_protruding_cutouts():
+    box = Box(100, 50, 65, 3, 2, bb_sw_point=Point(0, 0))
+    before = box_bounds(box)
+    box.bottom_side.add_cutout('rect', Point(-300, 5), Point(10, 10))
+    after = box_bounds(box)
+    assert after[0] < before[0]
+    raster = render_box(box, width=400)
+    assert CUTOUT in raster.pixels[:raster.width * raster.height]
@@ -0,0 +1,222 @@
+#!/usr/bin/python3
+"""Splits a side's geometry across sketches under an entity budget.
+
+Fusion 360 recomputes a sketch as a whole, and the cost grows faster than
+the number of entities in it.  A side's geometry is therefore planned as a
+list of shards, each small enough to be drawn in its own sketch.
+
+Lines are grouped into loops (connected pieces), and a loop is never split
+between shards, so every profile of the outline is closed within a single
+sketch.  Loops holding real lines come before construction-only loops, so
+the first shard always holds the outline.  Cutouts are split by recursive
+bisection of their centers along the longer axis, so each shard covers a
+compact area of the side.
+
+Entity counts are estimates of what SketchContainer creates: each line and
+each distinct line end point, four lines and four points per rectangle, and
+a circle with its center.
+
+These functions do not depend on the Fusion 360 API.
+
+"""
+
+from typing import NamedTuple
+
+# pylint: disable=too-few-public-methods,C0111,C0103,R0913
+
+CUTOUT_ENTITIES = {'rect': 8, 'circle': 2}
+
+Shard = NamedTuple('Shard', [("index", int), ("lines", list),
+                             ("cutouts", list), ("entities", int)])
+Shard.__doc__ = """Part of a side's geometry to draw in one sketch.
+Args:
+    index: position of the shard among the side's line or cutout shards
+    lines: lines to draw (whole loops only)
+    cutouts: (kind, name, corner_1, corner_2) tuples to draw
+    entities: estimated number of sketch entities
+
+"""
+
+
+def _snap(point, tolerance):
+    return (int(round(point.x / tolerance)), int(round(point.y / tolerance)))
+
+
+def line_entities(lines, tolerance=1e-6) -> int:
+    """Estimates sketch entities for lines: the lines plus distinct ends."""
+    ends = set()
+    count = 0
+    for line in lines:
+        count += 1
+        ends.add(_snap(line.source, tolerance))
+        ends.add(_snap(line.dest, tolerance))
+    return count + len(ends)
+
+
+def cutout_entities(cutout) -> int:
+    return CUTOUT_ENTITIES.get(cutout[0], 1)
+
+
+def loops(lines, tolerance=1e-6):
+    """Groups lines into connected pieces sharing end points.
+
+    Args:
+        lines: iterable of geometric lines
+        tolerance (float, optional): distance under which points are equal
+
+    Returns:
+        list of lists of lines, in order of each piece's first line
+
+    """
+    parent = {}
+
+    def find(key):
+        root = key
+        while parent[root] != root:
+            root = parent[root]
+        while parent[key] != root:
+            (parent[key], key) = (root, parent[key])
+        return root
+
+    ends = []
+    for line in lines:
+        source = _snap(line.source, tolerance)
+        dest = _snap(line.dest, tolerance)
+        parent.setdefault(source, source)
+        parent.setdefault(dest, dest)
+        parent[find(source)] = find(dest)
+        ends.append((line, source))
+
+    groups = {}
+    for (line, source) in ends:
+        groups.setdefault(find(source), []).append(line)
+    return list(groups.values())
+
+
+def _pack(items, budget, cost):
+    """Packs items in order into runs costing at most budget.
+
+    An item costing more than the budget gets a run of its own.
+    """
+    runs = []
+    used = 0
+    for item in items:
+        item_cost = cost(item)
+        if runs and used + item_cost <= budget:
+            runs[-1].append(item)
+            used += item_cost
+        else:
+            runs.append([item])
+            used = item_cost
+    return runs
+
+
+def shard_lines(lines, budget, tolerance=1e-6):
+    """Splits lines into shards of whole loops.
+
+    Args:
+        lines: iterable of geometric lines
+        budget (int): entities allowed per shard
+        tolerance (float, optional): distance under which points are equal
+
+    Returns:
+        list of Shards, the first holding the outline
+
+    """
+    pieces = loops(lines, tolerance)
+    real = [
+        piece for piece in pieces
+        if any(not line.is_construction for line in piece)
+    ]
+    construction = [
+        piece for piece in pieces
+        if all(line.is_construction for line in piece)
+    ]
+
+    def cost(piece):
+        return line_entities(piece, tolerance)
+
+    shards = []
+    for runs in (_pack(real, budget, cost), _pack(construction, budget, cost)):
+        for run in runs:
+            drawn = [line for piece in run for line in piece]
+            shards.append(
+                Shard(len(shards), drawn, [],
+                      sum(cost(piece) for piece in run)))
+    return shards
+
+
+def _center(cutout):
+    (_kind, _name, corner_1, corner_2) = cutout
+    return ((corner_1.x + corner_2.x) / 2.0, (corner_1.y + corner_2.y) / 2.0)
+
+
+def _bisect_cutouts(cutouts, budget):
+    """Recursively splits cutouts along the longer axis of their centers."""
+    total = sum(cutout_entities(cutout) for cutout in cutouts)
+    if total <= budget or len(cutouts) == 1:
+        return [cutouts]
+    centers = [_center(cutout) for cutout in cutouts]
+    xs = [center[0] for center in centers]
+    ys = [center[1] for center in centers]
+    axis = 0 if max(xs) - min(xs) >= max(ys) - min(ys) else 1
+    order = sorted(range(len(cutouts)), key=lambda i: centers[i][axis])
+    ordered = [cutouts[i] for i in order]
+    # Split so that the first half gets its share of the needed shards
+    shards_needed = -(-total // budget)
+    target = total * ((shards_needed + 1) // 2) / shards_needed
+    running = 0
+    split = 1
+    for (index, cutout) in enumerate(ordered[:-1]):
+        running += cutout_entities(cutout)
+        split = index + 1
+        if running >= target:
+            break
+    return (_bisect_cutouts(ordered[:split], budget) +
+            _bisect_cutouts(ordered[split:], budget))
+
+
+def shard_cutouts(cutouts, budget):
+    """Splits cutouts into spatially compact shards.
+
+    Args:
+        cutouts: list of (kind, name, corner_1, corner_2) tuples
+        budget (int): entities allowed per shard
+
+    Returns:
+        list of Shards (empty if there are no cutouts)
+
+    """
+    cutouts = list(cutouts)
+    if not cutouts:
+        return []
+    return [
+        Shard(index, [], group,
+              sum(cutout_entities(cutout) for cutout in group))
+        for (index, group) in enumerate(_bisect_cutouts(cutouts, budget))
+    ]
+
+
+def shard_side(side, budget, include_construction=False, tolerance=1e-6):
+    """Plans the sketches for a side.
+
+    Cutout patterns are not included: they are drawn once and repeated by a
+    pattern feature, so they stay small whatever their count.
+
+    Args:
+        side (Side): side to plan
+        budget (int): entities allowed per sketch
+        include_construction (bool, optional): whether construction lines
+            are drawn
+        tolerance (float, optional): distance under which points are equal
+
+    Returns:
+        (line shards, cutout shards) pair of lists of Shards
+
+    """
+    if budget < 1:
+        raise ValueError("Entity budget must be positive: {}".format(budget))
+    return (shard_lines(
+        side.iter_lines(include_construction=include_construction), budget,
+        tolerance), shard_cutouts(
+            list(side.cutouts) + list(side.cutout_table), budget))
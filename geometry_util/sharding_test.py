@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Tests sketch sharding of sides under an entity budget.
+"""
+from geometry_util.box import Box
+from geometry_util.geometry import Point
+from geometry_util.sharding import line_entities, loops, shard_side
+
+
+def grid_box(columns=20, rows=10):
+    box = Box(220, 137.25, 65, 3, 2)
+    for column in range(columns):
+        for row in range(rows):
+            corner = Point(10 + 9 * column, 10 + 9 * row)
+            box.bottom_side.add_cutout(
+                'rect' if (row + column) % 2 else 'circle',
+                corner,
+                Point(corner.x + 5, corner.y + 5),
+                name="hole_{}_{}".format(column, row))
+    return box
+
+
+def test_outline_loops_stay_whole():
+    side = grid_box().bottom_side
+    outline = list(side.iter_lines(include_construction=False))
+    (line_shards, _cutout_shards) = shard_side(side, budget=10)
+    # The outline is one loop, so it is kept whole even over budget
+    assert len(loops(outline)) == 1
+    assert len(line_shards) == 1
+    assert line_shards[0].lines == outline
+    assert line_shards[0].entities == line_entities(outline)
+
+    (line_shards, _cutout_shards) = shard_side(
+        side, budget=10, include_construction=True)
+    assert all(line in line_shards[0].lines for line in outline)
+    drawn = [line for shard in line_shards for line in shard.lines]
+    assert len(drawn) == len(list(side.iter_lines()))
+
+
+def test_cutouts_split_under_budget_and_grouped():
+    side = grid_box().bottom_side
+    (_line_shards, cutout_shards) = shard_side(side, budget=100)
+    assert [shard.index for shard in cutout_shards] == list(
+        range(len(cutout_shards)))
+    assert all(shard.entities <= 100 for shard in cutout_shards)
+    assert sorted(cutout[1] for shard in cutout_shards
+                  for cutout in shard.cutouts) == sorted(
+                      cutout[1] for cutout in side.cutouts)
+
+    # Spatial grouping: the areas covered by different shards do not overlap
+    def bounds(cutouts):
+        xs = [cutout[2].x for cutout in cutouts]
+        ys = [cutout[2].y for cutout in cutouts]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    covered = [bounds(shard.cutouts) for shard in cutout_shards]
+    for (index, first) in enumerate(covered):
+        for second in covered[index + 1:]:
+            assert (min(first[2], second[2]) <= max(first[0], second[0]) or
+                    min(first[3], second[3]) <= max(first[1], second[1]))
+
+    (_line_shards, cutout_shards) = shard_side(side, budget=10000)
+    assert len(cutout_shards) == 1
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""Tests the shared edge and side templates and their caches.
+"""
+from geometry_util.box import (Box, Edge, EdgeInfo, EdgeTemplate, Point,
+                               SideTemplate)
+from geometry_util.geometry import Dim
+
+
+def edge_info(width=5.0, count=4):
+    return EdgeInfo(True, False, Dim(width, "width"), Dim(3, "thickness"),
+                    Dim(3, "thickness"), count)
+
+
+def edge_coords(edge):
+    return [(line.coords_for_plot(), line.is_construction)
+            for line in edge.lines]
+
+
+def test_hit_returns_equal_geometry():
+    EdgeTemplate._cache.clear()
+    first = Edge(edge_info(), Point(10, 20), 90)
+    expected = edge_coords(first)
+    EdgeTemplate._cache.clear()
+    fresh = edge_coords(Edge(edge_info(), Point(10, 20), 90))
+    assert fresh == expected
+    again = Edge(edge_info(), Point(10, 20), 90)
+    assert again.template is EdgeTemplate.get(edge_info())
+    assert edge_coords(again) == expected
+
+    box = Box(100, 50, 65, 3, 2)
+    lines = [line.coords_for_plot() for line in box.iter_lines()]
+    SideTemplate._cache.clear()
+    EdgeTemplate._cache.clear()
+    assert [line.coords_for_plot()
+            for line in Box(100, 50, 65, 3, 2).iter_lines()] == lines
+
+
+def test_distinct_parameters_do_not_collide():
+    templates = {
+        info: EdgeTemplate.get(info)
+        for info in (edge_info(), edge_info(width=6.0), edge_info(count=5),
+                     edge_info()._replace(is_tall=True),
+                     edge_info()._replace(notch_width=Dim(5.0, "other")))
+    }
+    assert len({id(template) for template in templates.values()}) == 5
+    # Only the label differs in the last one
+    assert len({(tuple(template.points),
+                 tuple(line[:3] for line in template.lines))
+                for template in templates.values()}) == 4
+
+    first = Box(100, 50, 65, 3, 2)
+    second = Box(100, 50, 66, 3, 2)
+    assert (first.upper_side.all_lines()[-1].coords_for_plot() !=
+            second.upper_side.all_lines()[-1].coords_for_plot())
+
+
+def test_caches_stay_bounded(monkeypatch):
+    assert EdgeTemplate.CACHE_SIZE == SideTemplate.CACHE_SIZE == 4096
+    monkeypatch.setattr(EdgeTemplate, "CACHE_SIZE", 8)
+    EdgeTemplate._cache.clear()
+    for count in range(20):
+        EdgeTemplate.get(edge_info(count=count))
+        assert len(EdgeTemplate._cache) <= 8
+    # Templates dropped from a full cache are rebuilt on demand
+    assert EdgeTemplate.get(edge_info(count=0)).points == EdgeTemplate(
+        edge_info(count=0)).points
+
+
+def test_rotate_matches_rotated_edge():
+    edge = Edge(edge_info(), Point(10, 20))
+    edge_coords(edge)
+    edge.rotate(90)
+    rotated = Edge(edge_info(), Point(10, 20), 90)
+    assert edge_coords(edge) == edge_coords(rotated)
+    assert edge.bb_right.coords() == rotated.bb_right.coords()
+    edge.rotate(270)
+    assert edge_coords(edge) == edge_coords(Edge(edge_info(), Point(10, 20)))